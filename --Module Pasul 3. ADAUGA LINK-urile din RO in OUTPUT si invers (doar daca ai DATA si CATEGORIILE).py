@@ -1,6 +1,7 @@
 import os
 import re
 from pathlib import Path
+from item_ids import read_id_comment
 
 def extract_item_id(file_content):
     """Extrage ID-ul articolului din comentariul HTML."""
@@ -16,6 +17,11 @@ def extract_item_id(file_content):
             return match.group(1)
     return None
 
+def read_content(file_path):
+    """Conținutul complet al unui fișier (citit doar pentru perechile găsite)."""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
 def extract_flags_section(file_content):
     """Extrage secțiunea FLAGS din conținutul fișierului."""
     pattern = r'<!-- FLAGS_1 -->(.*?)<!-- FLAGS -->'
@@ -132,15 +138,13 @@ def process_files(ro_dir, output_dir):
 
         file_path = os.path.join(ro_dir, filename)
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                item_id = extract_item_id(content)
-                if item_id:
-                    ro_files[item_id] = {
-                        'path': file_path,
-                        'filename': filename,
-                        'content': content
-                    }
+            # Doar începutul fișierului (acolo e $item_id); conținutul e citit la procesarea perechii
+            item_id, _ = read_id_comment(file_path)
+            if item_id:
+                ro_files[item_id] = {
+                    'path': file_path,
+                    'filename': filename
+                }
         except Exception as e:
             print(f"Eroare la citirea fișierului {filename}: {e}")
 
@@ -153,16 +157,14 @@ def process_files(ro_dir, output_dir):
 
         file_path = os.path.join(output_dir, filename)
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                item_id = extract_item_id(content)
-                if item_id:
-                    output_files[item_id] = {
-                        'path': file_path,
-                        'filename': filename,
-                        'content': content
-                    }
-                    output_file_count += 1
+            # Doar începutul fișierului (acolo e $item_id); conținutul e citit la procesarea perechii
+            item_id, _ = read_id_comment(file_path)
+            if item_id:
+                output_files[item_id] = {
+                    'path': file_path,
+                    'filename': filename
+                }
+                output_file_count += 1
         except Exception as e:
             print(f"Eroare la citirea fișierului {filename}: {e}")
 
@@ -182,6 +184,9 @@ def process_files(ro_dir, output_dir):
             print(f"  - RO: {ro_file['filename']}")
             print(f"  - EN: {output_file['filename']}")
 
+            ro_file['content'] = read_content(ro_file['path'])
+            output_file['content'] = read_content(output_file['path'])
+
             # Extragem secțiunile FLAGS
             ro_flags_section, ro_flags_content = extract_flags_section(ro_file['content'])
             output_flags_section, output_flags_content = extract_flags_section(output_file['content'])
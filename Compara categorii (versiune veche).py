@@ -1,32 +1,22 @@
 import os
 import re
+from corpus_index import CorpusIndex, workers_requested
+from html_markers import scan_markers, section_text
+from text_io import read_text
 
 ro_directory = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
 en_directory = r'e:\Carte\BB\17 - Site Leadership\Principal\en'
 
-def read_file_with_fallback_encoding(file_path):
-   encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
-   for encoding in encodings:
-       try:
-           with open(file_path, 'r', encoding=encoding) as f:
-               return f.read()
-       except UnicodeDecodeError:
-           continue
-   print(f"Nu s-a putut citi fișierul {file_path}")
-   return None
-
 def get_links_from_flags(content, filename, directory):  # Am adăugat parametrul directory
     """Extrage link-urile RO și EN din secțiunea FLAGS"""
-    flags_section = re.search(r'<!-- FLAGS_1 -->(.*?)<!-- FLAGS -->', content, re.DOTALL)
+    flags_content = section_text(content, scan_markers(content), 'flags')
 
-    if not flags_section:
+    if flags_content is None:
         print(f"\nFIȘIER PROBLEMATIC: {os.path.join(directory, filename)}")
         print("--------------------------------------------------")
         print("- Nu s-a găsit secțiunea FLAGS completă")
         return None
 
-    flags_content = flags_section.group(1)
-
     # Caută link-ul RO (cu title="ro")
     ro_match = re.search(r'<a href="https://neculaifantanaru\.com/+([^"]+)"[^>]*?><img[^>]*?title="ro"', flags_content)
 
@@ -55,40 +45,47 @@ def get_links_from_flags(content, filename, directory):  # Am adăugat parametru
         'en_link': en_match.group(1)
     }
 
-def compare_files():
-    mismatches = []
+def get_links_from_row(row, directory):
+    """Link-urile RO și EN din FLAGS, luate din indexul corpusului"""
+    if row['flag_ro'] and row['flag_en']:
+        return {
+            'ro_link': row['flag_ro'],
+            'en_link': row['flag_en']
+        }
 
-    for ro_file in os.listdir(ro_directory):
-        if not ro_file.endswith('.html'):
-            continue
+    # Fișier problematic - îl recitim doar pentru a afișa detaliile
+    content = read_text(row['path'])
+    if content:
+        get_links_from_flags(content, row['filename'], directory)
+    return None
 
-        ro_path = os.path.join(ro_directory, ro_file)
-        ro_content = read_file_with_fallback_encoding(ro_path)
+def compare_files():
+    mismatches = []
 
-        if not ro_content:
-            continue
+    # Metadatele vin din index; sunt recitite doar fișierele noi sau modificate
+    index = CorpusIndex(workers=workers_requested())
+    ro_rows = index.refresh(ro_directory, 'ro')
+    en_rows = {row['filename'].lower(): row for row in index.refresh(en_directory, 'en')}
+    index.close()
 
-        ro_links = get_links_from_flags(ro_content, ro_file, ro_directory)  # Am adăugat ro_directory
+    for ro_row in ro_rows:
+        ro_links = get_links_from_row(ro_row, ro_directory)
         if not ro_links:
             continue
 
-        # Construiește calea către fișierul EN
+        # Caută fișierul EN în index
         en_file = ro_links['en_link']
-        en_path = os.path.join(en_directory, en_file)
-
-        if os.path.exists(en_path):
-            en_content = read_file_with_fallback_encoding(en_path)
-            if not en_content:
-                continue
+        en_row = en_rows.get(en_file.lower())
 
-            en_links = get_links_from_flags(en_content, en_file, en_directory)  # Am adăugat en_directory
+        if en_row:
+            en_links = get_links_from_row(en_row, en_directory)
             if not en_links:
                 continue
 
             # Verifică dacă link-urile diferă
             if ro_links != en_links:
                 mismatches.append({
-                    'ro_file': ro_file,
+                    'ro_file': ro_row['filename'],
                     'en_file': en_file,
                     'ro_links': ro_links,
                     'en_links': en_links
@@ -96,25 +93,26 @@ def compare_files():
 
     return mismatches
 
-# Rulează comparația
-print("\nVerificare link-uri în FLAGS...")
-mismatches = compare_files()
-
-if mismatches:  # Adăugăm verificare dacă mismatches nu este None
-   print("\nFișiere cu link-uri diferite între RO și EN:")
-   print("-" * 80)
-
-   for m in mismatches:
-       # print(f"\nFișier RO: {m['ro_file']}")
-       # print(f"Fișier EN: {m['en_file']}")
-       print("\nÎn fișierul RO:")
-       print(f"  Link RO: {m['ro_links']['ro_link']}")
-       print(f"  Link EN: {m['ro_links']['en_link']}")
-       print("\nÎn fișierul EN:")
-       print(f"  Link RO: {m['en_links']['ro_link']}")
-       print(f"  Link EN: {m['en_links']['en_link']}")
-       print("-" * 80)
-
-   print(f"\nTotal fișiere cu diferențe: {len(mismatches)}")
-else:
-   print("Nu s-au găsit diferențe între fișiere.")
\ No newline at end of file
+# Rulează comparația (protejat de __main__, procesele din pool reimportă scriptul)
+if __name__ == "__main__":
+   print("\nVerificare link-uri în FLAGS...")
+   mismatches = compare_files()
+
+   if mismatches:  # Adăugăm verificare dacă mismatches nu este None
+      print("\nFișiere cu link-uri diferite între RO și EN:")
+      print("-" * 80)
+
+      for m in mismatches:
+          # print(f"\nFișier RO: {m['ro_file']}")
+          # print(f"Fișier EN: {m['en_file']}")
+          print("\nÎn fișierul RO:")
+          print(f"  Link RO: {m['ro_links']['ro_link']}")
+          print(f"  Link EN: {m['ro_links']['en_link']}")
+          print("\nÎn fișierul EN:")
+          print(f"  Link RO: {m['en_links']['ro_link']}")
+          print(f"  Link EN: {m['en_links']['en_link']}")
+          print("-" * 80)
+
+      print(f"\nTotal fișiere cu diferențe: {len(mismatches)}")
+   else:
+      print("Nu s-au găsit diferențe între fișiere.")
\ No newline at end of file
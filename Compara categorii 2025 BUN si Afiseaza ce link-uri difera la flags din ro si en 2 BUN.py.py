@@ -2,21 +2,14 @@ import os
 import re
 from pathlib import Path
 from unidecode import unidecode
+from corpus_index import CorpusIndex, workers_requested
+from html_markers import scan_markers, section_text
+from text_io import read_text
+from run_report import timed_files, report_at_exit
 
 ro_directory = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
 en_directory = r'e:\Carte\BB\17 - Site Leadership\Principal\en'
 
-def read_file_with_fallback_encoding(file_path):
-    encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
-    for encoding in encodings:
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
-        except UnicodeDecodeError:
-            continue
-    print(f"Nu s-a putut citi fișierul {file_path}")
-    return None
-
 def replace_special_chars(val):
     val = val.replace('–', '-').replace('—', '-')
     return val
@@ -63,12 +56,13 @@ def get_category_mapping():
     }
 
 def get_article_info(content, filename, directory):
-    article_section = re.search(r'<!-- ARTICOL START -->(.*?)<\/table>', content, re.DOTALL)
-    if not article_section:
+    article_start = scan_markers(content).first('ARTICOL START')
+    table_end = content.find('</table>', article_start[1]) if article_start else -1
+    if table_end == -1:
         print(f"Nu s-a găsit secțiunea ARTICOL START în {os.path.join(directory, filename)}")
         return None
 
-    article_content = article_section.group(1)
+    article_content = content[article_start[1]:table_end]
     date_match = re.search(r'On\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})', article_content, re.IGNORECASE)
     category_match = re.search(r'<a href="https://neculaifantanaru\.com(?:/en)?/([^"]+)"[^>]*>(.*?)</a>', article_content)
 
@@ -83,12 +77,10 @@ def get_article_info(content, filename, directory):
     }
 
 def get_links_from_flags(content, filename, directory):
-    flags_section = re.search(r'<!-- FLAGS_1 -->(.*?)<!-- FLAGS -->', content, re.DOTALL)
-    if not flags_section:
+    flags_content = section_text(content, scan_markers(content), 'flags')
+    if flags_content is None:
         print(f"\nFIȘIER PROBLEMATIC: {os.path.join(directory, filename)} - Nu s-a găsit secțiunea FLAGS")
         return None
-
-    flags_content = flags_section.group(1)
     ro_match = re.search(r'<a href="https://neculaifantanaru\.com/+([^"]+)"[^>]*?><img[^>]*?title="ro"', flags_content)
     en_match = re.search(r'<a href="https://neculaifantanaru\.com/+en/([^"]+)"[^>]*?><img[^>]*?title="en"', flags_content)
 
@@ -101,39 +93,62 @@ def get_links_from_flags(content, filename, directory):
         'en_link': normalize_value(en_match.group(1))
     }
 
+def get_article_info_from_row(row, directory):
+    """Data și categoria articolului, luate din indexul corpusului"""
+    date_match = re.search(r'([A-Za-z]+\s+\d{1,2},\s+\d{4})', row['data'] or '')
+    if not date_match or not row['categorie_link']:
+        print(f"Probleme la extragerea datelor din {os.path.join(directory, row['filename'])}")
+        return None
+
+    return {
+        'date': normalize_date(translate_month(date_match.group(1))),
+        'category_link': normalize_value(re.sub(r'^en/', '', row['categorie_link'])),
+        'category_title': normalize_value(row['categorie_titlu'])
+    }
+
+def get_links_from_row(row, directory):
+    """Link-urile RO și EN din FLAGS, luate din indexul corpusului"""
+    if row['flag_ro'] and row['flag_en']:
+        return {
+            'ro_link': normalize_value(row['flag_ro']),
+            'en_link': normalize_value(row['flag_en'])
+        }
+
+    # Fișier problematic - îl recitim doar pentru a afișa detaliile
+    content = read_text(row['path'])
+    if content:
+        get_links_from_flags(content, row['filename'], directory)
+    return None
+
 def compare_files():
     mismatches = []
     unique_mismatches = set()  # Pentru a elimina duplicatele
     category_map = get_category_mapping()
 
-    for ro_file in os.listdir(ro_directory):
-        if not ro_file.endswith('.html'):
-            continue
+    # Metadatele vin din index; sunt recitite doar fișierele noi sau modificate
+    index = CorpusIndex(workers=workers_requested())
+    ro_rows = index.refresh(ro_directory, 'ro')
+    en_rows = {row['filename'].lower(): row for row in index.refresh(en_directory, 'en')}
+    index.close()
 
+    for ro_row in timed_files(ro_rows, key=lambda row: row['filename']):
+        ro_file = ro_row['filename']
         print(f"Procesare fișier: {ro_file}")
-        ro_path = os.path.join(ro_directory, ro_file)
-        ro_content = read_file_with_fallback_encoding(ro_path)
-        if not ro_content:
-            continue
 
-        ro_links = get_links_from_flags(ro_content, ro_file, ro_directory)
-        ro_article = get_article_info(ro_content, ro_file, ro_directory)
+        ro_links = get_links_from_row(ro_row, ro_directory)
+        ro_article = get_article_info_from_row(ro_row, ro_directory)
         if not ro_links or not ro_article:
             continue
 
         en_file = ro_links['en_link']
-        en_path = os.path.join(en_directory, en_file)
-
-        if not os.path.exists(en_path):
-            print(f"Fișierul EN nu există: {en_path}")
-            continue
+        en_row = en_rows.get(en_file.lower())
 
-        en_content = read_file_with_fallback_encoding(en_path)
-        if not en_content:
+        if not en_row:
+            print(f"Fișierul EN nu există: {os.path.join(en_directory, en_file)}")
             continue
 
-        en_links = get_links_from_flags(en_content, en_file, en_directory)
-        en_article = get_article_info(en_content, en_file, en_directory)
+        en_links = get_links_from_row(en_row, en_directory)
+        en_article = get_article_info_from_row(en_row, en_directory)
         if not en_links or not en_article:
             continue
 
@@ -167,18 +182,23 @@ def compare_files():
 
     return mismatches
 
-# Rulează comparația
-print("\nVerificare link-uri în FLAGS...")
-mismatches = compare_files()
-
-if mismatches:
-    print("\nFișiere cu link-uri diferite între RO și EN:")
-    print("-" * 80)
-    for m in mismatches:
-        print("\nÎn fișierul RO:")
-        print(f"  Link RO: {m['ro_link']}")
-        print(f"  Link EN: {m['en_link']}")
-    print("-" * 80)
-    print(f"\nTotal fișiere cu diferențe: {len(mismatches)}")
-else:
-    print("Nu s-au găsit diferențe între fișiere.")
\ No newline at end of file
+def main():
+    print("\nVerificare link-uri în FLAGS...")
+    mismatches = compare_files()
+
+    if mismatches:
+        print("\nFișiere cu link-uri diferite între RO și EN:")
+        print("-" * 80)
+        for m in mismatches:
+            print("\nÎn fișierul RO:")
+            print(f"  Link RO: {m['ro_link']}")
+            print(f"  Link EN: {m['en_link']}")
+        print("-" * 80)
+        print(f"\nTotal fișiere cu diferențe: {len(mismatches)}")
+    else:
+        print("Nu s-au găsit diferențe între fișiere.")
+
+# Rulează comparația (protejat de __main__, procesele din pool reimportă scriptul)
+if __name__ == "__main__":
+    report_at_exit()
+    main()
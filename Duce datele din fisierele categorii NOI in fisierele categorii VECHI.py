@@ -4,6 +4,8 @@
 import os
 import re
 from bs4 import BeautifulSoup
+from html_markers import scan_markers
+from text_io import read_text
 import html
 
 # Define the source and destination directories
@@ -88,21 +90,8 @@ def fix_special_characters(text):
 def extract_articles_from_source(file_path):
     """Extract article information from the source file format (2022)"""
     try:
-        # Try different encodings if needed
-        content = None
-        encodings = ['utf-8', 'latin-1', 'cp1252']
-
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                    break
-            except UnicodeDecodeError:
-                continue
-
-        if content is None:
-            print(f"Error: Could not read {file_path} with any encoding")
-            return []
+        # Encoding is detected in a single pass (and cached for the next runs)
+        content = read_text(file_path)
 
         # Create a soup object for the entire content
         soup = BeautifulSoup(content, 'html.parser')
@@ -205,34 +194,17 @@ def process_file(filename):
 
     # If destination file exists, read it to find the insertion points
     if os.path.exists(dest_path):
-        # Try different encodings for reading the destination file
-        dest_content = None
-        successful_encoding = None
-        encodings = ['utf-8', 'latin-1', 'cp1252']
-
-        for encoding in encodings:
-            try:
-                with open(dest_path, 'r', encoding=encoding) as file:
-                    dest_content = file.read()
-                    successful_encoding = encoding
-                    break
-            except UnicodeDecodeError:
-                continue
-
-        if dest_content is None:
-            print(f"Error: Could not read {dest_path} with any encoding")
-            return
+        dest_content = read_text(dest_path)
 
         # Find the content between markers
-        pattern = r'<!-- ARTICOL CATEGORIE START -->(.+?)<!-- ARTICOL CATEGORIE FINAL -->'
-        match = re.search(pattern, dest_content, re.DOTALL)
+        section_span = scan_markers(dest_content).section('categorie', outer=True)
 
-        if match:
+        if section_span:
             # Format the articles in the destination format
             new_content = format_articles_for_destination(articles, filename)
 
             # Replace the old content with the new content
-            updated_content = dest_content.replace(match.group(0), new_content)
+            updated_content = dest_content[:section_span[0]] + new_content + dest_content[section_span[1]:]
 
             # Ensure meta charset is set to UTF-8
             if '<meta charset="' in updated_content and not '<meta charset="UTF-8"' in updated_content:
@@ -1,5 +1,6 @@
 import os
 import re
+from item_ids import id_comments_current
 
 # Lista folderelor de scanat
 folders_to_scan = [
@@ -22,6 +23,12 @@ all_html_files.sort(key=lambda x: os.path.basename(x).lower())
 
 # Procesăm fiecare fișier și actualizăm ID-urile
 for html_file_path in all_html_files:
+    # Fișierul e rescris doar dacă nu toate comentariile cu ID au deja ID-ul corect
+    if id_comments_current(html_file_path, current_id):
+        print(f"ID-ul fișierului {os.path.basename(html_file_path)} este deja {current_id}.")
+        current_id += 1
+        continue
+
     try:
         with open(html_file_path, 'r', encoding='utf-8') as file:
             html_content = file.read()
@@ -1,13 +1,16 @@
 import os
-import re
 from collections import defaultdict
+from corpus_index import CorpusIndex
+from text_io import WriteBatch
+from item_ids import stable_ids_requested, classify_ids, sort_rows, write_item_id, IdLedger
+from id_map import IdMap
+from run_report import timed_files, report_at_exit
 
 # Configuration
 folders_to_scan = [
     r'e:\Carte\BB\17 - Site Leadership\Principal\ro',
     r'e:\Carte\BB\17 - Site Leadership\Principal\ro\Python Files'
 ]
-tracking_dir = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
 MAX_ID = 5000
 
 def safe_print(text):
@@ -17,32 +20,8 @@ def safe_print(text):
     except UnicodeEncodeError:
         print(text.encode('utf-8', errors='replace').decode('utf-8'))
 
-def find_and_update_tracking_file(directory, new_id):
-    """Update or create the tracking file"""
-    try:
-        pattern = re.compile(r'4-+am ajuns la \d+$')
-        tracking_file = None
-
-        for filename in os.listdir(directory):
-            if pattern.search(filename):
-                tracking_file = os.path.join(directory, filename)
-                break
-
-        if tracking_file:
-            old_name = os.path.basename(tracking_file)
-            new_name = re.sub(r'\d+$', str(new_id), old_name)
-            os.rename(tracking_file, os.path.join(directory, new_name))
-            safe_print(f"Fișierul de tracking actualizat: {old_name} -> {new_name}")
-        else:
-            new_name = f"4---------------------------am ajuns la {new_id}"
-            with open(os.path.join(directory, new_name), 'w') as f:
-                f.write(f"Ultimul ID folosit: {new_id}")
-            safe_print(f"Fișier de tracking creat: {new_name}")
-
-    except Exception as e:
-        safe_print(f"Eroare la actualizarea fișierului de tracking: {str(e)}")
-
-def process_files():
+def process_files(stable_ids=None):
+    """Numerotează fișierele RO; stable_ids=None înseamnă după linia de comandă (--stable-ids)."""
     # Data structures
     all_files = []
     filename_counts = defaultdict(list)
@@ -52,16 +31,20 @@ def process_files():
     duplicate_ids = defaultdict(list)
     out_of_range_ids = []
 
-    # First pass: Find all HTML files
+    indexed_files = []
+
+    # First pass: Find all HTML files (din indexul corpusului, recitim doar fișierele modificate)
     safe_print("\n=== SCANARE FIȘIERE ===")
+    index = CorpusIndex()
     for folder in folders_to_scan:
         safe_print(f"\nScanare folder: {os.path.basename(folder)}")
-        for filename in os.listdir(folder):
-            if filename.lower().endswith('.html'):
-                full_path = os.path.join(folder, filename)
-                all_files.append(full_path)
-                filename_counts[filename].append(full_path)
-                safe_print(f" - Găsit: {filename}")
+        for row in index.refresh(folder, 'ro'):
+            all_files.append(row['path'])
+            indexed_files.append(row)
+            filename_counts[row['filename']].append(row['path'])
+            safe_print(f" - Găsit: {row['filename']}")
+        safe_print(f"   Fișiere recitite (noi sau modificate): {index.last_refresh_reads}")
+    index.close()
 
     # Check for duplicate filenames
     for name, paths in filename_counts.items():
@@ -70,27 +53,17 @@ def process_files():
 
     # Second pass: Analyze IDs
     safe_print("\n=== ANALIZĂ ID-URI ===")
-    id_pattern = re.compile(r'<!-- \s*\$item_id\s*=\s*(\d+);.*?-->')
-
     safe_print("Se analizează următoarele fișiere:")
-    for file_path in all_files:
-        filename = os.path.basename(file_path)
+    for row in indexed_files:
+        filename = row['filename']
         safe_print(f" - Analiză ID pentru: {filename}")
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-
-        matches = id_pattern.findall(content)
-        if not matches:
+        if row['item_id'] is None:
             files_without_id.append(filename)
             safe_print("   ! Fișierul nu conține ID")
             continue
 
-        file_id = int(matches[0])
+        file_id = row['item_id']
         id_to_files[file_id].append(filename)
         safe_print(f"   ID găsit: {file_id}")
 
@@ -145,48 +118,69 @@ def process_files():
     if needs_reset:
         safe_print("\nS-au detectat probleme cu ID-urile care necesită resetare.")
 
-    # Process files to reassign IDs sequentially
-    safe_print("\n=== REATRIBUIRE ID-URI ===")
-    current_id = 1
-    all_files_sorted = sorted(all_files, key=lambda x: os.path.basename(x).lower())
-
-    for file_path in all_files_sorted:
-        filename = os.path.basename(file_path)
-        safe_print(f"Procesez: {filename}")
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-
-        # Get existing ID for reporting
-        existing_id = None
-        matches = id_pattern.findall(content)
-        if matches:
-            existing_id = int(matches[0])
-
-        # Replace with new sequential ID
-        new_content = re.sub(
-            r'<!-- \s*\$item_id\s*=\s*\d+;.*?-->',
-            f'<!-- $item_id = {current_id}; // Replace that with your rating id -->',
-            content
-        )
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        if existing_id and existing_id != current_id:
-            safe_print(f"  ID modificat: {existing_id} -> {current_id}")
-        else:
-            safe_print(f"  ID atribuit: {current_id}")
-
-        current_id += 1
-
-    # Update tracking file with the new maximum ID
-    new_max_id = current_id - 1
-    find_and_update_tracking_file(tracking_dir, new_max_id)
+    # Noua numerotare se calculează din index: se citesc și se rescriu doar fișierele
+    # al căror comentariu cu ID se schimbă (pe un corpus stabil rularea nu scrie nimic)
+    batch = WriteBatch()
+    ledger = IdLedger('ro', 1, MAX_ID, read_only=batch.dry_run)
+    untouched = 0
+    # ID-urile noi, pentru harta perechilor RO <-> EN
+    new_ids = {}
+
+    if stable_ids is None:
+        stable_ids = stable_ids_requested()
+    if stable_ids:
+        # --stable-ids: ID-urile valide rămân; doar fișierele fără ID, cu ID duplicat
+        # sau peste MAX_ID primesc ID-uri noi, după cel mai mare ID folosit
+        safe_print("\n=== ALOCARE ID-URI NOI (ID-urile valide se păstrează) ===")
+        owners, needs_id = classify_ids(indexed_files, 1, MAX_ID)
+        untouched = len(indexed_files) - len(needs_id)
+
+        with ledger.transaction():
+            ledger.sync({item_id: row['path'] for item_id, row in owners.items()})
+            for row, reason in timed_files(needs_id, key=lambda entry: entry[0]['filename']):
+                new_id = ledger.allocate(row['path'])
+                if new_id is None:
+                    safe_print(f"  ! {row['filename']} ({reason}): nu mai există ID-uri libere până la {MAX_ID}")
+                    continue
+                write_item_id(row, new_id, batch, insert_missing=True)
+                new_ids[row['path']] = new_id
+                safe_print(f"  {row['filename']} ({reason}): ID nou {new_id}")
+    else:
+        # Process files to reassign IDs sequentially
+        safe_print("\n=== REATRIBUIRE ID-URI ===")
+        current_id = 1
+        assignment = {}
+
+        for row in timed_files(sort_rows(indexed_files), key=lambda row: row['filename']):
+            filename = row['filename']
+            safe_print(f"Procesez: {filename}")
+            existing_id = row['item_id']
+
+            if not write_item_id(row, current_id, batch):
+                untouched += 1
+
+            if existing_id and existing_id != current_id:
+                safe_print(f"  ID modificat: {existing_id} -> {current_id}")
+            else:
+                safe_print(f"  ID atribuit: {current_id}")
+
+            assignment[current_id] = row['path']
+            current_id += 1
+
+        with ledger.transaction():
+            ledger.reset(assignment)
+        new_ids = {path: item_id for item_id, path in assignment.items()}
+
+    batch.flush()
+    id_map = IdMap(read_only=batch.dry_run)
+    id_map.update_ids('ro', new_ids)
+    id_map.save()
+    safe_print(f"\nScrieri: {batch.summary()}, {untouched} neatinse (ID deja corect sau lipsă)")
+
+    # Registrul ID-urilor ține locul fișierului "4---am ajuns la N"
+    safe_print(f"Registru ID-uri: am ajuns la {ledger.high_water}, următorul ID liber: {ledger.next_free()}")
+    new_max_id = ledger.high_water
+    ledger.close()
 
     safe_print("\n" + "="*50)
     safe_print("REZUMAT FINAL:")
@@ -196,4 +190,5 @@ def process_files():
     safe_print("="*50)
 
 if __name__ == "__main__":
+    report_at_exit()
     process_files()
\ No newline at end of file
@@ -1,13 +1,24 @@
 import os
-from bs4 import BeautifulSoup
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import re
 from tqdm import tqdm
 import time
+from corpus_index import CorpusIndex, workers_requested, article_query_requested
+from article_runs import extract_articles, full_parse_requested
+from run_report import add_file_time, count_written, report_at_exit
+from docx_writers import (DocumentWriter, StreamingDocxWriter, ChunkedDocxWriter,
+                          streaming_requested, chunk_budget_requested)
+
+# Folderul din care sunt preluate articolele
+INPUT_FOLDER = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
+
+# Folderele cu paginile EN: un articol RO care are deja pereche într-unul din ele e tradus (--missing-en)
+EN_FOLDERS = [
+    r'e:\Carte\BB\17 - Site Leadership\Principal\en',
+    r'e:\Carte\BB\17 - Site Leadership\alte\Ionel Balauta\Aryeht\Task 1 - Traduce tot site-ul\Doar Google Web\Andreea\Meditatii\2023\Iulia Python\output'
+]
 
-# Lista fișierelor specifice de procesat  # toate articolele sunt preluate din  e:\Carte\BB\17 - Site Leadership\Principal\ro\
+# Lista fișierelor specifice de procesat, folosită când scriptul e pornit fără criterii de selecție:
+#   --missing-en, --since AAAA-LL-ZZ, --until AAAA-LL-ZZ, --category NUME, --ids A-B
+# toate articolele sunt preluate din  e:\Carte\BB\17 - Site Leadership\Principal\ro\
 SPECIFIC_FILES = [
     'memoria-harenae.html',
     'sinteza-dintre-cer-si-pamant.html',
@@ -22,7 +33,6 @@ SPECIFIC_FILES = [
     'arete.html',
     'de-ce-suntem-obligati-sa-folosim-surse-bibliografice-in-teza-de-licenta.html',
     'privirea-profunda-descopera-maretia-in-simplitate.html',
-    'de-ce-suntem-obligati-sa-folosim-surse-bibliografice-in-teza-de-licenta.html',
     'maktub.html',
     'cum-transformi-obiectivul-in-realitate-cand-muntele-iti-testeaza-limitele.html',
     'manifestarea-vazuta-a-ceea-ce-nu-se-poate-vedea.html',
@@ -31,166 +41,133 @@ SPECIFIC_FILES = [
     'paradoxul-empatiei-pierdute.html',
 ]
 
-def process_paragraph(paragraph, p_tag, is_bold=False):
-    """Procesează un paragraf și aplică formatarea corectă"""
-
-    # Determină dacă întregul paragraf trebuie să fie bold bazat pe clasa sa
-    is_text_obisnuit2 = 'text_obisnuit2' in p_tag.get('class', [])
-
-    # Procesează fiecare element din paragraf
-    for element in p_tag.children:
-        if isinstance(element, str):
-            # Text simplu
-            run = paragraph.add_run(element)
-            run.bold = is_text_obisnuit2
-        elif element.name == 'em':
-            # Text italic
-            run = paragraph.add_run(element.get_text())
-            run.italic = True
-            run.bold = is_text_obisnuit2
-        elif element.name == 'span' and 'text_obisnuit2' in element.get('class', []):
-            # Text în span cu clasa text_obisnuit2 - trebuie să fie bold
-            run = paragraph.add_run(element.get_text())
-            run.bold = True
-        else:
-            # Alte elemente - procesare normală
-            run = paragraph.add_run(element.get_text() if element.name else str(element))
-            run.bold = is_text_obisnuit2
-
-def extract_item_id(content):
-    """Extrage ID-ul articolului din comentariul HTML"""
-    id_pattern = re.compile(r'<!-- \$item_id = (\d+); // Replace that with your rating id -->')
-    match = id_pattern.search(content)
-    if match:
-        return match.group(1)
-    return "N/A"  # Returnează N/A dacă nu găsește ID-ul
-
-def process_html_file(file_path, document):
-    print(f"\nProcesare fișier: {os.path.basename(file_path)}")
-    start_time = time.time()
-
-    # Încearcă mai multe codificări
-    codecs_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-    content = None
-
-    for codec in codecs_to_try:
-        try:
-            with open(file_path, 'r', encoding=codec, errors='replace') as file:
-                content = file.read()
-                print(f"Fișier citit cu succes folosind codificarea: {codec}")
-                break  # Am găsit o codificare care funcționează
-        except UnicodeDecodeError:
-            print(f"Nu s-a putut citi fișierul cu codificarea: {codec}")
-            continue
-
-    if content is None:
-        print(f"EROARE: Nu s-a putut citi fișierul cu niciuna dintre codificările încercate.")
-        document.add_paragraph(f"EROARE LA PROCESARE: {os.path.basename(file_path)}")
+def write_article(writer, article):
+    """Adaugă în document un articol extras de article_runs.extract_article.
+
+    `writer` e un DocumentWriter (python-docx) sau un StreamingDocxWriter (--stream-docx).
+    """
+    print(f"\nProcesare fișier: {article['filename']}")
+
+    if 'eroare_citire' in article:
+        print(f"EROARE: Nu s-a putut citi fișierul: {article['eroare_citire']}")
+        writer.add_paragraph(text=f"EROARE LA PROCESARE: {article['filename']}")
+        return
+    if 'eroare' in article:
+        print(f"\nEroare la procesarea fișierului {article['filename']}: {article['eroare']}")
+        writer.add_paragraph(text=f"EROARE LA PROCESARE: {article['filename']}")
+        writer.add_paragraph(text=f"Detalii eroare: {article['eroare']}")
         return
 
-    # Extrage ID-ul articolului
-    item_id = extract_item_id(content)
+    item_id = article['item_id']
     print(f"ID articol: {item_id}")
 
-    soup = BeautifulSoup(content, 'html.parser')
-
     # Procesează titlul
-    title = soup.find('h1', class_='den_articol')
-    if title:
-        title_text = title.text
+    title_text = article['title']
+    if title_text is not None:
         print(f"Adăugare titlu: {title_text[:50]}...")
+        # Titlul (roșu, bold, centrat) și, sub el, ID-ul articolului (gri, mic)
+        writer.add_title(title_text, item_id)
 
-        # Crează un paragraf pentru titlu
-        title_paragraph = document.add_paragraph()
-        title_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        # Adaugă titlul cu formatare
-        run = title_paragraph.add_run(title_text)
-        run.bold = True
-        font = run.font
-        font.color.rgb = RGBColor(255, 0, 0)
-
-        # Adaugă ID-ul articolului doar sub titlu
-        id_paragraph = document.add_paragraph()
-        id_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        id_run = id_paragraph.add_run(f"ID: {item_id}")
-        id_run.font.color.rgb = RGBColor(128, 128, 128)  # Culoare gri
-        id_run.font.size = Pt(8)  # Dimensiune mică pentru text
-
-    # Găsește conținutul între markeri
-    start_marker = '<!-- ARTICOL START -->'
-    end_marker = '<!-- ARTICOL FINAL -->'
-    start_idx = content.find(start_marker)
-    end_idx = content.find(end_marker)
-
+    paragraphs = article['paragraphs']
     paragraphs_processed = 0
-    if start_idx != -1 and end_idx != -1:
-        article_content = content[start_idx + len(start_marker):end_idx]
-        article_soup = BeautifulSoup(article_content, 'html.parser')
-
-        total_paragraphs = len(article_soup.find_all('p'))
-        print(f"Găsite {total_paragraphs} paragrafe pentru procesare")
-
-        for p in article_soup.find_all('p'):
-            try:
-                paragraphs_processed += 1
-                paragraph = document.add_paragraph()
-                process_paragraph(paragraph, p)
-            except Exception as e:
-                print(f"Eroare la procesarea paragrafului {paragraphs_processed}: {e}")
-                paragraph = document.add_paragraph("EROARE LA PROCESAREA PARAGRAFULUI")
+    if paragraphs is not None:
+        print(f"Găsite {len(paragraphs)} paragrafe pentru procesare")
+        errors = iter(article.get('erori_paragrafe', []))
+
+        for runs in paragraphs:
+            paragraphs_processed += 1
+            if runs is None:
+                print(f"Eroare la procesarea paragrafului {paragraphs_processed}: {next(errors, '')}")
+                writer.add_paragraph()
+                writer.add_paragraph(text="EROARE LA PROCESAREA PARAGRAFULUI")
+                continue
+            writer.add_paragraph(runs)
     else:
         print("Nu s-au găsit markerii pentru conținutul articolului")
-        document.add_paragraph("EROARE: Nu s-au găsit markerii pentru conținutul articolului")
+        writer.add_paragraph(text="EROARE: Nu s-au găsit markerii pentru conținutul articolului")
 
-    document.add_paragraph()
-
-    end_time = time.time()
-    print(f"Procesate {paragraphs_processed} paragrafe în {end_time - start_time:.2f} secunde")
+    writer.add_paragraph()
+    print(f"Procesate {paragraphs_processed} paragrafe în {article['seconds']:.2f} secunde")
 
 def main():
-    input_folder = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
+    input_folder = INPUT_FOLDER
     output_file = 'articole_compilate.docx'
 
     print("\nÎncepere procesare articole HTML specificate...")
     print("=" * 50)
 
-    # Verifică existența fișierelor
-    files_to_process = []
-    missing_files = []
-
-    for filename in SPECIFIC_FILES:
-        file_path = os.path.join(input_folder, filename)
-        if os.path.exists(file_path):
-            files_to_process.append(file_path)
-        else:
-            missing_files.append(filename)
-
-    print(f"\nGăsite {len(files_to_process)} din {len(SPECIFIC_FILES)} fișiere specificate")
-
-    if missing_files:
-        print("\nATENȚIE! Următoarele fișiere nu au fost găsite:")
-        for file in missing_files:
-            print(f"- {file}")
+    # Articolele sunt selectate din indexul corpusului: fiecare apare o singură dată, în ordinea ID-urilor
+    criteria = article_query_requested()
+    index = CorpusIndex(workers=workers_requested())
+    index.refresh(input_folder, 'ro')
+    if criteria:
+        missing_en = criteria.pop('missing_en', False)
+        if missing_en:
+            for en_folder in EN_FOLDERS:
+                if os.path.isdir(en_folder):
+                    index.refresh(en_folder, 'en')
+        start = time.perf_counter()
+        rows = index.select_articles(input_folder, missing_in=EN_FOLDERS if missing_en else None, **criteria)
+        print(f"\nInterogare {criteria}{' (fără pereche EN)' if missing_en else ''}: "
+              f"{len(rows)} articole selectate în {(time.perf_counter() - start) * 1000:.1f} ms")
+    else:
+        specific_files = list(dict.fromkeys(SPECIFIC_FILES))
+        if len(specific_files) < len(SPECIFIC_FILES):
+            print(f"\nATENȚIE! {len(SPECIFIC_FILES) - len(specific_files)} fișiere apar de mai multe ori "
+                  f"în SPECIFIC_FILES și sunt procesate o singură dată")
+        rows = index.select_articles(input_folder, filenames=specific_files)
+        found = {row['filename'] for row in rows}
+        missing_files = [filename for filename in specific_files if filename not in found]
+
+        print(f"\nGăsite {len(rows)} din {len(specific_files)} fișiere specificate")
+
+        if missing_files:
+            print("\nATENȚIE! Următoarele fișiere nu au fost găsite:")
+            for file in missing_files:
+                print(f"- {file}")
+    index.close()
+    files_to_process = [row['path'] for row in rows]
+
+    # Cu --max-chars / --max-bytes exportul e împărțit în mai multe documente (doar între articole),
+    # scrise în paralel; cu --stream-docx documentul e scris direct în arhivă, fără să fie ținut în memorie
+    max_chars, max_bytes = chunk_budget_requested()
+    if max_chars or max_bytes:
+        writer = ChunkedDocxWriter(output_file, max_chars, max_bytes, streaming_requested(), workers_requested())
+    elif streaming_requested():
+        writer = StreamingDocxWriter(output_file)
+    else:
+        writer = DocumentWriter(output_file)
 
-    document = Document()
+    # Parsarea rulează în paralel (--workers N); articolele sosesc în ordine și doar
+    # adăugarea lor în document rămâne în procesul principal
+    articles = extract_articles(files_to_process, workers_requested(), full_parse_requested())
 
     # Crează progress bar
     with tqdm(total=len(files_to_process), desc="Progres total") as pbar:
-        for file_path in files_to_process:
-            try:
-                process_html_file(file_path, document)
-            except Exception as e:
-                print(f"\nEroare la procesarea fișierului {os.path.basename(file_path)}: {e}")
-                document.add_paragraph(f"EROARE LA PROCESARE: {os.path.basename(file_path)}")
-                document.add_paragraph(f"Detalii eroare: {str(e)}")
+        for article in articles:
+            start = time.perf_counter()
+            write_article(writer, article)
+            add_file_time(article['filename'], article.get('seconds', 0.0) + time.perf_counter() - start)
             pbar.update(1)
 
     print("\nSalvare document final...")
-    document.save(output_file)
-    print(f"\nDocument creat cu succes: {output_file}")
+    if isinstance(writer, ChunkedDocxWriter):
+        output_files = writer.close()
+        for path in output_files:
+            count_written(path, os.path.getsize(path))
+        print(f"\nDocumente create cu succes ({len(output_files)}, fiecare sub "
+              f"{max_chars or '-'} caractere / {max_bytes or '-'} octeți):")
+        for path in output_files:
+            print(f"- {path}")
+        for title in writer.oversized:
+            print(f"ATENȚIE! Articolul '{title}' depășește singur limita și ocupă un document întreg")
+    else:
+        writer.close()
+        count_written(output_file, os.path.getsize(output_file))
+        print(f"\nDocument creat cu succes: {output_file}")
     print(f"Au fost procesate {len(files_to_process)} fișiere")
     print("\nProcesare completă!")
 
 if __name__ == "__main__":
+    report_at_exit()
     main()
\ No newline at end of file
@@ -1,29 +1,27 @@
 import os
 import re
 from pathlib import Path
+from corpus_index import CorpusIndex, workers_requested
+from incremental import StageManifest, incremental_requested
+from id_map import IdMap
+from html_markers import scan_markers
+from text_io import read_text, WriteBatch
+from run_report import timed, timed_files, report_at_exit
 
-def extract_item_id(file_content):
-    """Extrage ID-ul articolului din comentariul HTML."""
-    patterns = [
-        r'<!-- \$item_id = (\d+); // .*? -->',
-        r'<!-- item_id = (\d+); -->',
-        r'<!-- id: (\d+) -->'
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, file_content)
-        if match:
-            return match.group(1)
-    return None
+# Directoarele de lucru
+RO_DIR = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
+OUTPUT_DIR = r'e:\Carte\BB\17 - Site Leadership\alte\Ionel Balauta\Aryeht\Task 1 - Traduce tot site-ul\Doar Google Web\Andreea\Meditatii\2023\Iulia Python\output'
 
 def extract_flags_section(file_content):
     """Extrage secțiunea FLAGS din conținutul fișierului."""
-    pattern = r'<!-- FLAGS_1 -->(.*?)<!-- FLAGS -->'
-    match = re.search(pattern, file_content, re.DOTALL)
-    if match:
-        return match.group(0), match.group(1)
+    markers = scan_markers(file_content)
+    outer = markers.section('flags', outer=True)
+    if outer:
+        inner = markers.section('flags')
+        return file_content[outer[0]:outer[1]], file_content[inner[0]:inner[1]]
     return None, None
 
+@timed('parse')
 def extract_language_link(flags_content, language):
     """Extrage link-ul specific unei limbi din secțiunea FLAGS."""
     # Pattern-uri multiple pentru a face față diferitelor formate
@@ -168,6 +166,7 @@ def is_special_term(ro_filename, en_filename):
     # Cazul implicit - nu este un termen special
     return False
 
+@timed('parse')
 def update_flags_section(file_content, ro_link, en_link, special_term=False):
     """Actualizează secțiunea FLAGS cu noile link-uri."""
     # Extragem secțiunea FLAGS
@@ -219,74 +218,65 @@ def update_flags_section(file_content, ro_link, en_link, special_term=False):
     # Înlocuim secțiunea veche cu cea nouă
     return file_content.replace(flags_section, updated_flags_section), True
 
-def process_files(ro_dir, output_dir):
+def process_files(ro_dir, output_dir, incremental=False):
     """Procesează toate fișierele și face schimbul de flags."""
-    # Dicționare pentru a asocia ID-urile cu fișierele
-    ro_files = {}
-    output_files = {}
     special_terms = []
+    batch = WriteBatch()
+    manifest = StageManifest('pasul3', incremental, read_only=batch.dry_run)
+    # Perechile terminate se înregistrează în manifest abia după ce fișierele lor sunt scrise
+    finished_pairs = []
 
-    # Indexăm fișierele RO după ID
+    # Indexăm fișierele RO și OUTPUT (din indexul corpusului, fără a reciti fișierele nemodificate)
     print("\nIndexare fișiere RO...")
-    for filename in os.listdir(ro_dir):
-        if not filename.endswith('.html'):
-            continue
-
-        file_path = os.path.join(ro_dir, filename)
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                item_id = extract_item_id(content)
-                if item_id:
-                    ro_files[item_id] = {
-                        'path': file_path,
-                        'filename': filename,
-                        'content': content
-                    }
-        except Exception as e:
-            print(f"Eroare la citirea fișierului {filename}: {e}")
-
-    # Indexăm fișierele OUTPUT după ID
+    index = CorpusIndex(workers=workers_requested())
+    ro_rows = index.refresh(ro_dir, 'ro')
     print(f"Indexare fișiere OUTPUT din {output_dir}...")
-    output_file_count = 0
-    for filename in os.listdir(output_dir):
-        if not filename.endswith('.html'):
-            continue
+    output_rows = index.refresh(output_dir, 'en')
+    index.close()
+    output_files = {row['path']: row for row in output_rows}
+
+    # Perechile RO <-> OUTPUT vin din harta ID-urilor: rămân valabile și după renumerotarea EN
+    id_map = IdMap(read_only=batch.dry_run)
+    unmatched = id_map.update(ro_rows, output_rows)
+    id_map.save()
 
-        file_path = os.path.join(output_dir, filename)
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                item_id = extract_item_id(content)
-                if item_id:
-                    output_files[item_id] = {
-                        'path': file_path,
-                        'filename': filename,
-                        'content': content
-                    }
-                    output_file_count += 1
-        except Exception as e:
-            print(f"Eroare la citirea fișierului {filename}: {e}")
-
-    print(f"S-au găsit {len(ro_files)} fișiere RO și {output_file_count} fișiere OUTPUT cu ID-uri.")
+    print(f"S-au găsit {len(ro_rows)} fișiere RO și {len(output_rows)} fișiere OUTPUT "
+          f"({len(output_rows) - unmatched} cu pereche RO).")
 
     # Găsim perechile de fișiere și facem schimbul de flags
     print("\nProcesare perechi de fișiere...\n")
     processed_pairs = 0
     failed_pairs = 0
 
-    for item_id, ro_file in ro_files.items():
-        if item_id in output_files:
-            output_file = output_files[item_id]
+    for ro_file in timed_files(ro_rows, key=lambda row: row['filename']):
+        output_file = next((output_files[pair['en_path']] for pair in id_map.en_for_ro(ro_file['path'])
+                            if pair['en_path'] in output_files), None)
+        if output_file:
+            item_id = ro_file['item_id'] if ro_file['item_id'] is not None else ro_file['filename']
 
             # Afișăm informații despre perechea curentă
             print(f"Procesare pereche ID {item_id}:")
             print(f"  - RO: {ro_file['filename']}")
             print(f"  - EN: {output_file['filename']}")
 
+            # În modul incremental sărim peste perechile neschimbate de la ultima rulare
+            pair_inputs = [ro_file['path'], output_file['path']]
+            if manifest.is_current(str(item_id), pair_inputs):
+                print(f"  - IGNORAT: Fișierele nu s-au schimbat de la ultima rulare.")
+                continue
+
+            # Conținutul complet se citește doar pentru perechile găsite și nu rămâne în hărți
+            try:
+                ro_content = read_text(ro_file['path'])
+                output_content = read_text(output_file['path'])
+            except OSError as e:
+                print(f"  - EȘEC: Eroare la citirea fișierelor perechii: {e}")
+                failed_pairs += 1
+                continue
+
             # Extragem secțiunile FLAGS
-            ro_flags_section, ro_flags_content = extract_flags_section(ro_file['content'])
-            output_flags_section, output_flags_content = extract_flags_section(output_file['content'])
+            ro_flags_section, ro_flags_content = extract_flags_section(ro_content)
+            output_flags_section, output_flags_content = extract_flags_section(output_content)
 
             if not ro_flags_section or not output_flags_section:
                 print(f"  - EȘEC: Nu s-a găsit secțiunea FLAGS în unul sau ambele fișiere. Se continuă.")
@@ -329,32 +319,50 @@ def process_files(ro_dir, output_dir):
                 print(f"  - SPECIAL: Termen special detectat! Se păstrează link-ul în EN.")
 
             # Actualizăm conținutul fișierului RO - întotdeauna înlocuim link-ul EN
-            ro_updated_content, ro_modified = update_flags_section(ro_file['content'], None, en_link_in_output, is_special)
+            ro_updated_content, ro_modified = update_flags_section(ro_content, None, en_link_in_output, is_special)
 
             # Actualizăm conținutul fișierului OUTPUT - întotdeauna înlocuim link-ul RO
-            output_updated_content, output_modified = update_flags_section(output_file['content'], ro_link_in_ro, None, is_special)
+            output_updated_content, output_modified = update_flags_section(output_content, ro_link_in_ro, None, is_special)
 
             # Verificăm dacă s-au făcut modificări
             if not ro_modified and not output_modified:
                 print(f"  - IGNORAT: Nu au fost necesare modificări.")
+                finished_pairs.append((str(item_id), pair_inputs))
                 continue
 
-            # Salvăm fișierele actualizate
-            with open(ro_file['path'], 'w', encoding='utf-8') as f:
-                f.write(ro_updated_content)
-
-            with open(output_file['path'], 'w', encoding='utf-8') as f:
-                f.write(output_updated_content)
+            # Salvăm doar fișierul (sau fișierele) care s-au schimbat
+            if ro_modified:
+                batch.write(ro_file['path'], ro_updated_content)
+            if output_modified:
+                batch.write(output_file['path'], output_updated_content)
 
             print(f"  - SUCCES: Fișierele au fost actualizate.")
+            finished_pairs.append((str(item_id), pair_inputs))
             processed_pairs += 1
 
+    try:
+        batch.flush()
+    except OSError:
+        print("\nEROARE: Unele fișiere nu au putut fi salvate:")
+    for path, error in batch.failed.items():
+        print(f"  - {os.path.basename(path)}: {error}")
+    print(f"\nScrieri: {batch.summary()}")
+
+    # Perechile cu o scriere eșuată nu sunt memorate, ca să fie reluate la rularea următoare
+    for key, pair_inputs in finished_pairs:
+        if any(batch.failed_write(path) for path in pair_inputs):
+            continue
+        manifest.record(key, pair_inputs)
+    manifest.save()
+    if manifest.skipped:
+        print(f"\nPerechi neschimbate (incremental): {manifest.skipped}")
+
     return processed_pairs, failed_pairs, special_terms
 
 def main():
     # Definim directoarele
-    ro_dir = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
-    output_dir = r'e:\Carte\BB\17 - Site Leadership\alte\Ionel Balauta\Aryeht\Task 1 - Traduce tot site-ul\Doar Google Web\Andreea\Meditatii\2023\Iulia Python\output'
+    ro_dir = RO_DIR
+    output_dir = OUTPUT_DIR
 
     # Verificăm dacă directoarele există
     if not os.path.exists(ro_dir):
@@ -367,7 +375,7 @@ def main():
 
     # Procesăm fișierele
     print("Începere procesare fișiere...")
-    processed_pairs, failed_pairs, special_terms = process_files(ro_dir, output_dir)
+    processed_pairs, failed_pairs, special_terms = process_files(ro_dir, output_dir, incremental_requested())
 
     # Afișăm rezultatul
     print(f"\nRezultat final:")
@@ -387,4 +395,5 @@ def main():
     print("\nProcesare completă!")
 
 if __name__ == "__main__":
+    report_at_exit()
     main()
\ No newline at end of file
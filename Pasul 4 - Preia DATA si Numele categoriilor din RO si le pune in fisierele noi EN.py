@@ -1,6 +1,16 @@
 import os
 import re
 from pathlib import Path
+from corpus_index import CorpusIndex, workers_requested
+from incremental import StageManifest, incremental_requested
+from id_map import IdMap
+from html_markers import scan_markers, text_dreapta_span
+from text_io import read_text, WriteBatch
+from run_report import timed, timed_files, report_at_exit
+
+# Working directories
+OUTPUT_DIR = r"e:\Carte\BB\17 - Site Leadership\alte\Ionel Balauta\Aryeht\Task 1 - Traduce tot site-ul\Doar Google Web\Andreea\Meditatii\2023\Iulia Python\output"
+RO_DIR = r"e:\Carte\BB\17 - Site Leadership\Principal\ro"
 
 def translate_month(date_str):
     """Translate month from Romanian to English."""
@@ -89,118 +99,20 @@ def category_mapping():
         }
     }
 
-def read_file_with_fallback_encoding(file_path):
-    """Read file using various encodings to handle diacritics."""
-    encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
-    content = None
-
-    for encoding in encodings:
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
-                print(f"  [Debug] File read with encoding: {encoding}")
-                break
-        except UnicodeDecodeError:
-            print(f"  [Debug] Error reading with encoding: {encoding}")
-            continue
-
-    if content is None:
-        print(f"ERROR: Could not read file {file_path} with any available encoding.")
-
-    return content
-
-def extract_item_id(content):
-    """Extract article ID from HTML content."""
-    patterns = [
-        r'<!-- \$item_id = (\d+); // .*? -->',
-        r'<!-- item_id = (\d+); -->',
-        r'<!-- id: (\d+) -->'
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, content)
-        if match:
-            return match.group(1)
-
-    return None
-
-def extract_ro_link_from_flags(content):
-    """Extract Romanian link from the FLAGS section."""
-    # Look for the entire FLAGS section
-    flag_section = re.search(r'<!-- FLAGS_1 -->(.*?)<!-- FLAGS -->', content, re.DOTALL)
-    if not flag_section:
-        return None
-
-    flags = flag_section.group(1)
-
-    # Look for the Romanian link
-    ro_match = re.search(r'<a href="https://neculaifantanaru\.com/([^"]+)"[^>]*?><img[^>]*?title="ro"', flags)
-    if ro_match:
-        return ro_match.group(1)
-
-    return None
-
-def extract_filename_from_path(file_path):
-    """Extract the filename from a path, without extension."""
-    basename = os.path.basename(file_path)
-    filename = os.path.splitext(basename)[0]
-    return filename
-
-def find_matching_ro_file(en_filename, ro_files_by_id, ro_files_by_name, ro_dir):
-    """Find matching Romanian file using multiple methods."""
-    # Method 1: Try to match by ID
-    if en_filename in ro_files_by_id:
-        return ro_files_by_id[en_filename]
-
-    # Method 2: Try direct filename match
-    if en_filename in ro_files_by_name:
-        ro_path = os.path.join(ro_dir, f"{en_filename}.html")
-        if os.path.exists(ro_path):
-            content = read_file_with_fallback_encoding(ro_path)
-            return {
-                'path': ro_path,
-                'filename': f"{en_filename}.html",
-                'content': content
-            }
-
-    return None
-
-def extract_category_info(content):
-    """Extract category information from Romanian file."""
-    if not content:
-        return None
-
-    # Look for text_dreapta section
-    pattern = r'<td class="text_dreapta">(.*?)</td>'
-    text_section = re.search(pattern, content, re.DOTALL)
-    if not text_section:
-        print("  [Debug] The text_dreapta section not found")
-        return None
-
-    text_content = text_section.group(1)
-
-    # Extract date - adjust the pattern to be more flexible
-    date_pattern = r'On (.*?), in'
-    date_match = re.search(date_pattern, text_content)
-    if not date_match:
+def category_info_from_row(ro_row):
+    """Build category information from an indexed Romanian file, without reading it."""
+    if not ro_row['data']:
         print("  [Debug] Date not found in text_dreapta")
         return None
 
-    date = date_match.group(1).strip()
-
-    # Extract category
-    category_pattern = r'<a href="https://neculaifantanaru\.com/([^"]+)" title="[^"]*" class="[^"]*"[^>]*>(.*?)</a>'
-    category_match = re.search(category_pattern, text_content)
-    if not category_match:
-        category_pattern = r'<a href="https://neculaifantanaru\.com/([^"]+)"[^>]*>(.*?)</a>'
-        category_match = re.search(category_pattern, text_content)
-        if not category_match:
-            print("  [Debug] Category link not found in text_dreapta")
-            return None
+    if not ro_row['categorie_link']:
+        print("  [Debug] Category link not found in text_dreapta")
+        return None
 
-    category_link = category_match.group(1)
-    category_title = category_match.group(2).strip()
+    return build_category_info(ro_row['data'], ro_row['categorie_link'], ro_row['categorie_titlu'])
 
+def build_category_info(date, category_link, category_title):
+    """Map the Romanian date and category to their English equivalents."""
     # Remove .html extension
     if category_link.endswith('.html'):
         category_link = category_link[:-5]
@@ -237,6 +149,7 @@ def extract_category_info(content):
         'en_category_title': en_title
     }
 
+@timed('parse')
 def update_en_file_category(en_content, category_info):
     """Update category and date information in the EN file."""
     if not en_content or not category_info:
@@ -246,15 +159,16 @@ def update_en_file_category(en_content, category_info):
     new_text = f'On {category_info["date"]}, in <a href="https://neculaifantanaru.com/en/{category_info["en_category_link"]}.html" title="View all articles from {category_info["en_category_title"]}" class="external" rel="category tag">{category_info["en_category_title"]}</a>, by Neculai Fantanaru'
 
     # Replace old section
-    pattern = r'<td class="text_dreapta">(.*?)</td>'
-    updated_content = re.sub(pattern, f'<td class="text_dreapta">{new_text}</td>', en_content, count=1, flags=re.DOTALL)
+    text_span = text_dreapta_span(en_content, scan_markers(en_content))
+    if not text_span:
+        return en_content
 
-    return updated_content
+    return en_content[:text_span[0]] + new_text + en_content[text_span[1]:]
 
 def process_files():
     """Process all files to update categories and dates."""
-    output_dir = r"e:\Carte\BB\17 - Site Leadership\alte\Ionel Balauta\Aryeht\Task 1 - Traduce tot site-ul\Doar Google Web\Andreea\Meditatii\2023\Iulia Python\output"
-    ro_dir = r"e:\Carte\BB\17 - Site Leadership\Principal\ro"
+    output_dir = OUTPUT_DIR
+    ro_dir = RO_DIR
 
     if not os.path.exists(output_dir):
         print(f"ERROR: Output directory does not exist: {output_dir}")
@@ -264,101 +178,52 @@ def process_files():
         print(f"ERROR: RO directory does not exist: {ro_dir}")
         return
 
+    batch = WriteBatch()
+    manifest = StageManifest('pasul4', incremental_requested(), read_only=batch.dry_run)
+    # Files are recorded in the manifest only after their new content is written
+    updated_files = []
+
     print("\nStarting file processing...")
     print("=" * 60)
 
-    # Index Romanian files by ID and filename for quick reference
-    ro_files_by_id = {}
-    ro_files_by_name = {}
-    ro_files_count = 0
-
+    # Index Romanian files by path for quick reference
+    # (metadata comes from the corpus index; only new or modified files are read)
     print(f"Indexing files from Romanian directory: {ro_dir}")
-    for filename in os.listdir(ro_dir):
-        if not filename.endswith('.html'):
-            continue
-
-        ro_files_count += 1
-        file_path = os.path.join(ro_dir, filename)
-        content = read_file_with_fallback_encoding(file_path)
-
-        if content:
-            # Index by ID
-            item_id = extract_item_id(content)
-            if item_id:
-                ro_files_by_id[item_id] = {
-                    'path': file_path,
-                    'filename': filename,
-                    'content': content
-                }
-
-            # Index by filename without extension
-            base_filename = os.path.splitext(filename)[0]
-            ro_files_by_name[base_filename] = {
-                'path': file_path,
-                'filename': filename,
-                'content': content
-            }
-
-    print(f"Indexed {len(ro_files_by_id)} files by ID from {ro_files_count} Romanian files")
-    print(f"Indexed {len(ro_files_by_name)} files by name from {ro_files_count} Romanian files\n")
+    index = CorpusIndex(workers=workers_requested())
+    ro_rows = index.refresh(ro_dir, 'ro')
+    ro_files_by_path = {row['path']: row for row in ro_rows}
+    print(f"  [Debug] Re-read {index.last_refresh_reads} new or modified Romanian files")
+    print(f"Indexed {len(ro_rows)} Romanian files")
+
+    output_rows = index.refresh(output_dir, 'en')
+    index.close()
+
+    # RO <-> EN pairs: known pairs survive EN renumbering, new ones are matched once
+    # (RO ID from Pasul 2, FLAGS link, filename, ID) and saved in the ID map
+    id_map = IdMap(read_only=batch.dry_run)
+    unmatched = id_map.update(ro_rows, output_rows)
+    id_map.save()
+    print(f"Paired {len(output_rows) - unmatched} of {len(output_rows)} output files with Romanian files\n")
 
     # Process files from output directory
     output_files_count = 0
     updated_files_count = 0
     error_files_count = 0
 
-    for filename in os.listdir(output_dir):
-        if not filename.endswith('.html'):
-            continue
-
+    for output_row in timed_files(output_rows, key=lambda row: row['filename']):
         output_files_count += 1
-        file_path = os.path.join(output_dir, filename)
-        base_filename = os.path.splitext(filename)[0]
+        filename = output_row['filename']
+        file_path = output_row['path']
 
         print(f"Processing file: {filename}")
-        content = read_file_with_fallback_encoding(file_path)
 
-        if not content:
-            print(f"  ERROR: Could not read file {filename}. Continuing with next file.")
-            error_files_count += 1
-            continue
-
-        # Method 1: Direct filename match
+        # Matching Romanian file from the ID map
         ro_file = None
-        if base_filename in ro_files_by_name:
-            ro_file = ro_files_by_name[base_filename]
-            print(f"  Found Romanian file by name: {ro_file['filename']}")
-
-        # Method 2: Extract ID and match
-        if not ro_file:
-            item_id = extract_item_id(content)
-            if item_id and item_id in ro_files_by_id:
-                ro_file = ro_files_by_id[item_id]
-                print(f"  Found Romanian file by ID ({item_id}): {ro_file['filename']}")
-
-        # Method 3: Extract Romanian link from FLAGS
-        if not ro_file:
-            ro_link = extract_ro_link_from_flags(content)
-            if ro_link:
-                print(f"  Romanian link found in FLAGS: {ro_link}")
-
-                # Build path to Romanian file
-                if not ro_link.endswith('.html'):
-                    ro_link += '.html'
-
-                # Extract just the filename part
-                ro_filename = os.path.basename(ro_link)
-                ro_path = os.path.join(ro_dir, ro_filename)
-
-                if os.path.exists(ro_path):
-                    ro_content = read_file_with_fallback_encoding(ro_path)
-                    if ro_content:
-                        ro_file = {
-                            'path': ro_path,
-                            'filename': ro_filename,
-                            'content': ro_content
-                        }
-                        print(f"  Found Romanian file by link: {ro_filename}")
+        pair = id_map.ro_for_en(file_path)
+        if pair:
+            ro_file = ro_files_by_path.get(pair['ro_path'])
+        if ro_file:
+            print(f"  Found Romanian file (ID {pair['ro_id']}): {ro_file['filename']}")
 
         # If no Romanian file found, skip
         if not ro_file:
@@ -366,8 +231,14 @@ def process_files():
             error_files_count += 1
             continue
 
+        # Incremental mode: skip files whose EN and RO inputs are unchanged since the last run
+        unit_inputs = [file_path, ro_file['path']]
+        if manifest.is_current(filename, unit_inputs):
+            print(f"  Unchanged since the last run, skipping.\n")
+            continue
+
         # Extract category info from Romanian file
-        category_info = extract_category_info(ro_file['content'])
+        category_info = category_info_from_row(ro_file)
 
         if not category_info:
             print(f"  WARNING: Could not extract category info from Romanian file {ro_file['filename']}")
@@ -379,28 +250,48 @@ def process_files():
         print(f"    - RO Category: {category_info['ro_category_title']} ({category_info['ro_category_link']})")
         print(f"    - EN Category: {category_info['en_category_title']} ({category_info['en_category_link']})")
 
+        content = read_text(file_path)
+        if not content:
+            print(f"  ERROR: Could not read file {filename}. Continuing with next file.")
+            error_files_count += 1
+            continue
+
         # Update EN file
         updated_content = update_en_file_category(content, category_info)
 
-        # Save updated file
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
-            updated_files_count += 1
-            print(f"  File successfully updated!")
-        except Exception as e:
-            print(f"  ERROR: Could not save file {filename}: {str(e)}")
-            error_files_count += 1
+        # Save updated file (unchanged content is not rewritten; writes are flushed in batches)
+        batch.write(file_path, updated_content)
+        updated_files.append((filename, file_path, unit_inputs))
+        print(f"  File successfully updated!")
 
         print("\n")
 
+    try:
+        batch.flush()
+    except OSError:
+        print("  ERROR: Some files could not be saved (listed below)")
+    print(f"Writes: {batch.summary()}")
+
+    # Only the files that could not be written count as errors and stay out of the manifest
+    for path, error in batch.failed.items():
+        print(f"  ERROR: Could not save {os.path.basename(path)}: {str(error)}")
+    error_files_count += len(batch.failed)
+    for filename, file_path, unit_inputs in updated_files:
+        if batch.failed_write(file_path):
+            continue
+        manifest.record(filename, unit_inputs)
+        updated_files_count += 1
+    manifest.save()
+
     print("=" * 60)
     print("Final report:")
     print(f"- Total files in output directory: {output_files_count}")
     print(f"- Successfully updated files: {updated_files_count}")
+    print(f"- Unchanged files skipped (incremental): {manifest.skipped}")
     print(f"- Files with errors: {error_files_count}")
     print("=" * 60)
     print("Processing complete!")
 
 if __name__ == "__main__":
+    report_at_exit()
     process_files()
\ No newline at end of file
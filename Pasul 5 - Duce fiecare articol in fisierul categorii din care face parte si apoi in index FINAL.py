@@ -1,8 +1,15 @@
 import os
 import re
+import html
 import shutil
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
+from corpus_index import CorpusIndex
+from incremental import StageManifest, incremental_requested
+from html_markers import scan_markers
+from article_runs import find_title, HTML_PARSER
+from text_io import read_text, WriteBatch
+from run_report import timed, timed_files, report_at_exit
 
 # Track processing start time
 START_TIME = datetime.now()
@@ -14,21 +21,15 @@ EN_DIR = r"e:\Carte\BB\17 - Site Leadership\Principal\en"
 RO_DIR = r"e:\Carte\BB\17 - Site Leadership\Principal\ro"
 BACKUP_DIR = r"c:\Folder1\fisiere_html"
 
+SITE_URL = 'https://neculaifantanaru.com/'
+# The quote paragraph, parsed on its own instead of the whole page
+QUOTE_PATTERN = re.compile(r'<p\b[^>]*\bclass="[^"]*\btext_obisnuit2\b[^"]*"[^>]*>.*?</p>', re.DOTALL)
+
 def log(message):
     if DEBUG:
         print(message)
 
-def read_file_with_fallback(file_path):
-    encodings = ['utf-8', 'latin1', 'cp1252']
-    for encoding in encodings:
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
-        except UnicodeDecodeError:
-            continue
-    log(f"[ERROR] Failed to read {file_path}")
-    return None
-
+@timed('parse')
 def extract_article_data(html_content):
     soup = BeautifulSoup(html_content, 'html.parser')
 
@@ -55,10 +56,6 @@ def extract_article_data(html_content):
         return None
     date_str = date_match.group(1).strip()
 
-    # Ensure date has year
-    if not re.search(r'\d{4}$', date_str):
-        date_str += f", {datetime.now().year}"
-
     # Category extraction
     category_tag = meta_tag.find('a')
     if not category_tag:
@@ -74,6 +71,40 @@ def extract_article_data(html_content):
     quote_tag = soup.find('p', class_='text_obisnuit2')
     quote = quote_tag.get_text().strip() if quote_tag else None
 
+    return build_article(title, url, date_str, category_url, category_name, ro_link, quote)
+
+@timed('parse')
+def article_from_row(row, content):
+    """Same result as extract_article_data, with the date, category, canonical URL and RO flag
+    taken from the corpus index row; only the title and the quote are parsed from the page.
+
+    Pages the index could not read in the template's format go through extract_article_data.
+    """
+    if not (row['canonical'] and row['data'] and row['categorie_link']):
+        return extract_article_data(content)
+
+    title_tag = find_title(content)
+    if not title_tag:
+        return None
+    title = title_tag.get_text().strip()
+
+    # As with the text of td.text_dreapta: the date runs from "On " to the first comma
+    date_str = row['data'].split(',')[0].strip()
+
+    quote_match = QUOTE_PATTERN.search(content)
+    quote_tag = BeautifulSoup(quote_match.group(0), HTML_PARSER).find('p') if quote_match else None
+    quote = quote_tag.get_text().strip() if quote_tag else None
+
+    ro_link = SITE_URL + row['flag_ro'] if row['flag_ro'] else None
+    return build_article(title, row['canonical'].strip(), date_str, SITE_URL + row['categorie_link'],
+                         html.unescape(row['categorie_titlu'] or ''), ro_link, quote)
+
+def build_article(title, url, date_str, category_url, category_name, ro_link, quote):
+    """The article record used for the category and index files."""
+    # Ensure date has year
+    if not re.search(r'\d{4}$', date_str):
+        date_str += f", {datetime.now().year}"
+
     # Parse date for sorting
     try:
         if ',' in date_str:
@@ -113,8 +144,8 @@ def generate_article_html(article):
       </table>
       <p class="text_obisnuit"></p>"""
 
-def update_category_file(category_path, articles):
-    content = read_file_with_fallback(category_path)
+def update_category_file(category_path, articles, batch):
+    content = read_text(category_path)
     if not content:
         return False
 
@@ -123,13 +154,13 @@ def update_category_file(category_path, articles):
     expected_category_url = f"https://neculaifantanaru.com/en/{category_filename}"
 
     # Extract the section between <!-- ARTICOL CATEGORIE START --> and <!-- ARTICOL CATEGORIE FINAL -->
-    section_pattern = re.compile(r'<!-- ARTICOL CATEGORIE START -->.*?<!-- ARTICOL CATEGORIE FINAL -->', re.DOTALL)
-    section_match = section_pattern.search(content)
-    if not section_match:
+    markers = scan_markers(content)
+    section_span = markers.section('categorie', outer=True)
+    if not section_span:
         log(f"[ERROR] Nu s-a găsit secțiunea de articole în {category_filename}")
         return False
 
-    section_content = section_match.group(0)
+    section_content = content[section_span[0]:section_span[1]]
 
     # Find existing article URLs within the section
     existing_urls = set(re.findall(r'href="(https://neculaifantanaru\.com/en/[^"]+)"', section_content))
@@ -144,11 +175,7 @@ def update_category_file(category_path, articles):
         return True
 
     # Find insertion point
-    insert_pos = content.find('<!-- ARTICOL CATEGORIE START -->')
-    if insert_pos == -1:
-        log(f"[ERROR] Nu s-a găsit punctul de inserare în {category_filename}")
-        return False
-    insert_pos = content.find('<div align="justify">', insert_pos) + len('<div align="justify">')
+    insert_pos = content.find('<div align="justify">', section_span[0]) + len('<div align="justify">')
 
     # Generate new content
     new_content = content[:insert_pos]
@@ -157,20 +184,15 @@ def update_category_file(category_path, articles):
     new_content += content[insert_pos:]
 
     # Write updated file
-    try:
-        with open(category_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        log(f"[SUCCESS] Updated {category_filename} with {len(new_articles)} articles")
-        return True
-    except Exception as e:
-        log(f"[ERROR] Failed to write {category_path}: {str(e)}")
-        return False
+    batch.write(category_path, new_content)
+    log(f"[SUCCESS] Updated {category_filename} with {len(new_articles)} articles")
+    return True
 
-def update_index_file(en_index_path, articles, ro_index_path):
+def update_index_file(en_index_path, articles, ro_index_path, batch):
     log(f"\nUpdating index file: {os.path.basename(en_index_path)}")
 
     # Read the current EN index content
-    content = read_file_with_fallback(en_index_path)
+    content = read_text(en_index_path)
     if not content:
         log("[ERROR] Failed to read EN index file")
         return False
@@ -184,7 +206,7 @@ def update_index_file(en_index_path, articles, ro_index_path):
     # Read RO index if exists
     ro_content = ""
     if os.path.exists(ro_index_path):
-        ro_content = read_file_with_fallback(ro_index_path) or ""
+        ro_content = read_text(ro_index_path) or ""
         log("[DEBUG] RO index content loaded")
     else:
         log("[WARNING] RO index file not found")
@@ -220,8 +242,9 @@ def update_index_file(en_index_path, articles, ro_index_path):
     # Sort articles by date (ascending)
     valid_articles.sort(key=lambda x: x['date_obj'])
 
-    # Find insertion point
-    insert_match = re.search(r'<!-- ARTICOL CATEGORIE START -->\s*<div align="justify">', content)
+    # Find insertion point (the <div align="justify"> right after the category start marker)
+    start_marker = scan_markers(content).first('ARTICOL CATEGORIE START')
+    insert_match = re.compile(r'\s*<div align="justify">').match(content, start_marker[1]) if start_marker else None
     if not insert_match:
         log("[ERROR] Could not find insertion point in index")
         return False
@@ -235,14 +258,9 @@ def update_index_file(en_index_path, articles, ro_index_path):
     new_content += content[insert_pos:]
 
     # Write updated file
-    try:
-        with open(en_index_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        log(f"[SUCCESS] Added {len(valid_articles)} articles to index")
-        return True
-    except Exception as e:
-        log(f"[ERROR] Failed to write index: {str(e)}")
-        return False
+    batch.write(en_index_path, new_content)
+    log(f"[SUCCESS] Added {len(valid_articles)} articles to index")
+    return True
 
 def main():
     # Verifică existența directorului OUTPUT_DIR
@@ -265,25 +283,41 @@ def main():
     categories = set()
     modified_files = set()
 
+    # Incremental mode: articles already published from the same inputs are skipped
+    batch = WriteBatch()
+    manifest = StageManifest('pasul5', incremental_requested(), read_only=batch.dry_run)
+    ro_index = os.path.join(RO_DIR, 'index.html')
+    processed_units = []
+
     log("\nSTEP 1: Processing articles...")
-    for filename in os.listdir(OUTPUT_DIR):
-        if not filename.endswith('.html'):
+    # The index already holds the date, category and links of every page (re-read only when changed)
+    index = CorpusIndex()
+    output_rows = index.refresh(OUTPUT_DIR, 'en')
+    index.close()
+
+    for row in timed_files(output_rows, key=lambda row: row['filename']):
+        filename = row['filename']
+        filepath = row['path']
+        unit_inputs = [filepath, ro_index]
+        if manifest.is_current(filename, unit_inputs):
+            log(f"[SKIP] Unchanged since the last run: {filename}")
             continue
 
-        filepath = os.path.join(OUTPUT_DIR, filename)
-        content = read_file_with_fallback(filepath)
+        content = read_text(filepath)
         if not content:
             continue
 
-        article = extract_article_data(content)
+        article = article_from_row(row, content)
         if article:
             articles.append(article)
             categories.add(article['category_url'])
 
             # Copy to EN directory
             en_path = os.path.join(EN_DIR, filename)
-            shutil.copy2(filepath, en_path)
+            if not batch.dry_run:
+                shutil.copy2(filepath, en_path)
             modified_files.add(en_path)
+            processed_units.append((filename, unit_inputs, en_path))
             log(f"[COPY] {filename} -> {en_path}")
 
     log("\n" + "="*60)
@@ -294,7 +328,10 @@ def main():
     log("="*60)
 
     if not articles:
-        log("[ERROR] No articles processed")
+        if manifest.skipped:
+            log(f"[INFO] Nothing changed since the last run ({manifest.skipped} articles skipped)")
+        else:
+            log("[ERROR] No articles processed")
         return
 
     log("\nSTEP 2: Updating category files...")
@@ -302,16 +339,26 @@ def main():
         category_file = os.path.basename(category_url)
         category_path = os.path.join(EN_DIR, category_file)
         if os.path.exists(category_path):
-            if update_category_file(category_path, articles):
+            if update_category_file(category_path, articles, batch):
                 modified_files.add(category_path)
 
     log("\nSTEP 3: Updating EN index...")
     en_index = os.path.join(EN_DIR, 'index.html')
-    ro_index = os.path.join(RO_DIR, 'index.html')
-    if update_index_file(en_index, articles, ro_index):
+    if update_index_file(en_index, articles, ro_index, batch):
         modified_files.add(en_index)
 
+    # Category and index files are written together (atomically, only if changed)
+    try:
+        batch.flush()
+    except OSError as e:
+        log(f"[ERROR] Failed to write category/index files: {str(e)}")
+        return
+    log(f"[INFO] Writes: {batch.summary()}")
+
     log("\nSTEP 4: Creating backup...")
+    if batch.dry_run:
+        # Nothing was written, so there is nothing to back up
+        modified_files = set()
     try:
         os.makedirs(BACKUP_DIR, exist_ok=True)
         backed_up = 0
@@ -331,6 +378,10 @@ def main():
     except Exception as e:
         log(f"[ERROR] Backup failed: {str(e)}")
 
+    for filename, unit_inputs, en_path in processed_units:
+        manifest.record(filename, unit_inputs, outputs=[en_path])
+    manifest.save()
+
     log("\n" + "="*60)
     log("FINAL PROCESSING REPORT")
     log(f"Total articles processed: {len(articles)}")
@@ -340,4 +391,5 @@ def main():
     log("="*60)
 
 if __name__ == "__main__":
+    report_at_exit()
     main()
\ No newline at end of file
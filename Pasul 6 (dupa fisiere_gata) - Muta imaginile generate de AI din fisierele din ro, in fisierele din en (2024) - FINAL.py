@@ -1,30 +1,42 @@
 import os
 import re
+from incremental import StageManifest, incremental_requested
+from text_io import read_text, WriteBatch
+from run_report import timed, timed_files, report_at_exit
 
 ro_directory = r'e:\Carte\BB\17 - Site Leadership\Principal 2022\ro'
 en_directory = r'c:\Folder1\fisiere_gata'
 
+@timed('parse')
 def get_ro_filename(en_content):
    match = re.search(r'<li><a cunt_code="\+40" href="https://neculaifantanaru\.com/(.*?)\.html"', en_content)
    return match.group(1) if match else None
 
+@timed('parse')
 def get_image_url(content):
    img_match = re.search(r'<img src="(https://neculaifantanaru\.com/images/.*?_image\.jpg)"', content)
    return img_match.group(1) if img_match else None
 
 def process_files():
    print("Start procesare fișiere...")
+   batch = WriteBatch()
+   manifest = StageManifest('pasul6', incremental_requested(), read_only=batch.dry_run)
+   updated_files = []
 
-   for en_file in os.listdir(en_directory):
+   for en_file in timed_files(os.listdir(en_directory)):
        if not en_file.endswith('.html'):
            continue
 
        print(f"\nProcesare: {en_file}")
        en_file_path = os.path.join(en_directory, en_file)
 
+       # În modul --incremental sărim peste fișierele EN/RO neschimbate de la ultima rulare
+       if manifest.is_current(en_file):
+           print("Neschimbat de la ultima rulare, se sare peste.")
+           continue
+
        try:
-           with open(en_file_path, 'r', encoding='utf-8') as f:
-               en_content = f.read()
+           en_content = read_text(en_file_path)
 
            ro_filename = get_ro_filename(en_content)
            if not ro_filename:
@@ -38,8 +50,7 @@ def process_files():
 
            print(f"Fișier RO găsit: {ro_filename}.html")
 
-           with open(ro_file_path, 'r', encoding='utf-8') as f:
-               ro_content = f.read()
+           ro_content = read_text(ro_file_path)
 
            image_url = get_image_url(ro_content)
            if not image_url:
@@ -55,15 +66,33 @@ def process_files():
                en_content
            )
 
-           with open(en_file_path, 'w', encoding='utf-8') as f:
-               f.write(new_en_content)
+           batch.write(en_file_path, new_en_content)
 
            print(f"Imagine actualizată în {en_file}")
+           updated_files.append((en_file, [en_file_path, ro_file_path]))
 
        except Exception as e:
            print(f"Eroare la procesarea {en_file}: {str(e)}")
 
+   # Scrierile se fac la final, atomic, și doar pentru fișierele care chiar s-au schimbat
+   try:
+       batch.flush()
+   except OSError:
+       print("\nEroare: unele fișiere nu au putut fi salvate:")
+   for path, error in batch.failed.items():
+       print(f"  - {os.path.basename(path)}: {error}")
+   print(f"\nScrieri: {batch.summary()}")
+
+   # Fișierele cu scrierea eșuată nu sunt memorate, ca să fie reluate la rularea următoare
+   for en_file, unit_inputs in updated_files:
+       if batch.failed_write(unit_inputs[0]):
+           continue
+       manifest.record(en_file, unit_inputs)
+   manifest.save()
+   if manifest.skipped:
+       print(f"\nFișiere neschimbate (incremental): {manifest.skipped}")
    print("\nProcesare terminată")
 
 if __name__ == "__main__":
+   report_at_exit()
    process_files()
\ No newline at end of file
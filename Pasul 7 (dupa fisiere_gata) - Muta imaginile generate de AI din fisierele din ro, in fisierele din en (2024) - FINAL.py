@@ -1,5 +1,8 @@
 import os
 import re
+from incremental import StageManifest, incremental_requested
+from text_io import read_text, WriteBatch, dry_run_requested
+from run_report import timed, timed_files, report_at_exit
 import shutil
 import ftplib
 
@@ -12,27 +15,36 @@ FTP_USER = "USER"
 FTP_PASSWORD = "PASS"  # Parola hardcodată
 FTP_REMOTE_DIR = "/public_html/en/"  # Directorul corect pe serverul FTP
 
+@timed('parse')
 def get_ro_filename(en_content):
    match = re.search(r'<li><a cunt_code="\+40" href="https://neculaifantanaru\.com/(.*?)\.html"', en_content)
    return match.group(1) if match else None
 
+@timed('parse')
 def get_image_url(content):
    img_match = re.search(r'<img src="(https://neculaifantanaru\.com/images/.*?_image\.jpg)"', content)
    return img_match.group(1) if img_match else None
 
 def process_files():
    print("Start procesare fișiere...")
+   batch = WriteBatch()
+   manifest = StageManifest('pasul7_imagini', incremental_requested(), read_only=batch.dry_run)
+   updated_files = []
 
-   for en_file in os.listdir(en_directory):
+   for en_file in timed_files(os.listdir(en_directory)):
        if not en_file.endswith('.html'):
            continue
 
        print(f"\nProcesare: {en_file}")
        en_file_path = os.path.join(en_directory, en_file)
 
+       # În modul --incremental sărim peste fișierele EN/RO neschimbate de la ultima rulare
+       if manifest.is_current(en_file):
+           print("Neschimbat de la ultima rulare, se sare peste.")
+           continue
+
        try:
-           with open(en_file_path, 'r', encoding='utf-8') as f:
-               en_content = f.read()
+           en_content = read_text(en_file_path)
 
            ro_filename = get_ro_filename(en_content)
            if not ro_filename:
@@ -46,8 +58,7 @@ def process_files():
 
            print(f"Fișier RO găsit: {ro_filename}.html")
 
-           with open(ro_file_path, 'r', encoding='utf-8') as f:
-               ro_content = f.read()
+           ro_content = read_text(ro_file_path)
 
            image_url = get_image_url(ro_content)
            if not image_url:
@@ -63,14 +74,31 @@ def process_files():
                en_content
            )
 
-           with open(en_file_path, 'w', encoding='utf-8') as f:
-               f.write(new_en_content)
+           batch.write(en_file_path, new_en_content)
 
            print(f"Imagine actualizată în {en_file}")
+           updated_files.append((en_file, [en_file_path, ro_file_path]))
 
        except Exception as e:
            print(f"Eroare la procesarea {en_file}: {str(e)}")
 
+   # Scrierile se fac la final, atomic, și doar pentru fișierele care chiar s-au schimbat
+   try:
+       batch.flush()
+   except OSError:
+       print("\nEroare: unele fișiere nu au putut fi salvate:")
+   for path, error in batch.failed.items():
+       print(f"  - {os.path.basename(path)}: {error}")
+   print(f"\nScrieri: {batch.summary()}")
+
+   # Fișierele cu scrierea eșuată nu sunt memorate, ca să fie reluate la rularea următoare
+   for en_file, unit_inputs in updated_files:
+       if batch.failed_write(unit_inputs[0]):
+           continue
+       manifest.record(en_file, unit_inputs)
+   manifest.save()
+   if manifest.skipped:
+       print(f"\nFișiere neschimbate (incremental): {manifest.skipped}")
    print("\nProcesare terminată")
 
 def upload_to_ftp(local_file_path, remote_file_name):
@@ -149,8 +177,10 @@ def copy_output_files():
     total_files = 0
     copied_files = 0
     error_files = 0
+    dry_run = dry_run_requested()
+    manifest = StageManifest('pasul7_output', incremental_requested(), read_only=dry_run)
 
-    for filename in os.listdir(source_dir):
+    for filename in timed_files(os.listdir(source_dir)):
         if not filename.endswith('.html'):
             continue
 
@@ -158,23 +188,37 @@ def copy_output_files():
         source_path = os.path.join(source_dir, filename)
         target_path = os.path.join(target_dir, filename)
 
+        # În modul --incremental nu mai copiem fișierele neschimbate
+        if manifest.is_current(filename, [source_path]):
+            continue
+
         try:
             # Verifică dacă fișierul există deja la destinație
             if os.path.exists(target_path):
                 print(f"Fișierul există deja la destinație, se suprascrie: {filename}")
 
+            # La --dry-run doar afișăm ce s-ar copia
+            if dry_run:
+                print(f"  [dry-run] s-ar copia: {filename} -> {target_path}")
+                copied_files += 1
+                continue
+
             # Copiază fișierul la destinație (păstrează originalul)
             shutil.copy2(source_path, target_path)
             print(f"Fișier copiat cu succes: {filename}")
+            manifest.record(filename, [source_path], outputs=[target_path])
             copied_files += 1
 
         except Exception as e:
             print(f"Eroare la copierea fișierului {filename}: {str(e)}")
             error_files += 1
 
+    manifest.save()
+
     print(f"\nRezultat copiere din output în Principal/en:")
     print(f"- Total fișiere procesate: {total_files}")
     print(f"- Fișiere copiate cu succes: {copied_files}")
+    print(f"- Fișiere neschimbate (incremental): {manifest.skipped}")
     print(f"- Fișiere cu erori: {error_files}")
 
     return True
@@ -191,23 +235,28 @@ def copy_fisiere_gata():
         print(f"Directorul sursă nu există: {source_dir}")
         return False
 
+    dry_run = dry_run_requested()
     if not os.path.exists(target_dir):
         print(f"Directorul țintă nu există: {target_dir}")
-        # Încercăm să creăm directorul țintă
-        try:
-            os.makedirs(target_dir)
-            print(f"Directorul țintă a fost creat: {target_dir}")
-        except Exception as e:
-            print(f"Nu s-a putut crea directorul țintă: {str(e)}")
-            return False
+        if dry_run:
+            print(f"  [dry-run] directorul țintă ar fi creat: {target_dir}")
+        else:
+            # Încercăm să creăm directorul țintă
+            try:
+                os.makedirs(target_dir)
+                print(f"Directorul țintă a fost creat: {target_dir}")
+            except Exception as e:
+                print(f"Nu s-a putut crea directorul țintă: {str(e)}")
+                return False
 
     # Contoare pentru statistici
     total_files = 0
     copied_files = 0
     uploaded_files = 0
     error_files = 0
+    manifest = StageManifest('pasul7_ftp', incremental_requested(), read_only=dry_run)
 
-    for filename in os.listdir(source_dir):
+    for filename in timed_files(os.listdir(source_dir)):
         if not filename.endswith('.html'):
             continue
 
@@ -215,6 +264,18 @@ def copy_fisiere_gata():
         source_path = os.path.join(source_dir, filename)
         target_path = os.path.join(target_dir, filename)
 
+        # În modul --incremental nu mai încărcăm pe FTP fișierele neschimbate
+        if manifest.is_current(filename, [source_path]):
+            continue
+
+        # La --dry-run doar afișăm ce s-ar încărca și copia
+        if dry_run:
+            print(f"  [dry-run] s-ar încărca pe FTP: {filename} -> {FTP_REMOTE_DIR}{filename}")
+            print(f"  [dry-run] s-ar copia: {filename} -> {target_path}")
+            uploaded_files += 1
+            copied_files += 1
+            continue
+
         try:
             # Primul pas: Încărcare pe FTP
             ftp_success = upload_to_ftp(source_path, filename)
@@ -231,19 +292,26 @@ def copy_fisiere_gata():
             print(f"Fișier copiat cu succes în directorul local: {filename}")
             copied_files += 1
 
+            # Doar încărcările reușite sunt memorate, cele eșuate se reîncearcă la rularea următoare
+            if ftp_success:
+                manifest.record(filename, [source_path], outputs=[target_path])
+
         except Exception as e:
             print(f"Eroare la procesarea fișierului {filename}: {str(e)}")
             error_files += 1
 
+    manifest.save()
+
     print(f"\nRezultat procesare din fisiere_gata:")
     print(f"- Total fișiere procesate: {total_files}")
     print(f"- Fișiere încărcate pe FTP: {uploaded_files}")
     print(f"- Fișiere copiate în director local: {copied_files}")
+    print(f"- Fișiere neschimbate (incremental): {manifest.skipped}")
     print(f"- Fișiere cu erori: {error_files}")
 
     return True
 
-if __name__ == "__main__":
+def main():
     # Prima etapă - procesarea fișierelor conform codului original
     process_files()
 
@@ -254,3 +322,7 @@ if __name__ == "__main__":
     copy_fisiere_gata()
 
     print("\nToate operațiunile au fost finalizate!")
+
+if __name__ == "__main__":
+    report_at_exit()
+    main()
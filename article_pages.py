@@ -0,0 +1,381 @@
+"""Construirea paginilor HTML din Pasul 2, din articolele citite din documentul tradus.
+
+O pagină se obține din template-ul index.html (fill_html_template), apoi trece prin
+post-procesare, meta description și înlocuirile finale (apply_page_transforms). Funcțiile primesc
+și întorc doar text, așa că paginile se pot construi și scrie în paralel (write_pages).
+"""
+import re
+import time
+import unidecode
+from datetime import datetime
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from html_markers import scan_markers
+from text_io import translate_newlines, write_if_changed
+from page_template import SlotTemplate, SLOT_PATTERN
+
+def today():
+    """Data din rândul „On ..., in” al paginilor."""
+    return datetime.now().strftime("%B %d, %Y")
+
+def remove_diacritics(text):
+    return unidecode.unidecode(text)
+
+def generate_filename(title):
+    normalized_title = remove_diacritics(title.lower())
+    normalized_title = re.sub(r'[^a-z0-9\-]+', '-', normalized_title)
+    normalized_title = re.sub(r'-+', '-', normalized_title).strip('-')
+    return f"{normalized_title}.html"
+
+def format_body(body):
+    formatted_body = ""
+    for paragraph in body:
+        paragraph = paragraph.strip()
+
+        # Detectăm dacă paragraful începe cu numerotare (ex. "1. ", "2. " etc.)
+        numbered_paragraph = re.match(r'^(\d+\.\s+)(.*)', paragraph)
+        if numbered_paragraph:
+            # Extragem numărul și restul paragrafului
+            num = numbered_paragraph.group(1)
+            rest_of_paragraph = numbered_paragraph.group(2)
+
+            # Aplicăm stilizare: numărul va fi bold și restul textului va rămâne normal
+            formatted_body += f'<p class="text_obisnuit"><span class="text_obisnuit2"><strong>{num}</strong></span>{rest_of_paragraph}</p>\n'
+        else:
+            # Dacă nu există numerotare, procesăm paragraful normal
+            formatted_body += f'<p class="text_obisnuit">{paragraph}</p>\n'
+
+    return formatted_body
+
+def capitalize_title(title):
+    # Split the title into words and capitalize each word
+    words = title.split()
+    capitalized_words = [word.capitalize() for word in words]
+    return ' '.join(capitalized_words)
+
+def update_html_content(html_content, title, first_sentence, body, filename, article_id, current_date=None):
+    # Adăugăm ID-ul articolului la începutul fișierului
+    if article_id:
+        id_comment = f'<!-- $item_id = {article_id}; // ID-ul din fisierul limba romana -->\n'
+        # Verificăm dacă există deja un comentariu de ID
+        id_span = scan_markers(html_content).item_id_span
+        if not id_span:
+            # Adăugăm comentariul la începutul fișierului
+            html_content = id_comment + html_content
+        else:
+            # Înlocuim comentariul existent (împreună cu newline-ul de după el)
+            id_end = id_span[1] + 1 if html_content[id_span[1]:id_span[1] + 1] == '\n' else id_span[1]
+            html_content = html_content[:id_span[0]] + id_comment + html_content[id_end:]
+
+    title_without_diacritics = remove_diacritics(title)
+    capitalized_title = capitalize_title(title_without_diacritics)
+
+    html_content = re.sub(r'<title>.*?</title>', f'<title>{title_without_diacritics} | Neculai Fantanaru (en)</title>', html_content)
+    html_content = re.sub(r'<h1 class="den_articol" itemprop="name">.*?</h1>', f'<h1 class="den_articol" itemprop="name">{title}</h1>', html_content)
+
+    html_content = html_content.replace('zzz.html', filename)
+
+    # Extragem textul bold doar din acest articol
+    bold_text = extract_bold_from_body(body)
+
+    meta_desc = f'<meta name="description" content="{bold_text}">'
+    html_content = re.sub(r'<meta name="description" content=".*?">', meta_desc, html_content)
+
+    formatted_body = format_body(body)
+    sasa_span = scan_markers(html_content).section('sasa', outer=True)
+    if sasa_span:
+        html_content = html_content[:sasa_span[0]] + f'<!-- SASA-1 -->\n{formatted_body}\n<!-- SASA-2 -->' + html_content[sasa_span[1]:]
+
+    current_date = current_date or today()
+    html_content = re.sub(r'On .*?, in', f'On {current_date}, in', html_content)
+
+    html_content = re.sub(r'<title>.*?</title>', f'<title>{capitalized_title} | Neculai Fantanaru (en)</title>', html_content)
+    html_content = re.sub(r'<h1 class="den_articol" itemprop="name">.*?</h1>', f'<h1 class="den_articol" itemprop="name">{capitalize_title(title)}</h1>', html_content)
+
+    return html_content
+
+# Valori care nu pot intra direct într-un slot: ar putea schimba potrivirile din update_html_content
+# (tag-uri, rânduri noi, escape-uri în șirul de înlocuire, începutul unui „On ..., in”, zzz.html).
+# „On” contează doar urmat de spațiu sau la capătul valorii, unde spațiul vine din template
+UNSAFE_SLOT_VALUE = re.compile(r'[\n\r\\<>]|On(?= |$)|zzz')
+DATE_LINE_PATTERN = r'On .*?, in'
+TITLE_PATTERN = r'<title>.*?</title>'
+H1_PATTERN = r'<h1 class="den_articol" itemprop="name">.*?</h1>'
+
+def compile_html_template(html_content, with_id):
+    """Template-ul cu aceleași înlocuiri ca update_html_content, dar cu sloturi în locul valorilor.
+
+    Întoarce None dacă un slot nu poate fi completat direct (o potrivire care ar trece peste
+    el sau care ar începe lângă el); atunci rămâne update_html_content.
+    """
+    slot = SlotTemplate.slot
+
+    def insert_item_id(content):
+        id_span = scan_markers(content).item_id_span
+        if not id_span:
+            return slot('item_id') + content
+        id_end = id_span[1] + 1 if content[id_span[1]:id_span[1] + 1] == '\n' else id_span[1]
+        return content[:id_span[0]] + slot('item_id') + content[id_end:]
+
+    def insert_body(content):
+        sasa_span = scan_markers(content).section('sasa', outer=True)
+        if not sasa_span:
+            return content
+        return content[:sasa_span[0]] + f'<!-- SASA-1 -->\n{slot("body")}\n<!-- SASA-2 -->' + content[sasa_span[1]:]
+
+    title = f'<title>{slot("title")} | Neculai Fantanaru (en)</title>'
+    h1 = f'<h1 class="den_articol" itemprop="name">{slot("h1")}</h1>'
+    steps = ([insert_item_id] if with_id else []) + [
+        lambda content: re.sub(TITLE_PATTERN, title, content),
+        lambda content: re.sub(H1_PATTERN, h1, content),
+        lambda content: content.replace('zzz.html', slot('filename')),
+        lambda content: re.sub(r'<meta name="description" content=".*?">',
+                               f'<meta name="description" content="{slot("description")}">', content),
+        insert_body,
+        lambda content: re.sub(DATE_LINE_PATTERN, f'On {slot("date")}, in', content),
+        lambda content: re.sub(TITLE_PATTERN, title, content),
+        lambda content: re.sub(H1_PATTERN, h1, content)
+    ]
+
+    seen = Counter()
+    for step in steps:
+        html_content = step(html_content)
+        present = Counter(SLOT_PATTERN.findall(html_content))
+        # Un slot înghițit de o înlocuire de mai târziu nu mai poate fi completat direct
+        if any(present[name] < count for name, count in seen.items()):
+            return None
+        seen |= present
+
+    template = SlotTemplate(html_content)
+    for position, (name, before, after) in enumerate(template.neighbours()):
+        if name in ('body', 'date'):
+            # Corpul stă pe rândurile lui (vezi fill_html_template); data e pusă după înlocuiri
+            continue
+        line_before = before[before.rfind('\n') + 1:]
+        if ('\n' not in before and position > 0) or 'On' in line_before or line_before.endswith('O') \
+                or after.startswith('n'):
+            return None
+    return template
+
+# Template-urile compilate, după conținut și după prezența ID-ului
+COMPILED_TEMPLATES = {}
+
+def fill_html_template(html_content, title, body, filename, article_id, current_date=None):
+    """Același rezultat ca update_html_content, dintr-un template compilat o singură dată."""
+    key = (html_content, bool(article_id))
+    if key not in COMPILED_TEMPLATES:
+        COMPILED_TEMPLATES[key] = compile_html_template(html_content, bool(article_id))
+    template = COMPILED_TEMPLATES[key]
+
+    capitalized_title = capitalize_title(remove_diacritics(title))
+    h1_title = capitalize_title(title)
+    bold_text = extract_bold_from_body(body)
+    # Se verifică valorile exact cum intră în sloturi (capitalize_title poate face „on” → „On”)
+    values = [capitalized_title, h1_title, bold_text, filename] + ([article_id] if article_id else [])
+    if template is None or any(UNSAFE_SLOT_VALUE.search(value) for value in values):
+        return update_html_content(html_content, title, body[0], body, filename, article_id, current_date)
+
+    current_date = current_date or today()
+    # Înlocuirile de după inserarea corpului se aplică și rândurilor lui
+    formatted_body = format_body(body)
+    if 'On ' in formatted_body:
+        formatted_body = re.sub(DATE_LINE_PATTERN, f'On {current_date}, in', formatted_body)
+    if '<title>' in formatted_body:
+        formatted_body = re.sub(TITLE_PATTERN, f'<title>{capitalized_title} | Neculai Fantanaru (en)</title>', formatted_body)
+    if '<h1 class="den_articol" itemprop="name">' in formatted_body:
+        formatted_body = re.sub(H1_PATTERN, f'<h1 class="den_articol" itemprop="name">{h1_title}</h1>', formatted_body)
+
+    return template.render({
+        'item_id': f'<!-- $item_id = {article_id}; // ID-ul din fisierul limba romana -->\n',
+        'title': capitalized_title,
+        'h1': h1_title,
+        'filename': filename,
+        'description': bold_text,
+        'body': formatted_body,
+        'date': current_date
+    })
+
+def extract_bold_from_body(body_paragraphs):
+    """Extrage textul bold din paragrafele corpului articolului curent."""
+    bold_text_parts = []
+
+    for paragraph in body_paragraphs:
+        # Caută toate secțiunile bold din text
+        bold_matches = re.findall(r'<strong>(.*?)</strong>', paragraph)
+        bold_text_parts.extend(bold_matches)
+
+    # Concatenăm toate părțile bold găsite
+    bold_text = ' '.join(bold_text_parts).strip()
+
+    # Curățăm textul de tag-uri HTML care ar putea fi rămase
+    bold_text = re.sub(r'<[^>]*>', '', bold_text)
+
+    # Curățăm textul - eliminare ghilimele și alte caractere problematice
+    bold_text = re.sub(r'["*<>]', '', bold_text)
+
+    # Eliminăm spațiile multiple
+    bold_text = re.sub(r'\s+', ' ', bold_text)
+
+    return bold_text
+
+def post_process_html(html_content):
+    # Înlocuire string "NBSP" cu spațiu
+    html_content = html_content.replace("NBSP", " ")
+
+    # Înlocuire caracter non-breaking space (U+00A0) cu spațiu normal
+    html_content = html_content.replace("\u00A0", " ")
+
+    # Înlocuire entitate HTML &nbsp; cu spațiu normal
+    html_content = html_content.replace("&nbsp;", " ")
+
+    return html_content
+
+def extract_text_obisnuit2(html_content):
+    pattern = r'<p class="text_obisnuit2">(.*?)</p>'
+    matches = re.findall(pattern, html_content, re.DOTALL)
+    cleaned_text = ' '.join(matches).replace('"', '')
+    sentences = re.split(r'(?<=[.!?])\s+', cleaned_text)
+
+    # Limităm la primele 8 propoziții și eliminăm orice text care nu ar trebui să fie în meta description
+    description = ' '.join(sentences[:8]).strip()
+
+    # Eliminăm textul nedorit
+    if "Latest articles accessed by readers" in description:
+        description = description.split("Latest articles accessed by readers")[0].strip()
+
+    return description
+
+def clean_meta_description(description):
+    # Remove quotation marks, asterisks, and colons
+    cleaned = re.sub(r'["*]', '', description)
+
+    # Remove HTML tags, including partial tags like <e
+    cleaned = re.sub(r'<[^>]*>', '', cleaned)
+
+    # Remove any remaining <e characters
+    cleaned = re.sub(r'<e ', ' ', cleaned)
+
+    # Remove any remaining < or > characters
+    cleaned = re.sub(r'[<>]', '', cleaned)
+
+    # Replace multiple spaces with a single space
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+
+    # Trim leading and trailing whitespace
+    cleaned = cleaned.strip()
+
+    return cleaned
+
+# Pașii de mai jos primesc și întorc conținutul paginii: sunt aplicați în memorie, unul după altul
+def update_meta_description(content):
+    text_obisnuit2 = extract_text_obisnuit2(content)
+
+    if text_obisnuit2:
+        cleaned_description = clean_meta_description(text_obisnuit2)
+
+        content = re.sub(
+            r'<meta name="description" content=".*?">',
+            f'<meta name="description" content="{cleaned_description}">',
+            content
+        )
+
+    return content
+
+# Paragrafele goale, eliminate doar din secțiunea ARTICOL
+EMPTY_PARAGRAPH_PATTERN = re.compile(r'<p class="text_obisnuit"></p>\s*')
+
+def remove_empty_paragraphs(content):
+    # Găsim secțiunea dintre ARTICOL START și ARTICOL FINAL
+    article_span = scan_markers(content).section('articol', outer=True)
+
+    if article_span:
+        article_content = content[article_span[0]:article_span[1]]
+        # Eliminăm paragrafele goale
+        updated_article_content = EMPTY_PARAGRAPH_PATTERN.sub('', article_content)
+        # Înlocuim secțiunea originală cu cea actualizată
+        content = content[:article_span[0]] + updated_article_content + content[article_span[1]:]
+
+    return content
+
+# Înlocuirile finale (pattern, înlocuire), aplicate în ordine pe toată pagina; compilate o singură dată
+FINAL_REPLACEMENTS = [
+    # Paragrafele care încep cu un număr urmat de punct
+    (re.compile(r'<strong>(\d+\.\s+)</strong>(.*?)</p>'),
+     r'<p class="text_obisnuit"><span class="text_obisnuit2">\1</span>\2</p>'),
+    # <p class="text_obisnuit"><strong><em>...</em></strong></p> devine <p class="text_obisnuit2"><em>...</em></p>
+    (re.compile(r'<p class="text_obisnuit"><strong><em>(.*?)</em></strong></p>'),
+     r'<p class="text_obisnuit2"><em>\1</em></p>'),
+    # <p class="text_obisnuit"><strong>...</strong></p> devine <p class="text_obisnuit2">...</p>
+    (re.compile(r'<p class="text_obisnuit"><strong>(.*?)</strong></p>'),
+     r'<p class="text_obisnuit2">\1</p>'),
+    # Paragrafele cu text după </strong>: <p class="text_obisnuit"><span class="text_obisnuit2">...</span> textul rămas</p>
+    (re.compile(r'<p class="text_obisnuit"><strong>(.*?)</strong>(.*?)</p>'),
+     r'<p class="text_obisnuit"><span class="text_obisnuit2">\1</span>\2</p>'),
+    # <br><br> înainte de paragrafele care conțin "* Note:" în structura nouă
+    (re.compile(r'(<p class="text_obisnuit"><span class="text_obisnuit2">\* Note:)'),
+     r'<br><br>\n\1'),
+    # Alte înlocuiri specifice pentru curățarea tagurilor nedorite
+    (re.compile(r'<e</p>'), '</p>'),
+    (re.compile(r'</span></p>'), '</p>'),
+    (re.compile(r'<em></em>'), ''),
+    (re.compile(r'</strong>\s*<strong>'), ''),
+    (re.compile(r'<strong>'), ''),
+    (re.compile(r'</strong>'), '')
+]
+
+def final_regex_replacements(content):
+    for pattern, replacement in FINAL_REPLACEMENTS:
+        content = pattern.sub(replacement, content)
+    return content
+
+# Transformările aplicate, în ordine, paginii generate de update_html_content.
+# translate_newlines face ce făcea recitirea fișierului după prima scriere (\r\n -> \n)
+PAGE_TRANSFORMS = [
+    post_process_html,
+    translate_newlines,
+    update_meta_description,
+    remove_empty_paragraphs,
+    final_regex_replacements
+]
+
+def apply_page_transforms(content):
+    """PAGE_TRANSFORMS aplicate pe rând, fiecare pe toată pagina."""
+    for transform in PAGE_TRANSFORMS:
+        content = transform(content)
+    return content
+
+def render_article(html_content, title, body, filename, article_id, current_date=None):
+    """Pagina finală a unui articol, construită în memorie (o singură scriere, la final)."""
+    updated_html = fill_html_template(html_content, title, body, filename, article_id, current_date)
+    return apply_page_transforms(updated_html)
+
+# Sub acest număr de pagini pornirea proceselor costă mai mult decât câștigă
+PARALLEL_MIN_PAGES = 16
+
+# Template-ul, data și modul --dry-run, trimise o singură dată fiecărui proces din pool
+worker_settings = {}
+
+def init_worker(html_content, current_date, dry_run):
+    worker_settings.update(html_content=html_content, current_date=current_date, dry_run=dry_run)
+
+def write_page(job):
+    """Construiește și scrie pagina unui articol; întoarce rezultatul scrierii și durata."""
+    title, body, filename, article_id, output_path = job
+    start = time.perf_counter()
+    page = render_article(worker_settings['html_content'], title, body, filename, article_id,
+                          worker_settings['current_date'])
+    result = write_if_changed(output_path, page, 'utf-8', worker_settings['dry_run'])
+    return (output_path,) + result + (time.perf_counter() - start,)
+
+def write_pages(jobs, html_content, current_date, dry_run, workers):
+    """Scrie paginile în paralel; rezultatele (cale, schimbat, octeți citiți, octeți scriși, durată)
+    sosesc în ordinea din `jobs`. Două joburi nu au voie să aibă aceeași cale."""
+    if workers <= 1 or len(jobs) < PARALLEL_MIN_PAGES:
+        init_worker(html_content, current_date, dry_run)
+        for job in jobs:
+            yield write_page(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(html_content, current_date, dry_run)) as executor:
+        yield from executor.map(write_page, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
@@ -0,0 +1,130 @@
+"""Extragerea articolelor din paginile HTML pentru Pasul 1, ca date simple.
+
+Un articol devine un dict cu titlul, ID-ul și paragrafele, fiecare paragraf fiind o listă
+de run-uri (text, bold, italic). Datele se pot trimite între procese, așa că parsarea
+rulează în paralel (extract_articles), iar documentul Word e scris doar în procesul principal.
+"""
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
+from html_markers import scan_markers
+from text_io import read_text
+from run_report import run_report
+from command_line import options
+
+# lxml parsează mult mai repede decât html.parser; fără lxml instalat se folosește html.parser
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Titlul articolului: doar fragmentul <h1 class="den_articol"> e parsat, nu toată pagina
+TITLE_PATTERN = re.compile(r'<h1\b[^>]*\bclass="[^"]*\bden_articol\b[^"]*"[^>]*>.*?</h1>', re.DOTALL)
+TITLE_STRAINER = SoupStrainer('h1', class_='den_articol')
+PARAGRAPH_STRAINER = SoupStrainer('p')
+
+# Sub acest număr de articole pornirea proceselor costă mai mult decât câștigă
+PARALLEL_MIN_ARTICLES = 8
+
+def full_parse_requested(argv=None):
+    """True dacă scriptul a fost pornit cu --full-parse (toată pagina cu html.parser, ca înainte)."""
+    return options(argv).full_parse
+
+def find_title(content, full_parse=False):
+    """Tag-ul h1.den_articol al paginii (sau None)."""
+    if full_parse:
+        return BeautifulSoup(content, 'html.parser').find('h1', class_='den_articol')
+
+    match = TITLE_PATTERN.search(content)
+    if match:
+        return BeautifulSoup(match.group(0), HTML_PARSER).find('h1', class_='den_articol')
+    # Atribute scrise altfel decât în template: se parsează toată pagina, dar se păstrează doar titlul
+    return BeautifulSoup(content, HTML_PARSER, parse_only=TITLE_STRAINER).find('h1', class_='den_articol')
+
+def find_paragraphs(article_content, full_parse=False):
+    """Paragrafele <p> din secțiunea ARTICOL."""
+    if full_parse:
+        return BeautifulSoup(article_content, 'html.parser').find_all('p')
+    return BeautifulSoup(article_content, HTML_PARSER, parse_only=PARAGRAPH_STRAINER).find_all('p')
+
+def paragraph_runs(p_tag):
+    """Run-urile unui paragraf: (text, bold, italic), cu italic None unde nu e setat."""
+    # Determină dacă întregul paragraf trebuie să fie bold bazat pe clasa sa
+    is_text_obisnuit2 = 'text_obisnuit2' in p_tag.get('class', [])
+
+    runs = []
+    for element in p_tag.children:
+        if isinstance(element, str):
+            # Text simplu
+            runs.append((str(element), is_text_obisnuit2, None))
+        elif element.name == 'em':
+            # Text italic
+            runs.append((element.get_text(), is_text_obisnuit2, True))
+        elif element.name == 'span' and 'text_obisnuit2' in element.get('class', []):
+            # Text în span cu clasa text_obisnuit2 - trebuie să fie bold
+            runs.append((element.get_text(), True, None))
+        else:
+            # Alte elemente - procesare normală
+            runs.append((element.get_text() if element.name else str(element), is_text_obisnuit2, None))
+    return runs
+
+def extract_article(file_path, full_parse=False):
+    """Datele unui articol pentru documentul Word (rulează și în procesele din pool).
+
+    Paragrafele sunt None dacă lipsesc markerii ARTICOL; un paragraf care nu a putut fi
+    procesat apare ca None în listă. O eroare de citire apare în cheia 'eroare_citire'.
+    """
+    start = time.perf_counter()
+    article = {'path': file_path, 'filename': os.path.basename(file_path), 'bytes': 0}
+    try:
+        content = read_text(file_path)
+        article['bytes'] = os.path.getsize(file_path)
+    except OSError as e:
+        article['eroare_citire'] = str(e)
+        return article
+
+    markers = scan_markers(content)
+    article['item_id'] = markers.item_id or "N/A"
+
+    with run_report.measure('parse'):
+        title = find_title(content, full_parse)
+    article['title'] = title.text if title else None
+
+    article['paragraphs'] = None
+    article_span = markers.section('articol')
+    if article_span:
+        article['paragraphs'] = []
+        with run_report.measure('parse'):
+            paragraphs = find_paragraphs(content[article_span[0]:article_span[1]], full_parse)
+        for p in paragraphs:
+            try:
+                article['paragraphs'].append(paragraph_runs(p))
+            except Exception as e:
+                article['paragraphs'].append(None)
+                article.setdefault('erori_paragrafe', []).append(str(e))
+
+    article['seconds'] = time.perf_counter() - start
+    return article
+
+def extract_article_safe(file_path, full_parse=False):
+    """Ca extract_article, dar întoarce orice eroare în loc s-o arunce."""
+    try:
+        return extract_article(file_path, full_parse)
+    except Exception as e:
+        return {'path': file_path, 'filename': os.path.basename(file_path), 'bytes': 0, 'eroare': str(e)}
+
+def extract_articles(paths, workers=1, full_parse=False):
+    """Extrage articolele în paralel; le întoarce pe rând, în ordinea din `paths`."""
+    if workers <= 1 or len(paths) < PARALLEL_MIN_ARTICLES:
+        for path in paths:
+            yield extract_article_safe(path, full_parse)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for article in executor.map(extract_article_safe, paths, [full_parse] * len(paths)):
+            # Citirile din procesele pool-ului nu ajung în raportul rulării
+            run_report.count_read(article['path'], article['bytes'])
+            yield article
@@ -0,0 +1,130 @@
+"""Compară cele două citiri ale documentului tradus din Pasul 2: python-docx (--python-docx)
+și citirea în flux a word/document.xml (docx_readers.stream_paragraphs).
+
+Se măsoară timpul și memoria maximă (tracemalloc) pentru extract_data_from_docx pe un
+document cu N articole, în toate formele de paragraf din check_pasul2_golden. Articolele
+(titlu, corp, ID) trebuie să fie identice; la fel paragrafele unui document mic cu cazuri
+limită (rânduri noi, tab-uri, sfârșit de pagină, link-uri, tabele, bold dezactivat, alinieri).
+
+Rulare: python benchmarks/bench_docx_reader.py [număr_articole]   (implicit 1000)
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import tracemalloc
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_BREAK
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+import text_io
+import pipeline
+import docx_readers
+from check_pasul2_golden import write_test_docx
+
+def write_edge_docx(path):
+    """Un document mic cu tot ce tratează diferit python-docx și o citire naivă a XML-ului."""
+    document = Document()
+    title = document.add_paragraph("Titlu\tcu tab")
+    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    document.add_paragraph("ID: 7").alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+    paragraph = document.add_paragraph()
+    run = paragraph.add_run("Rând unu")
+    run.add_break()
+    run.add_text("rând doi")
+    run.add_break(WD_BREAK.PAGE)
+    paragraph.add_run(" bold oprit").bold = False
+    paragraph.add_run(" italic").italic = True
+    both = paragraph.add_run(" ambele")
+    both.bold = True
+    both.italic = True
+
+    linked = document.add_paragraph("Vezi ")
+    linked._p.append(parse_xml(
+        f'<w:hyperlink {nsdecls("w", "r")} r:id="rId99"><w:r><w:t>link-ul</w:t></w:r>'
+        f'<w:r><w:t xml:space="preserve"> de aici</w:t></w:r></w:hyperlink>'))
+    linked.add_run(" și restul")
+
+    document.add_paragraph("Aliniat la dreapta").alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
+    document.add_paragraph("Justified").alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+    document.add_table(rows=1, cols=2).cell(0, 0).text = "Text din tabel"
+    document.add_paragraph("   ")
+    document.add_paragraph("")
+    hyphen = document.add_paragraph()
+    hyphen.add_run()._r.append(parse_xml(f'<w:noBreakHyphen {nsdecls("w")}/>'))
+    hyphen.add_run("după cratimă")
+
+    second = document.add_paragraph("Al doilea titlu")
+    second.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    document.add_paragraph("Fără linie de ID")
+    document.save(path)
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def extract(pasul2, path, python_docx):
+    """extract_data_from_docx cu citirea cerută (--python-docx în linia de comandă sau nu)."""
+    if python_docx:
+        sys.argv.append('--python-docx')
+    try:
+        return pasul2.extract_data_from_docx(path)
+    finally:
+        if python_docx:
+            sys.argv.remove('--python-docx')
+
+def main():
+    parser = argparse.ArgumentParser(description="Citirea documentului tradus din Pasul 2")
+    parser.add_argument('count', nargs='?', type=int, default=1000, help="numărul de articole din document")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    count = parser.parse_known_args()[0].count
+
+    work_dir = tempfile.mkdtemp(prefix='bench_docx_reader_')
+    text_io.encoding_cache.db_path = os.path.join(work_dir, 'corpus_index.sqlite')
+    try:
+        pasul2 = pipeline.load_stage_module('pasul2')
+
+        edge_path = os.path.join(work_dir, 'edge.docx')
+        write_edge_docx(edge_path)
+        expected = list(docx_readers.python_docx_paragraphs(edge_path))
+        streamed = list(docx_readers.stream_paragraphs(edge_path))
+        if streamed != expected:
+            print("EROARE: paragrafele documentului cu cazuri limită diferă")
+            for old, new in zip(expected, streamed):
+                if old != new:
+                    print(f"  python-docx: {old}\n  în flux:     {new}")
+            sys.exit(1)
+        print(f"Cazuri limită: {len(streamed)} paragrafe identice")
+
+        path = os.path.join(work_dir, 'bebe.docx')
+        write_test_docx(path, count)
+        print(f"Document: {count} articole, {os.path.getsize(path) / 1024:.0f} KB")
+
+        old, old_time, old_peak = measure(extract, pasul2, path, True)
+        new, new_time, new_peak = measure(extract, pasul2, path, False)
+        if new != old:
+            print("EROARE: articolele citite diferă")
+            sys.exit(1)
+        print(f"  {'citire':<12} {'timp (s)':>9} {'memorie max (MB)':>17}")
+        print(f"  {'python-docx':<12} {old_time:9.2f} {old_peak / 1e6:17.1f}")
+        print(f"  {'în flux':<12} {new_time:9.2f} {new_peak / 1e6:17.1f}")
+        print(f"  {len(new)} articole identice; {old_time / new_time:.1f}x mai rapid, "
+              f"{old_peak / new_peak:.1f}x mai puțină memorie")
+    finally:
+        text_io.encoding_cache.pending.clear()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
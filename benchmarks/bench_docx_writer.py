@@ -0,0 +1,82 @@
+"""Compară scrierea documentului din Pasul 1 cu python-docx (DocumentWriter) și direct
+în arhivă (StreamingDocxWriter, --stream-docx): durata și memoria maximă pentru loturi
+de mărimi diferite. Pentru fiecare lot, Pasul 2 (extract_data_from_docx) trebuie să
+citească la fel cele două documente.
+
+Rulare: python benchmarks/bench_docx_writer.py [număr_articole ...]   (implicit 100 500 1000)
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import contextlib
+import tracemalloc
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import text_io
+import pipeline
+import article_runs
+from docx_writers import DocumentWriter, StreamingDocxWriter
+from generate_corpus import generate_corpus
+
+def write_batch(pasul1, writer_class, articles, output_file):
+    """(secunde, MB memorie maximă) pentru scrierea lotului cu writer-ul dat."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        writer = writer_class(output_file)
+        for article in articles:
+            pasul1.write_article(writer, article)
+        writer.close()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrierea documentului din Pasul 1: python-docx și direct în arhivă")
+    parser.add_argument('sizes', nargs='*', type=int, default=[100, 500, 1000],
+                        help="numărul de articole al fiecărui lot")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    sizes = parser.parse_known_args()[0].sizes
+    corpus = tempfile.mkdtemp(prefix='bench_docx_writer_')
+    text_io.encoding_cache.db_path = os.path.join(corpus, 'corpus_index.sqlite')
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            generate_corpus(corpus, 100, docx_articles=1)
+        ro_dir = os.path.join(corpus, 'ro')
+        paths = [os.path.join(ro_dir, name) for name in sorted(os.listdir(ro_dir))
+                 if name.endswith('.html') and name != 'index.html']
+        # Articolele sunt extrase o singură dată; loturile mari le repetă
+        extracted = list(article_runs.extract_articles(paths))
+        pasul1 = pipeline.load_stage_module('pasul1')
+        pasul2 = pipeline.load_stage_module('pasul2')
+
+        print(f"  {'articole':>8} {'python-docx':>20} {'stream':>20} {'accelerare':>11}")
+        for size in sizes:
+            articles = [extracted[number % len(extracted)] for number in range(size)]
+            results = {}
+            for label, writer_class in [('python-docx', DocumentWriter), ('stream', StreamingDocxWriter)]:
+                output_file = os.path.join(corpus, f'{label}-{size}.docx')
+                results[label] = write_batch(pasul1, writer_class, articles, output_file)
+
+            with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+                expected = pasul2.extract_data_from_docx(os.path.join(corpus, f'python-docx-{size}.docx'))
+                streamed = pasul2.extract_data_from_docx(os.path.join(corpus, f'stream-{size}.docx'))
+            if streamed != expected:
+                print(f"EROARE: Pasul 2 citește altfel documentul scris în flux ({size} articole)")
+                sys.exit(1)
+
+            before, after = results['python-docx'], results['stream']
+            print(f"  {size:8d} {before[0]:8.2f}s {before[1]:8.1f} MB {after[0]:8.2f}s {after[1]:8.1f} MB "
+                  f"{before[0] / after[0]:10.2f}x")
+    finally:
+        text_io.encoding_cache.pending.clear()
+        shutil.rmtree(corpus, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
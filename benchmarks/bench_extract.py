@@ -0,0 +1,96 @@
+"""Compară extragerea din Pasul 1 înainte (toată pagina cu html.parser) și acum
+(doar titlul și secțiunea ARTICOL, cu lxml), pe articole dintr-un corpus sintetic.
+
+Pentru fiecare mod se măsoară, pe articol, parsarea (titlu + paragrafe) și tot drumul
+unui articol în document (extract_article_safe + write_article din Pasul 1); documentele
+Word rezultate trebuie să fie identice. La final,
+extragerea tuturor articolelor (article_runs.extract_articles) cu 1 și cu N procese.
+
+Rulare: python benchmarks/bench_extract.py [număr_articole]   (implicit 200)
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import contextlib
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import text_io
+import pipeline
+import article_runs
+from docx_writers import DocumentWriter
+from generate_corpus import generate_corpus
+from html_markers import scan_markers
+
+def parse_article(content, full_parse):
+    markers = scan_markers(content)
+    title = article_runs.find_title(content, full_parse)
+    span = markers.section('articol')
+    paragraphs = article_runs.find_paragraphs(content[span[0]:span[1]], full_parse) if span else []
+    return title, paragraphs
+
+def run_mode(pasul1, paths, contents, full_parse):
+    """(secunde de parsare pe articol, secunde extragere + scriere pe articol, XML-ul documentului)."""
+    start = time.perf_counter()
+    for content in contents:
+        parse_article(content, full_parse)
+    parse_time = (time.perf_counter() - start) / len(contents)
+
+    writer = DocumentWriter(None)
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for path in paths:
+            pasul1.write_article(writer, article_runs.extract_article_safe(path, full_parse))
+        file_time = (time.perf_counter() - start) / len(paths)
+    return parse_time, file_time, writer.document.element.xml
+
+def main():
+    parser = argparse.ArgumentParser(description="Extragerea articolelor din Pasul 1")
+    parser.add_argument('count', nargs='?', type=int, default=200, help="numărul de articole")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    count = parser.parse_known_args()[0].count
+    corpus = tempfile.mkdtemp(prefix='bench_extract_')
+    text_io.encoding_cache.db_path = os.path.join(corpus, 'corpus_index.sqlite')
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            generate_corpus(corpus, count, docx_articles=1)
+        ro_dir = os.path.join(corpus, 'ro')
+        paths = [os.path.join(ro_dir, name) for name in sorted(os.listdir(ro_dir))
+                 if name.endswith('.html') and name != 'index.html']
+        contents = [text_io.read_text(path) for path in paths]
+        pasul1 = pipeline.load_stage_module('pasul1')
+
+        before = run_mode(pasul1, paths, contents, full_parse=True)
+        after = run_mode(pasul1, paths, contents, full_parse=False)
+        if before[2] != after[2]:
+            print("EROARE: documentele Word diferă între cele două moduri")
+            sys.exit(1)
+
+        print(f"{len(paths)} articole (parser rapid: {article_runs.HTML_PARSER})")
+        print(f"  {'':34} {'înainte':>10} {'acum':>10} {'accelerare':>11}")
+        for label, index in [('parsare / articol (ms)', 0), ('articol în document (ms)', 1)]:
+            print(f"  {label:34} {before[index] * 1000:10.2f} {after[index] * 1000:10.2f} "
+                  f"{before[index] / after[index]:10.2f}x")
+
+        reference = None
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            articles = list(article_runs.extract_articles(paths, workers))
+            elapsed = time.perf_counter() - start
+            runs = [article['paragraphs'] for article in articles]
+            if reference is None:
+                reference, baseline = runs, elapsed
+            elif runs != reference:
+                print(f"EROARE: rezultate diferite cu {workers} procese")
+                sys.exit(1)
+            print(f"  extragere cu {workers:2d} procese: {elapsed:.3f}s (x{baseline / elapsed:.2f})")
+    finally:
+        text_io.encoding_cache.pending.clear()
+        shutil.rmtree(corpus, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
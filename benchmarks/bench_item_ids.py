@@ -0,0 +1,99 @@
+"""Compară citirea ID-urilor ($item_id) din tot fișierul cu citirea doar a începutului
+(item_ids.read_id_comment), pe copii ale template-ului index.html.
+
+Fișierele abia scrise sunt în cache-ul sistemului, așa că durata arată mai ales costul
+apelurilor; pe un disc rece diferența o dă volumul citit (coloana MB citiți).
+
+Rulare: python benchmarks/bench_item_ids.py [număr_fișiere]   (implicit 20000)
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import text_io
+from html_markers import scan_markers
+from item_ids import read_id_comment
+from run_report import run_report
+from text_io import read_text
+
+def build_corpus(folder, count):
+    with open(os.path.join(ROOT_DIR, 'index.html'), 'rb') as f:
+        template = f.read()
+
+    paths = []
+    for number in range(count):
+        path = os.path.join(folder, f'articol-{number:05d}.html')
+        with open(path, 'wb') as f:
+            f.write(template.replace(b'$item_id = 5006;', f'$item_id = {number + 1};'.encode()))
+        paths.append(path)
+    return paths
+
+def regex_ids(paths):
+    """Cum citeau ID-ul scripturile: tot fișierul, apoi regex."""
+    ids = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        run_report.count_read(path, len(data))
+        match = re.search(r'<!-- \$item_id = (\d+); // .*? -->', data.decode('utf-8', errors='replace'))
+        ids.append(int(match.group(1)) if match else None)
+    return ids
+
+def full_scan_ids(paths):
+    """Tot fișierul, cu parserul de markeri."""
+    ids = []
+    for path in paths:
+        item_id = scan_markers(read_text(path)).item_id
+        ids.append(int(item_id) if item_id else None)
+    return ids
+
+def head_ids(paths):
+    """Doar începutul fișierului (read_id_comment)."""
+    return [read_id_comment(path)[0] for path in paths]
+
+def main():
+    parser = argparse.ArgumentParser(description="Citirea ID-urilor din tot fișierul și din începutul lui")
+    parser.add_argument('count', nargs='?', type=int, default=20000, help="numărul de fișiere")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    count = parser.parse_known_args()[0].count
+    folder = tempfile.mkdtemp(prefix='bench_item_ids_')
+    # Cache-ul de codificări al fișierelor temporare nu ajunge în baza de date a proiectului
+    text_io.encoding_cache.db_path = os.path.join(folder, 'corpus_index.sqlite')
+    try:
+        paths = build_corpus(folder, count)
+        total_mb = sum(os.path.getsize(path) for path in paths) / 2**20
+        print(f"{count} fișiere, {total_mb:.1f} MB")
+
+        reference = None
+        baseline = None
+        for label, function in [('tot fișierul + regex', regex_ids),
+                                ('tot fișierul + markeri', full_scan_ids),
+                                ('doar începutul', head_ids)]:
+            stats = run_report.current()
+            start_read = stats.bytes_read
+            start = time.perf_counter()
+            ids = function(paths)
+            elapsed = time.perf_counter() - start
+            read_mb = (stats.bytes_read - start_read) / 2**20
+
+            if reference is None:
+                reference, baseline = ids, elapsed
+            elif ids != reference:
+                print(f"EROARE: ID-uri diferite pentru '{label}'")
+                sys.exit(1)
+
+            print(f"  {label:24} {elapsed:7.3f}s  {count / elapsed:9.0f} fișiere/s  "
+                  f"{read_mb:8.1f} MB citiți  (x{baseline / elapsed:.2f})")
+    finally:
+        text_io.encoding_cache.pending.clear()
+        shutil.rmtree(folder)
+
+if __name__ == "__main__":
+    main()
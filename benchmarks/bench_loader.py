@@ -0,0 +1,59 @@
+"""Măsoară încărcarea paralelă a corpusului (corpus_index.load_records) pentru
+mai multe valori ale numărului de procese, pe copii ale template-ului index.html.
+
+Rulare: python benchmarks/bench_loader.py [număr_fișiere]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from corpus_index import load_records
+
+def build_corpus(folder, count):
+    with open(os.path.join(ROOT_DIR, 'index.html'), 'rb') as f:
+        template = f.read()
+
+    paths = []
+    for number in range(count):
+        path = os.path.join(folder, f'articol-{number:05d}.html')
+        with open(path, 'wb') as f:
+            f.write(template.replace(b'</body>', f'<!-- {number} --></body>'.encode()))
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Încărcarea paralelă a corpusului")
+    parser.add_argument('count', nargs='?', type=int, default=2000, help="numărul de fișiere")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    count = parser.parse_known_args()[0].count
+    folder = tempfile.mkdtemp(prefix='bench_loader_')
+    try:
+        paths = build_corpus(folder, count)
+        print(f"{count} fișiere, {os.cpu_count()} procesoare")
+
+        reference = None
+        baseline = None
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            records = load_records(paths, workers)
+            elapsed = time.perf_counter() - start
+
+            # Rezultatele trebuie să fie identice și în aceeași ordine, indiferent de procese
+            if reference is None:
+                reference, baseline = records, elapsed
+            elif records != reference:
+                print(f"EROARE: rezultate diferite cu {workers} procese")
+                sys.exit(1)
+
+            print(f"  {workers:2d} procese: {elapsed:.3f}s (x{baseline / elapsed:.2f})")
+    finally:
+        shutil.rmtree(folder)
+
+if __name__ == "__main__":
+    main()
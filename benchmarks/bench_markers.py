@@ -0,0 +1,89 @@
+"""Compară parserul de markeri într-o singură trecere cu regex-urile vechi,
+pe template-urile index.html și index-ro.html.
+
+Rulare: python benchmarks/bench_markers.py [număr_repetări]
+"""
+import os
+import re
+import sys
+import timeit
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from html_markers import scan_markers, section_text, text_dreapta_span
+
+TEMPLATES = ['index.html', 'index-ro.html']
+
+def regex_scan(content):
+    """Căutările de markeri exact cum erau făcute în scripturi (câte un regex pe rând)."""
+    result = {}
+
+    # extract_item_id (Pasul 3 / Pasul 4)
+    result['item_id'] = None
+    for pattern in [r'<!-- \$item_id = (\d+); // .*? -->', r'<!-- item_id = (\d+); -->', r'<!-- id: (\d+) -->']:
+        match = re.search(pattern, content)
+        if match:
+            result['item_id'] = match.group(1)
+            break
+
+    # extract_flags_section
+    match = re.search(r'<!-- FLAGS_1 -->(.*?)<!-- FLAGS -->', content, re.DOTALL)
+    result['flags'] = match.group(1) if match else None
+
+    # extract_category_info
+    match = re.search(r'<td class="text_dreapta">(.*?)</td>', content, re.DOTALL)
+    result['text_dreapta'] = match.group(1) if match else None
+
+    # Pasul 2 (SASA) și remove_empty_paragraphs (ARTICOL)
+    match = re.search(r'<!-- SASA-1 -->.*?<!-- SASA-2 -->', content, re.DOTALL)
+    result['sasa'] = match.group(0) if match else None
+    match = re.search(r'(<!-- ARTICOL START -->.*?<!-- ARTICOL FINAL -->)', content, re.DOTALL)
+    result['articol'] = match.group(1) if match else None
+
+    # Pasul 5 (categorii)
+    match = re.search(r'<!-- ARTICOL CATEGORIE START -->.*?<!-- ARTICOL CATEGORIE FINAL -->', content, re.DOTALL)
+    result['categorie'] = match.group(0) if match else None
+
+    match = re.search(r'<link rel="canonical" href="([^"]*)"', content)
+    result['canonical'] = match.group(1) if match else None
+    return result
+
+def marker_scan(content):
+    """Aceleași câmpuri, obținute din parserul într-o singură trecere."""
+    markers = scan_markers(content)
+    text_span = text_dreapta_span(content, markers)
+    return {
+        'item_id': markers.item_id,
+        'flags': section_text(content, markers, 'flags'),
+        'text_dreapta': content[text_span[0]:text_span[1]] if text_span else None,
+        'sasa': section_text(content, markers, 'sasa', outer=True),
+        'articol': section_text(content, markers, 'articol', outer=True),
+        'categorie': section_text(content, markers, 'categorie', outer=True),
+        'canonical': markers.canonical
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Parserul de markeri și regex-urile vechi")
+    parser.add_argument('repeats', nargs='?', type=int, default=2000, help="numărul de repetări pe template")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    repeats = parser.parse_known_args()[0].repeats
+
+    for template in TEMPLATES:
+        with open(os.path.join(ROOT_DIR, template), 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if regex_scan(content) != marker_scan(content):
+            print(f"ATENȚIE: rezultate diferite pentru {template}")
+
+        regex_time = timeit.timeit(lambda: regex_scan(content), number=repeats)
+        marker_time = timeit.timeit(lambda: marker_scan(content), number=repeats)
+
+        print(f"{template} ({len(content)} caractere, {repeats} repetări)")
+        print(f"  regex-uri separate:  {regex_time / repeats * 1e6:8.1f} µs / pagină")
+        print(f"  o singură trecere:   {marker_time / repeats * 1e6:8.1f} µs / pagină")
+        print(f"  accelerare:          {regex_time / marker_time:8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compară memoria maximă folosită de hărțile RO din Pasul 3 / Pasul 4:
+varianta veche (conținutul complet al fiecărui fișier ținut în dicționare)
+și înregistrările compacte din indexul corpusului.
+
+Rulare: python benchmarks/bench_memory.py [număr_fișiere ...]
+"""
+import os
+import sys
+import shutil
+import tempfile
+import tracemalloc
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import text_io
+from corpus_index import CorpusIndex
+from html_markers import scan_markers
+
+def build_corpus(folder, count):
+    with open(os.path.join(ROOT_DIR, 'index-ro.html'), 'rb') as f:
+        template = f.read()
+
+    for number in range(count):
+        page = template.replace(b'</body>', f'<!-- {number} --></body>'.encode())
+        with open(os.path.join(folder, f'articol-{number:05d}.html'), 'wb') as f:
+            f.write(page)
+
+def old_maps(folder):
+    """Hărțile cum erau construite înainte: ID -> dicționar cu tot conținutul."""
+    by_id = {}
+    by_name = {}
+    for filename in sorted(os.listdir(folder)):
+        path = os.path.join(folder, filename)
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        entry = {'path': path, 'filename': filename, 'content': content}
+        by_id[scan_markers(content).item_id or filename] = entry
+        by_name[os.path.splitext(filename)[0]] = dict(entry)
+    return by_id, by_name
+
+def compact_maps(folder, db_path):
+    """Hărțile din înregistrările compacte (indexul e deja la zi)."""
+    index = CorpusIndex(db_path, workers=1)
+    by_id = {}
+    by_name = {}
+    for row in index.refresh(folder, 'ro'):
+        by_id[row['item_id'] or row['filename']] = row
+        by_name[os.path.splitext(row['filename'])[0]] = row
+    index.close()
+    return by_id, by_name
+
+def peak_memory(function, *args):
+    tracemalloc.start()
+    result = function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria hărților RO din Pasul 3 / Pasul 4")
+    parser.add_argument('counts', nargs='*', type=int, default=[1000, 4000],
+                        help="numărul de fișiere al fiecărei măsurători")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    counts = parser.parse_known_args()[0].counts
+    print(f"{'fișiere':>8} {'vechi (MB)':>12} {'compact (MB)':>13} {'octeți/fișier':>14}")
+
+    for count in counts:
+        folder = tempfile.mkdtemp(prefix='bench_memory_')
+        db_path = os.path.join(folder, 'index.sqlite')
+        text_io.encoding_cache.db_path = db_path
+        try:
+            corpus = os.path.join(folder, 'ro')
+            os.makedirs(corpus)
+            build_corpus(corpus, count)
+
+            # Prima rulare populează indexul; se măsoară rularea următoare
+            compact_maps(corpus, db_path)
+            old_peak = peak_memory(old_maps, corpus)
+            compact_peak = peak_memory(compact_maps, corpus, db_path)
+            print(f"{count:>8} {old_peak / 2**20:>12.1f} {compact_peak / 2**20:>13.1f} "
+                  f"{compact_peak // count:>14}")
+        finally:
+            text_io.encoding_cache.pending = {}
+            shutil.rmtree(folder)
+
+if __name__ == "__main__":
+    main()
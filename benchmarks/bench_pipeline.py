@@ -0,0 +1,156 @@
+"""Măsoară fiecare etapă (Pasul 0 ... Pasul 6 și Compara) pe corpusuri sintetice de mărimi diferite.
+
+Pentru fiecare mărime se generează un corpus (benchmarks/generate_corpus.py) într-un folder
+temporar, apoi fiecare etapă rulează într-un proces separat, cu căile redirecționate spre
+corpus. Se raportează durata, fișierele pe secundă, memoria maximă (RSS) a procesului
+și volumul citit/scris (din run_report).
+
+Pasul 1 și Pasul 2 lucrează doar pe primele --docx-articles articole (documentul Word
+cu 100k articole nu e un caz real). Pasul 7 nu este inclus (încarcă pe FTP).
+
+Rulare: python benchmarks/bench_pipeline.py [mărimi ...] [--docx-articles M] [--stages a,b] [--keep]
+        (implicit 1000 10000 100000)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+GENERATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generate_corpus.py')
+
+BENCH_STAGES = ['pasul0', 'pasul1', 'pasul2', 'pasul3', 'pasul4', 'pasul5', 'pasul6', 'compara']
+
+def peak_memory_mb():
+    """RSS maxim al procesului curent (sau vârful tracemalloc unde nu există `resource`)."""
+    try:
+        import resource
+    except ImportError:
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux raportează în KB, macOS în octeți
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def configure_stage(name, module, corpus, docx_articles):
+    """Redirecționează căile etapei spre corpus; întoarce numărul de fișiere procesate."""
+    ro_dir = os.path.join(corpus, 'ro')
+    en_dir = os.path.join(corpus, 'en')
+    output_dir = os.path.join(corpus, 'output')
+    articles = sorted(entry for entry in os.listdir(ro_dir)
+                      if entry.endswith('.html') and entry != 'index.html')
+
+    if name == 'pasul0':
+        module.folders_to_scan = [ro_dir]
+    elif name == 'pasul1':
+        module.INPUT_FOLDER = ro_dir
+        module.SPECIFIC_FILES = articles[:docx_articles]
+        module.EN_FOLDERS = [en_dir, output_dir]
+        return len(module.SPECIFIC_FILES)
+    elif name == 'pasul2':
+        return min(len(articles), docx_articles)
+    elif name in ('pasul3', 'pasul4'):
+        module.RO_DIR = ro_dir
+        module.OUTPUT_DIR = output_dir
+    elif name == 'pasul5':
+        module.OUTPUT_DIR = output_dir
+        module.EN_DIR = en_dir
+        module.RO_DIR = ro_dir
+        module.BACKUP_DIR = os.path.join(corpus, 'backup')
+    elif name in ('pasul6', 'compara'):
+        module.ro_directory = ro_dir
+        module.en_directory = en_dir
+    return len(articles)
+
+def run_stage_here(name, corpus, docx_articles):
+    """Rulează o etapă în procesul curent (apelat de run_stage prin --run-stage)."""
+    import text_io
+    import id_map
+    import item_ids
+    import run_report
+    import incremental
+    import corpus_index
+    import pipeline
+
+    corpus_index.INDEX_DB = os.path.join(corpus, 'corpus_index.sqlite')
+    incremental.MANIFEST_DIR = os.path.join(corpus, '.manifeste')
+    text_io.encoding_cache.db_path = corpus_index.INDEX_DB
+    item_ids.LEDGER_DB = corpus_index.INDEX_DB
+    id_map.MAP_DB = corpus_index.INDEX_DB
+    os.chdir(corpus)
+
+    module = pipeline.load_stage_module(name)
+    files = configure_stage(name, module, corpus, docx_articles)
+
+    if sys.platform == 'win32':
+        import tracemalloc
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            with run_report.stage(name) as stats:
+                for function_name in pipeline.STAGES[name]['functions']:
+                    getattr(module, function_name)(**pipeline.stage_arguments(name, function_name))
+            text_io.encoding_cache.flush()
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({'elapsed': elapsed, 'files': files, 'peak_mb': peak_memory_mb(),
+                      'read_mb': stats.bytes_read / 2**20, 'written_mb': stats.bytes_written / 2**20}))
+
+def run_stage(name, corpus, docx_articles):
+    """Rulează etapa într-un proces nou, ca memoria maximă să fie doar a ei."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-stage', name, corpus, str(docx_articles)],
+        capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'eroare'}
+    # Ultima linie JSON (etapa poate afișa și alte linii înainte)
+    return json.loads([line for line in result.stdout.splitlines() if line.startswith('{')][-1])
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run-stage':
+        run_stage_here(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark pe etape pentru corpusuri sintetice.")
+    parser.add_argument('sizes', type=int, nargs='*', default=[1000, 10000, 100000])
+    parser.add_argument('--docx-articles', type=int, default=1000)
+    parser.add_argument('--stages', help="etapele măsurate, separate prin virgulă")
+    parser.add_argument('--keep', action='store_true', help="păstrează corpusurile generate")
+    args = parser.parse_args()
+    stages = args.stages.split(',') if args.stages else BENCH_STAGES
+
+    for size in args.sizes:
+        corpus = tempfile.mkdtemp(prefix=f'corpus_{size}_')
+        try:
+            start = time.perf_counter()
+            # Generarea rulează separat: RSS-ul maxim al părintelui s-ar moșteni în etape
+            subprocess.run([sys.executable, GENERATOR, corpus, str(size),
+                            '--docx-articles', str(args.docx_articles)],
+                           check=True, stdout=subprocess.DEVNULL)
+            print(f"\n{size} articole (generat în {time.perf_counter() - start:.1f}s, {corpus})")
+            print(f"  {'etapă':8} {'durată (s)':>11} {'fișiere':>8} {'fișiere/s':>10} {'RSS max (MB)':>13} "
+                  f"{'citit (MB)':>11} {'scris (MB)':>11}")
+
+            for name in stages:
+                result = run_stage(name, corpus, args.docx_articles)
+                if 'error' in result:
+                    print(f"  {name:8} EROARE: {result['error']}")
+                    continue
+                rate = result['files'] / result['elapsed'] if result['elapsed'] else 0
+                print(f"  {name:8} {result['elapsed']:>11.2f} {result['files']:>8} "
+                      f"{rate:>10.0f} {result['peak_mb']:>13.1f} "
+                      f"{result['read_mb']:>11.1f} {result['written_mb']:>11.1f}")
+        finally:
+            if not args.keep:
+                shutil.rmtree(corpus, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
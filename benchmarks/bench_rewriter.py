@@ -0,0 +1,77 @@
+"""Măsoară transformările finale ale paginilor din Pasul 2 (apply_page_transforms), pas cu
+pas, pe pagini construite cu update_html_content din template-ul index.html, cu sute de
+paragrafe în toate formele tratate de înlocuiri.
+
+Rulare: python benchmarks/bench_rewriter.py [număr_paragrafe ...]   (implicit 50 200 500 1000)
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import article_pages
+from check_pasul2_golden import FixedDatetime
+
+WORDS = ('leadership leader team vision path truth courage time soul mind power meaning '
+         'creation mastery beauty silence light knowledge trust change value freedom').split()
+
+def sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def paragraph(rng):
+    """Un paragraf cum îl scoate extract_data_from_docx."""
+    return rng.choice([
+        lambda: f'<strong><em>{sentence(rng)}</em></strong>',
+        lambda: f'<strong>{sentence(rng)}</strong>',
+        lambda: f'<strong>{sentence(rng, 4)} </strong>{sentence(rng)}',
+        lambda: f'<strong>{rng.randint(1, 20)}. </strong>{sentence(rng)}',
+        lambda: f'{rng.randint(1, 20)}. {sentence(rng)}',
+        lambda: f'{sentence(rng)} <em>{sentence(rng, 5)}</em> {sentence(rng, 3)}',
+        lambda: f'<strong>* Note: </strong>{sentence(rng)}',
+        lambda: f'{sentence(rng, 4)} NBSP{sentence(rng, 4)}&nbsp;x y',
+        lambda: f'<a href="https://neculaifantanaru.com/en/x.html">https://neculaifantanaru.com/en/x.html</a> {sentence(rng)}',
+        lambda: sentence(rng),
+    ])()
+
+def build_page(template, body, number):
+    title = f"Article {number} {WORDS[number % len(WORDS)]}"
+    return article_pages.update_html_content(template, title, body[0], body, article_pages.generate_filename(title), str(number))
+
+def best_time(function, page, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(page)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Transformările finale ale paginilor din Pasul 2")
+    parser.add_argument('sizes', nargs='*', type=int, default=[50, 200, 500, 1000],
+                        help="numărul de paragrafe al paginilor măsurate")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    sizes = parser.parse_known_args()[0].sizes
+    article_pages.datetime = FixedDatetime
+    with open(os.path.join(ROOT_DIR, 'index.html'), 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    rng = random.Random(0)
+    steps = [transform.__name__ for transform in article_pages.PAGE_TRANSFORMS]
+    # Timpul fiecărui pas (ms), pe pagina rezultată din pasul anterior
+    print(f"  {'paragrafe':>9} " + ' '.join(f"{step:>24}" for step in steps) + f" {'total (ms)':>11}")
+    for size in sizes:
+        page = build_page(template, [paragraph(rng) for _ in range(size)], size)
+        times = []
+        for transform in article_pages.PAGE_TRANSFORMS:
+            times.append(best_time(transform, page, 20))
+            page = transform(page)
+        print(f"  {size:9d} " + ' '.join(f"{elapsed * 1000:24.2f}" for elapsed in times)
+              + f" {sum(times) * 1000:11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compară construirea paginilor din Pasul 2: update_html_content (înlocuiri regex pe tot
+template-ul, pentru fiecare articol) și fill_html_template (template compilat o singură dată
+în bucăți fixe și sloturi, apoi un join).
+
+Paginile trebuie să fie identice, inclusiv pentru valorile care trec pe calea veche (titluri
+cu „On”, ghilimele franțuzești, corpuri cu „On ..., in” sau cu tag-uri <title>). Articolele
+obișnuite (inclusiv titluri cu „One”, „Only”) trebuie să rămână aproape toate pe calea nouă.
+
+Rulare: python benchmarks/bench_template.py [număr_articole]   (implicit 1000)
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import article_pages
+from check_pasul2_golden import FixedDatetime
+from bench_rewriter import WORDS, sentence, paragraph
+
+EDGE_TITLES = ['On leadership, in practice', 'Știința și «arta» conducerii', 'Leader on the road, in time',
+               'Title with zzz.html', 'A, b: c? d!', 'Ce înseamnă să fii lider']
+EDGE_PARAGRAPHS = ['On the other hand, in time you learn.', '<strong>On Monday, in the morning</strong>',
+                   '<title>Old</title> text', '<h1 class="den_articol" itemprop="name">x</h1> y',
+                   '<strong>Bold, with «quotes»</strong> and text', 'Text with zzz.html inside']
+# Cuvinte obișnuite care încep cu „On”, dar nu pot forma un „On ..., in”
+TITLE_WORDS = ['One', 'Only', 'Online', 'Onward', 'one', 'only']
+
+# Cât din articolele obișnuite poate trece pe calea veche fără ca benchmark-ul să fie marcat eșuat
+MAX_ORDINARY_FALLBACKS = 0.01
+
+def make_articles(count, seed=0):
+    rng = random.Random(seed)
+    articles = []
+    for number in range(count):
+        if number % 10 == 9:
+            title = rng.choice(EDGE_TITLES)
+            body = [paragraph(rng) for _ in range(rng.randint(3, 15))] + [rng.choice(EDGE_PARAGRAPHS)]
+        else:
+            title = f"Article {number} {rng.choice(TITLE_WORDS)} {rng.choice(WORDS)} {sentence(rng, 3)}"
+            body = [paragraph(rng) for _ in range(rng.randint(8, 30))]
+        article_id = str(number) if number % 7 else None
+        articles.append((title, body, article_id))
+    return articles
+
+def render_all(function, template, articles, filenames):
+    return [function(template, title, body, filename, article_id)
+            for (title, body, article_id), filename in zip(articles, filenames)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Construirea paginilor din Pasul 2 din template")
+    parser.add_argument('count', nargs='?', type=int, default=1000, help="numărul de articole")
+    # Celelalte opțiuni (ex. --no-report) rămân în sys.argv pentru modulele comune
+    count = parser.parse_known_args()[0].count
+    article_pages.datetime = FixedDatetime
+    with open(os.path.join(ROOT_DIR, 'index.html'), 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    articles = make_articles(count)
+    filenames = [article_pages.generate_filename(title) for title, _, _ in articles]
+    legacy = lambda html, title, body, filename, article_id: article_pages.update_html_content(
+        html, title, body[0], body, filename, article_id)
+
+    start = time.perf_counter()
+    expected = render_all(legacy, template, articles, filenames)
+    before = time.perf_counter() - start
+
+    article_pages.COMPILED_TEMPLATES.clear()
+    # Corpurile articolelor trecute pe calea veche (update_html_content primește corpul pe poziția 3)
+    calls = []
+    original = article_pages.update_html_content
+    article_pages.update_html_content = lambda *args: calls.append(id(args[3])) or original(*args)
+    start = time.perf_counter()
+    pages = render_all(article_pages.fill_html_template, template, articles, filenames)
+    after = time.perf_counter() - start
+    article_pages.update_html_content = original
+
+    different = [title for (title, _, _), page, reference in zip(articles, pages, expected) if page != reference]
+    if different:
+        print(f"EROARE: {len(different)} pagini diferă, ex. {different[0]!r}")
+        sys.exit(1)
+    edge_bodies = {id(body) for number, (_, body, _) in enumerate(articles) if number % 10 == 9}
+    ordinary = count - len(edge_bodies)
+    ordinary_fallbacks = sum(1 for body_id in calls if body_id not in edge_bodies)
+    print(f"{count} articole, pagini identice ({len(calls)} construite pe calea veche, "
+          f"dintre care {ordinary_fallbacks} din {ordinary} articole obișnuite)")
+    if ordinary_fallbacks > ordinary * MAX_ORDINARY_FALLBACKS:
+        print(f"EROARE: prea multe articole obișnuite pe calea veche (limita: {MAX_ORDINARY_FALLBACKS:.0%})")
+        sys.exit(1)
+    print(f"  update_html_content: {before * 1000:8.1f} ms ({before / count * 1000:.3f} ms / articol)")
+    print(f"  fill_html_template:  {after * 1000:8.1f} ms ({after / count * 1000:.3f} ms / articol)")
+    print(f"  accelerare: {before / after:.1f}x")
+
+    # Doar completarea sloturilor (restul e formatarea corpului și textul bold, comune ambelor căi)
+    compiled = article_pages.compile_html_template(template, True)
+    values = {'item_id': '<!-- $item_id = 1; // ID-ul din fisierul limba romana -->\n', 'title': 'Title',
+              'h1': 'Title', 'filename': 'title.html', 'description': 'Description', 'body': '', 'date': 'January 15, 2025'}
+    start = time.perf_counter()
+    for _ in range(count):
+        compiled.render(values)
+    elapsed = time.perf_counter() - start
+    print(f"  {count} completări ale template-ului compilat: {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Verificare golden pentru Pasul 2: paginile generate din același bebe.docx trebuie să
+rămână identice, octet cu octet, cu cele din momentul salvării amprentelor.
+
+Documentul de test conține toate formele de paragraf tratate de Pasul 2 (bold, italic,
+numerotare, „* Note:”, link-uri, NBSP, ghilimele în bold, articole fără conținut), iar
+data din pagini e fixată, așa că rezultatul nu depinde de ziua rulării. Amprentele
+(SHA-256 pe fișier) stau în golden_pasul2.json, lângă acest script.
+
+Rulare: python benchmarks/check_pasul2_golden.py [număr_articole] [--workers N] [--update]
+        (--update rescrie amprentele; implicit 60 de articole; --workers ajunge la Pasul 2)
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import shutil
+import hashlib
+import tempfile
+import contextlib
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+import text_io
+import pipeline
+import article_pages
+
+GOLDEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden_pasul2.json')
+WORDS = ('leadership leader team vision path truth courage time soul mind power meaning '
+         'creation mastery beauty silence light knowledge trust change value freedom').split()
+
+class FixedDatetime(datetime):
+    """Data „de azi” din paginile generate."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 15, 12, 0, 0)
+
+def sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def add_runs(document, runs):
+    paragraph = document.add_paragraph()
+    for text, bold, italic in runs:
+        run = paragraph.add_run(text)
+        run.bold = bold
+        run.italic = italic
+
+def write_test_docx(path, count, seed=0):
+    """bebe.docx cu `count` articole care trec prin toate ramurile transformărilor din Pasul 2."""
+    rng = random.Random(seed)
+    document = Document()
+    for number in range(1, count + 1):
+        title = document.add_paragraph(f"Article {number:04d} {rng.choice(WORDS)} și {rng.choice(WORDS)}")
+        title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        if number % 7:
+            id_line = document.add_paragraph(f"ID: {number}")
+            id_line.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        if number % 13 == 0:
+            # Articol fără conținut (Pasul 2 îl sare)
+            continue
+
+        variants = [
+            [(sentence(rng), True, True)],
+            [(sentence(rng), True, None)],
+            [(sentence(rng, 4) + ' ', True, None), (sentence(rng), None, None)],
+            [(f"{number % 9 + 1}. ", True, None), (sentence(rng), None, None)],
+            [(f"{number % 5 + 1}. {sentence(rng)}", None, None)],
+            [(sentence(rng), None, None), (sentence(rng, 5), None, True), (sentence(rng, 3), None, None)],
+            [(f'"{sentence(rng, 5)}"', True, None), (' ' + sentence(rng), None, None)],
+            [(f"Read more at https://neculaifantanaru.com/en/{rng.choice(WORDS)}.html today", None, None)],
+            [(f"{sentence(rng, 4)} NBSP{sentence(rng, 4)}&nbsp;end", None, None)],
+            [("* Note: ", True, None), (sentence(rng), None, None)],
+            [("", None, None)],
+            [(sentence(rng, 6), None, True)],
+        ]
+        rng.shuffle(variants)
+        for runs in variants[:8 + number % 5]:
+            add_runs(document, runs)
+    document.save(path)
+
+def output_hashes(output_dir):
+    hashes = {}
+    for name in sorted(os.listdir(output_dir)):
+        with open(os.path.join(output_dir, name), 'rb') as f:
+            hashes[name] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificarea golden a paginilor din Pasul 2")
+    parser.add_argument('count', nargs='?', type=int, default=60, help="numărul de articole")
+    parser.add_argument('--workers', type=int, help="procesele folosite de Pasul 2")
+    parser.add_argument('--update', action='store_true', help="rescrie amprentele")
+    # Celelalte opțiuni (ex. --dry-run) rămân în sys.argv pentru modulele comune
+    args, extra = parser.parse_known_args()
+    count, update = args.count, args.update
+    # --workers ajunge la Pasul 2 prin linia de comandă; raportul rulării nu e necesar pentru verificare
+    forwarded = ['--workers', str(args.workers)] if args.workers is not None else []
+    sys.argv = sys.argv[:1] + extra + forwarded + ['--no-report']
+
+    work_dir = tempfile.mkdtemp(prefix='golden_pasul2_')
+    text_io.encoding_cache.db_path = os.path.join(work_dir, 'corpus_index.sqlite')
+    previous_dir = os.getcwd()
+    try:
+        write_test_docx(os.path.join(work_dir, 'bebe.docx'), count)
+        shutil.copy(os.path.join(ROOT_DIR, 'index.html'), work_dir)
+        pasul2 = pipeline.load_stage_module('pasul2')
+        article_pages.datetime = FixedDatetime
+
+        os.chdir(work_dir)
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            pasul2.main()
+            elapsed = time.perf_counter() - start
+        hashes = output_hashes(os.path.join(work_dir, 'output'))
+    finally:
+        os.chdir(previous_dir)
+        text_io.encoding_cache.pending.clear()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"Pasul 2: {len(hashes)} pagini în {elapsed:.2f}s ({elapsed / len(hashes) * 1000:.2f} ms / articol)")
+    golden = {}
+    if os.path.exists(GOLDEN_FILE):
+        with open(GOLDEN_FILE, 'r', encoding='utf-8') as f:
+            golden = json.load(f)
+
+    key = str(count)
+    if update or key not in golden:
+        golden[key] = hashes
+        with open(GOLDEN_FILE, 'w', encoding='utf-8') as f:
+            json.dump(golden, f, indent=1, sort_keys=True)
+        print(f"Amprente salvate pentru {count} articole în {GOLDEN_FILE}")
+        return
+
+    different = sorted(name for name in set(golden[key]) | set(hashes) if golden[key].get(name) != hashes.get(name))
+    if different:
+        print(f"EROARE: {len(different)} pagini diferă de golden:")
+        for name in different[:20]:
+            print(f"  - {name}")
+        sys.exit(1)
+    print(f"OK: toate cele {len(hashes)} pagini sunt identice cu golden")
+
+if __name__ == "__main__":
+    main()
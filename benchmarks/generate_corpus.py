@@ -0,0 +1,199 @@
+"""Generează un corpus sintetic pentru benchmark-uri, pornind de la template-urile reale
+index-ro.html / index.html.
+
+Structura produsă (ca pe discul de lucru):
+    ro/        N articole RO (FLAGS, $item_id, dată, categorie, imagine) + index.html
+    en/        N articole EN pereche (id-uri de la 5000), index.html și paginile de categorie
+    output/    paginile EN așa cum le scoate Pasul 2 (același id ca articolul RO)
+    bebe.docx  primele `docx_articles` articole, în formatul citit de Pasul 2
+    index.html template-ul EN folosit de Pasul 2
+
+Rulare: python benchmarks/generate_corpus.py DESTINATIE N [--docx-articles M] [--seed S]
+"""
+import os
+import re
+import sys
+import random
+import argparse
+import importlib.util
+from datetime import date, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+RO_MONTHS = ['Ianuarie', 'Februarie', 'Martie', 'Aprilie', 'Mai', 'Iunie', 'Iulie',
+             'August', 'Septembrie', 'Octombrie', 'Noiembrie', 'Decembrie']
+EN_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+             'August', 'September', 'October', 'November', 'December']
+
+RO_WORDS = ('leadership lider echipa viziune drum adevar curaj timp suflet minte '
+            'putere sens creatie maiestrie frumusete liniste lumina cunoastere '
+            'incredere schimbare valoare libertate credinta intelepciune').split()
+EN_WORDS = ('leadership leader team vision path truth courage time soul mind '
+            'power meaning creation mastery beauty silence light knowledge '
+            'trust change value freedom faith wisdom').split()
+
+START_EN_ID = 5000
+TEXT_DREAPTA_PATTERN = re.compile(r'<td class="text_dreapta">.*?</td>', re.DOTALL)
+ARTICLE_SECTION_PATTERN = re.compile(r'<!-- ARTICOL START -->.*?<!-- ARTICOL FINAL -->', re.DOTALL)
+
+def load_category_mapping():
+    """category_mapping() din Pasul 4 (sursa reală a categoriilor RO -> EN)."""
+    script = 'Pasul 4 - Preia DATA si Numele categoriilor din RO si le pune in fisierele noi EN.py'
+    spec = importlib.util.spec_from_file_location('pasul4_categorii', os.path.join(ROOT_DIR, script))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.category_mapping()
+
+def read_template(name):
+    with open(os.path.join(ROOT_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def make_article(rng, number, categories):
+    """Datele unui articol: titluri, slug-uri, dată, categorie și paragrafe (RO și EN)."""
+    words = rng.sample(range(len(RO_WORDS)), 3)
+    ro_title = f"Articol {number:06d} " + ' '.join(RO_WORDS[i] for i in words)
+    en_title = f"Article {number:06d} " + ' '.join(EN_WORDS[i] for i in words)
+    published = date(2025, 6, 30) - timedelta(days=rng.randrange(900))
+    ro_category, en_category = rng.choice(categories)
+
+    ro_body = []
+    en_body = []
+    for _ in range(rng.randint(8, 30)):
+        indexes = [rng.randrange(len(RO_WORDS)) for _ in range(rng.randint(40, 120))]
+        ro_body.append(' '.join(RO_WORDS[i] for i in indexes).capitalize() + '.')
+        en_body.append(' '.join(EN_WORDS[i] for i in indexes).capitalize() + '.')
+
+    return {
+        'number': number,
+        'ro_title': ro_title,
+        'en_title': en_title,
+        'ro_slug': ro_title.lower().replace(' ', '-'),
+        'en_slug': en_title.lower().replace(' ', '-'),
+        'ro_date': f"{RO_MONTHS[published.month - 1]} {published.day:02d}, {published.year}",
+        'en_date': f"{EN_MONTHS[published.month - 1]} {published.day:02d}, {published.year}",
+        'ro_category': ro_category,
+        'en_category': en_category,
+        'ro_body': ro_body,
+        'en_body': en_body
+    }
+
+def body_html(paragraphs, image_url):
+    html = f'<p class="text_obisnuit"><img src="{image_url}" width="600" height="400" /></p>\n'
+    html += f'<p class="text_obisnuit2"><em>{paragraphs[0]}</em></p>\n'
+    for paragraph in paragraphs[1:]:
+        html += f'<p class="text_obisnuit">{paragraph}</p>\n'
+    return html
+
+def render_ro(template, article):
+    ro_link, ro_title = article['ro_category']
+    content = template.replace('zzz', article['ro_slug'])
+    content = content.replace('en/qualities-of-a-leader.html', f"en/{article['en_slug']}.html")
+    content = content.replace('$item_id = 860;', f"$item_id = {article['number']};")
+    content = content.replace('XXX', article['ro_title'])
+    content = TEXT_DREAPTA_PATTERN.sub(
+        f'<td class="text_dreapta">On {article["ro_date"]}, in <a href="https://neculaifantanaru.com/{ro_link}.html" '
+        f'title="Vezi toate articolele din {ro_title}" class="external" rel="category tag">{ro_title}</a>, '
+        f'by Neculai Fantanaru</td>', content, count=1)
+    image_url = f"https://neculaifantanaru.com/images/{article['ro_slug']}_image.jpg"
+    return content.replace(' YYY', body_html(article['ro_body'], image_url), 1)
+
+def render_en(template, article, item_id, with_category):
+    content = template.replace('zzz', article['en_slug'])
+    content = content.replace('calitatile-unui-lider', article['ro_slug'])
+    content = content.replace('$item_id = 5006;', f'$item_id = {item_id};')
+    content = content.replace('XXX', article['en_title'])
+    if with_category:
+        en_link, en_title = article['en_category']
+        content = TEXT_DREAPTA_PATTERN.sub(
+            f'<td class="text_dreapta">On {article["en_date"]}, in <a href="https://neculaifantanaru.com/en/{en_link}.html" '
+            f'title="View all articles from {en_title}" class="external" rel="category tag">{en_title}</a>, '
+            f'by Neculai Fantanaru</td>', content, count=1)
+    # Lista de limbi din paginile publicate (citită de Pasul 6 / Pasul 7)
+    content = content.replace(
+        '<!-- FLAGS -->',
+        f'<!-- FLAGS -->\n<ul class="limbi"><li><a cunt_code="+40" '
+        f'href="https://neculaifantanaru.com/{article["ro_slug"]}.html">Romana</a></li></ul>', 1)
+    image_url = 'https://neculaifantanaru.com/images/placeholder_image.jpg'
+    return content.replace(' YYY', body_html(article['en_body'], image_url), 1)
+
+def render_listing(template, links):
+    """Pagină de categorie / index cu secțiunea ARTICOL CATEGORIE (folosită de Pasul 5)."""
+    entries = ''.join(f'      <p class="text_obisnuit"><a href="{link}">{link}</a></p>\n' for link in links)
+    section = ('<!-- ARTICOL CATEGORIE START -->\n<div align="justify">\n'
+               f'{entries}</div>\n<!-- ARTICOL CATEGORIE FINAL -->')
+    return ARTICLE_SECTION_PATTERN.sub(lambda match: section, template, count=1)
+
+def write_docx(path, articles):
+    """bebe.docx în formatul așteptat de Pasul 2: titlu centrat, linia ID, paragrafe."""
+    document = Document()
+    for article in articles:
+        title = document.add_paragraph(article['en_title'])
+        title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        id_line = document.add_paragraph(f"ID: {article['number']}")
+        id_line.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+        first = document.add_paragraph()
+        run = first.add_run(article['en_body'][0])
+        run.bold = True
+        run.italic = True
+        for paragraph in article['en_body'][1:]:
+            document.add_paragraph(paragraph)
+    document.save(path)
+
+def write_file(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def generate_corpus(destination, count, docx_articles=None, seed=0):
+    """Scrie corpusul și întoarce lista articolelor generate (în ordinea id-urilor)."""
+    rng = random.Random(seed)
+    mapping = load_category_mapping()
+    categories = [((ro_link, ro_link.replace('-', ' ').title()), (entry['link'], entry['title']))
+                  for ro_link, entry in sorted(mapping.items())]
+
+    ro_template = read_template('index-ro.html')
+    en_template = read_template('index.html')
+    folders = {name: os.path.join(destination, name) for name in ('ro', 'en', 'output')}
+    for folder in folders.values():
+        os.makedirs(folder, exist_ok=True)
+
+    articles = []
+    for number in range(1, count + 1):
+        article = make_article(rng, number, categories)
+        articles.append(article)
+        write_file(os.path.join(folders['ro'], f"{article['ro_slug']}.html"), render_ro(ro_template, article))
+        write_file(os.path.join(folders['en'], f"{article['en_slug']}.html"),
+                   render_en(en_template, article, START_EN_ID + number, with_category=True))
+        write_file(os.path.join(folders['output'], f"{article['en_slug']}.html"),
+                   render_en(en_template, article, number, with_category=False))
+
+    # Index-urile și paginile de categorie (Pasul 5)
+    ro_links = [f"https://neculaifantanaru.com/{article['ro_slug']}.html" for article in articles]
+    write_file(os.path.join(folders['ro'], 'index.html'), render_listing(ro_template, ro_links))
+    write_file(os.path.join(folders['en'], 'index.html'), render_listing(en_template, []))
+    for _, (en_link, _) in categories:
+        write_file(os.path.join(folders['en'], f'{en_link}.html'), render_listing(en_template, []))
+
+    write_file(os.path.join(destination, 'index.html'), en_template)
+    docx_count = count if docx_articles is None else min(count, docx_articles)
+    write_docx(os.path.join(destination, 'bebe.docx'), articles[:docx_count])
+    return articles
+
+def main():
+    parser = argparse.ArgumentParser(description="Generează un corpus sintetic RO/EN.")
+    parser.add_argument('destination')
+    parser.add_argument('count', type=int)
+    parser.add_argument('--docx-articles', type=int, default=None,
+                        help="câte articole intră în bebe.docx (implicit toate)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate_corpus(args.destination, args.count, args.docx_articles, args.seed)
+    print(f"Corpus generat: {args.count} articole în {args.destination}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Opțiunile din linia de comandă comune scripturilor, într-un singur parser.
+
+Fiecare modul comun își păstrează funcția *_requested (ex. text_io.dry_run_requested), dar
+toate citesc aceleași opțiuni, de aici. Parserul folosește parse_known_args: argumentele
+proprii ale unui script sau ale pipeline.py (ex. --stages) trec mai departe neschimbate.
+
+O opțiune fără valoare sau cu o valoare greșită nu oprește scriptul: se afișează un
+avertisment (o singură dată) și se folosește valoarea implicită.
+"""
+import sys
+import argparse
+
+# Marchează o opțiune dată fără valoare (ex. --workers la capătul comenzii)
+MISSING_VALUE = ''
+
+PARSER = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+PARSER.add_argument('--dry-run', action='store_true')
+PARSER.add_argument('--incremental', action='store_true')
+PARSER.add_argument('--no-report', action='store_true')
+PARSER.add_argument('--stable-ids', action='store_true')
+PARSER.add_argument('--full-parse', action='store_true')
+PARSER.add_argument('--python-docx', action='store_true')
+PARSER.add_argument('--stream-docx', action='store_true')
+PARSER.add_argument('--workers', nargs='?', const=MISSING_VALUE)
+# Limitele unui document din exportul Pasul 1 (docx_writers.chunk_budget_requested)
+PARSER.add_argument('--max-chars', nargs='?', const=MISSING_VALUE)
+PARSER.add_argument('--max-bytes', nargs='?', const=MISSING_VALUE)
+# Selecția articolelor (corpus_index.article_query_requested)
+PARSER.add_argument('--missing-en', action='store_true')
+PARSER.add_argument('--since', nargs='?', const=MISSING_VALUE)
+PARSER.add_argument('--until', nargs='?', const=MISSING_VALUE)
+PARSER.add_argument('--category', nargs='?', const=MISSING_VALUE)
+PARSER.add_argument('--ids', nargs='?', const=MISSING_VALUE)
+
+# Avertismentele deja afișate: funcțiile *_requested sunt apelate de mai multe ori pe rulare
+_warned = set()
+
+def options(argv=None):
+    """Opțiunile comune din argv (implicit sys.argv), ca argparse.Namespace."""
+    argv = sys.argv if argv is None else argv
+    return PARSER.parse_known_args(argv[1:])[0]
+
+def warn_once(message):
+    """Afișează avertismentul doar prima dată când apare."""
+    if message not in _warned:
+        _warned.add(message)
+        print(message)
+
+def raw_value(option, argv=None):
+    """Valoarea opțiunii așa cum a fost dată (None dacă lipsește, MISSING_VALUE fără valoare)."""
+    return getattr(options(argv), option.lstrip('-').replace('-', '_'))
+
+def value_option(option, fallback, argv=None):
+    """Valoarea opțiunii (text) sau None dacă nu e dată sau e dată fără valoare.
+
+    `fallback` descrie în avertisment ce se întâmplă în lipsa unei valori valide.
+    """
+    value = raw_value(option, argv)
+    if value == MISSING_VALUE:
+        warn_once(f"{option} așteaptă o valoare; {fallback}")
+        return None
+    return value
+
+def number_option(option, fallback, argv=None):
+    """Valoarea opțiunii numerice (cel puțin 1) sau None dacă lipsește ori nu e un număr."""
+    value = raw_value(option, argv)
+    if value is None:
+        return None
+    try:
+        return max(1, int(value))
+    except ValueError:
+        warn_once(f"{option} așteaptă un număr; {fallback}")
+        return None
@@ -0,0 +1,334 @@
+import os
+import re
+import sqlite3
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html_markers import scan_markers, section_text, text_dreapta_span
+from text_io import decode_bytes, remember_encoding
+from run_report import run_report
+from command_line import options, value_option, number_option, warn_once
+
+# Indexul persistent al articolelor (un rând per fișier HTML)
+INDEX_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_index.sqlite')
+
+# Numărul implicit de procese pentru recitirea fișierelor modificate
+WORKERS = os.cpu_count() or 1
+# Sub acest număr de fișiere pornirea unui pool costă mai mult decât câștigă
+PARALLEL_MIN_FILES = 64
+
+COLUMNS = [
+    'path', 'folder', 'filename', 'language', 'item_id', 'item_id_comment', 'item_id_variants', 'mtime_ns',
+    'size', 'hash', 'flag_ro', 'flag_en', 'data', 'data_iso', 'categorie_link', 'categorie_titlu',
+    'canonical', 'imagine'
+]
+
+# Câmpurile întoarse de refresh(): doar ce folosesc scripturile, fără datele de sincronizare
+RECORD_FIELDS = [
+    'path', 'filename', 'item_id', 'item_id_comment', 'item_id_variants', 'mtime_ns', 'flag_ro', 'flag_en',
+    'data', 'categorie_link', 'categorie_titlu', 'canonical', 'imagine'
+]
+
+# Înregistrările deja încărcate în acest proces, pe folder: etapele rulate împreună
+# (pipeline.py) le folosesc direct cât timp fișierele din folder nu s-au schimbat
+shared_records = {}
+
+FLAG_RO_PATTERN = re.compile(r'<a href="https://neculaifantanaru\.com/+([^"]+)"[^>]*?><img[^>]*?title="ro"')
+FLAG_EN_PATTERN = re.compile(r'<a href="https://neculaifantanaru\.com/+en/([^"]+)"[^>]*?><img[^>]*?title="en"')
+DATE_PATTERN = re.compile(r'On (.*?), in')
+CATEGORY_PATTERNS = [
+    re.compile(r'<a href="https://neculaifantanaru\.com/([^"]+)" title="[^"]*" class="[^"]*"[^>]*>(.*?)</a>'),
+    re.compile(r'<a href="https://neculaifantanaru\.com/([^"]+)"[^>]*>(.*?)</a>')
+]
+IMAGE_PATTERN = re.compile(r'<img src="(https://neculaifantanaru\.com/images/.*?_image\.jpg)"')
+
+# Lunile din DATA (paginile RO și EN), pentru data_iso (AAAA-LL-ZZ) după care se filtrează articolele
+MONTHS = {
+    'ianuarie': 1, 'februarie': 2, 'martie': 3, 'aprilie': 4, 'mai': 5, 'iunie': 6,
+    'iulie': 7, 'august': 8, 'septembrie': 9, 'octombrie': 10, 'noiembrie': 11, 'decembrie': 12,
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+# "Aprilie 16, 2016" sau "16 Aprilie 2016"
+DATE_PARTS_PATTERNS = [
+    (re.compile(r'([^\W\d]+)\s+(\d{1,2}),?\s+(\d{4})'), (1, 2, 3)),
+    (re.compile(r'(\d{1,2})\s+([^\W\d]+),?\s+(\d{4})'), (2, 1, 3))
+]
+
+def iso_date(date_text):
+    """Data din câmpul DATA ca AAAA-LL-ZZ (sau None dacă nu poate fi citită)."""
+    if not date_text:
+        return None
+    for pattern, (month_group, day_group, year_group) in DATE_PARTS_PATTERNS:
+        match = pattern.search(date_text)
+        if match and match.group(month_group).lower() in MONTHS:
+            month = MONTHS[match.group(month_group).lower()]
+            return f"{match.group(year_group)}-{month:02d}-{int(match.group(day_group)):02d}"
+    return None
+
+def extract_record(content):
+    """Extrage câmpurile indexate dintr-un fișier HTML."""
+    record = dict.fromkeys(['item_id', 'item_id_comment', 'item_id_variants', 'flag_ro', 'flag_en', 'data',
+                            'data_iso', 'categorie_link', 'categorie_titlu', 'canonical', 'imagine'])
+
+    markers = scan_markers(content)
+    if markers.item_id is not None:
+        record['item_id'] = int(markers.item_id)
+        # Textul exact al primului comentariu și în câte variante apare în pagină:
+        # Incrementare știe fără recitire dacă pagina trebuie rescrisă
+        record['item_id_comment'] = content[markers.item_id_span[0]:markers.item_id_span[1]]
+    record['item_id_variants'] = len(markers.item_id_comments)
+    record['canonical'] = markers.canonical
+
+    flags_content = section_text(content, markers, 'flags')
+    if flags_content is not None:
+        ro_match = FLAG_RO_PATTERN.search(flags_content)
+        en_match = FLAG_EN_PATTERN.search(flags_content)
+        record['flag_ro'] = ro_match.group(1) if ro_match else None
+        record['flag_en'] = en_match.group(1) if en_match else None
+
+    text_span = text_dreapta_span(content, markers)
+    if text_span:
+        text_content = content[text_span[0]:text_span[1]]
+        date_match = DATE_PATTERN.search(text_content)
+        if date_match:
+            record['data'] = date_match.group(1).strip()
+            record['data_iso'] = iso_date(record['data'])
+        for pattern in CATEGORY_PATTERNS:
+            category_match = pattern.search(text_content)
+            if category_match:
+                record['categorie_link'] = category_match.group(1)
+                record['categorie_titlu'] = category_match.group(2).strip()
+                break
+
+    image = IMAGE_PATTERN.search(content)
+    if image:
+        record['imagine'] = image.group(1)
+
+    return record
+
+def read_record(file_path):
+    """Citește un fișier o singură dată și întoarce hash-ul și câmpurile extrase."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    content, encoding = decode_bytes(data)
+    record = extract_record(content)
+    record['hash'] = hashlib.sha1(data).hexdigest()
+    record['encoding'] = encoding
+    return record
+
+def workers_requested(argv=None):
+    """Numărul de procese cerut cu --workers N (implicit WORKERS)."""
+    return number_option('--workers', f"se folosesc {WORKERS} procese", argv) or WORKERS
+
+def article_query_requested(argv=None):
+    """Criteriile de selecție a articolelor din linia de comandă (dicționar gol dacă nu sunt date).
+
+        --missing-en              articolele RO fără pereche EN
+        --since AAAA-LL-ZZ        publicate din această dată (inclusiv)
+        --until AAAA-LL-ZZ        publicate până la această dată (inclusiv)
+        --category NUME           categoria (titlul sau link-ul ei)
+        --ids A-B                 ID-urile între A și B (A- sau -B pentru un singur capăt)
+    """
+    criteria = {}
+    if options(argv).missing_en:
+        criteria['missing_en'] = True
+    for option, key in [('--since', 'date_from'), ('--until', 'date_to'), ('--category', 'category')]:
+        value = value_option(option, "opțiunea e ignorată", argv)
+        if value is not None:
+            criteria[key] = value
+    ids = value_option('--ids', "intervalul e ignorat", argv)
+    if ids is not None:
+        first, _, last = ids.partition('-')
+        try:
+            if first:
+                criteria['id_from'] = int(first)
+            if last or not _:
+                criteria['id_to'] = int(last or first)
+        except ValueError:
+            warn_once(f"--ids așteaptă un interval de forma A-B, nu '{ids}'; intervalul e ignorat")
+            criteria.pop('id_from', None)
+    return criteria
+
+def read_record_safe(file_path):
+    """Ca read_record, dar întoarce eroarea în loc s-o arunce (rulează în procesele din pool)."""
+    try:
+        return read_record(file_path)
+    except OSError as e:
+        return {'eroare': str(e)}
+
+def load_records(paths, workers=WORKERS, use_threads=False):
+    """Citește și extrage metadatele pentru o listă de fișiere, distribuind munca pe mai multe procese.
+
+    Rezultatele sunt întoarse în aceeași ordine ca `paths`. Cu use_threads=True se folosesc
+    thread-uri (util când discul, nu procesorul, este limita).
+    """
+    if workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return [read_record_safe(path) for path in paths]
+
+    executor_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    chunksize = max(1, len(paths) // (workers * 4))
+    with executor_class(max_workers=workers) as executor:
+        return list(executor.map(read_record_safe, paths, chunksize=chunksize))
+
+class CorpusIndex:
+    """Index SQLite cu metadatele articolelor, actualizat incremental după mtime/size."""
+
+    def __init__(self, db_path=None, workers=WORKERS, use_threads=False):
+        self.db_path = db_path or INDEX_DB
+        self.workers = workers
+        self.use_threads = use_threads
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+
+        # Indexul e doar o copie a metadatelor din fișiere: cu o schemă veche se reconstruiește
+        existing_columns = [row[1] for row in self.conn.execute('PRAGMA table_info(articole)')]
+        if existing_columns and existing_columns != COLUMNS:
+            self.conn.execute('DROP TABLE articole')
+
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS articole (
+                path TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                language TEXT NOT NULL,
+                item_id INTEGER,
+                item_id_comment TEXT,
+                item_id_variants INTEGER,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                flag_ro TEXT,
+                flag_en TEXT,
+                data TEXT,
+                data_iso TEXT,
+                categorie_link TEXT,
+                categorie_titlu TEXT,
+                canonical TEXT,
+                imagine TEXT
+            )""")
+        self.conn.execute('CREATE INDEX IF NOT EXISTS articole_folder ON articole (folder)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS articole_item_id ON articole (language, item_id)')
+        # Pentru select_articles(missing_in=...): perechea EN se caută după nume și după link-ul RO
+        self.conn.execute('CREATE INDEX IF NOT EXISTS articole_filename ON articole (filename)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS articole_flag_ro ON articole (flag_ro)')
+        self.conn.commit()
+        self.last_refresh_reads = 0
+
+    def refresh(self, folder, language):
+        """Sincronizează indexul cu folderul și întoarce înregistrările, sortate după nume.
+
+        Sunt recitite doar fișierele noi sau cele al căror mtime/size s-a schimbat.
+        Înregistrările conțin doar RECORD_FIELDS (nu și conținutul fișierelor),
+        așa că memoria folosită rămâne mică și la zeci de mii de articole.
+        """
+        folder = os.path.abspath(folder)
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in self.conn.execute(
+            'SELECT path, mtime_ns, size FROM articole WHERE folder = ?', (folder,))}
+
+        changed = []
+        seen = {}
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith('.html') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                seen[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                if known.get(entry.path) != seen[entry.path]:
+                    changed.append((entry.path, entry.name, stat))
+
+        shared = shared_records.get((self.db_path, folder))
+        if not changed and shared and shared[0] == seen:
+            self.last_refresh_reads = 0
+            return [dict(record) for record in shared[1]]
+
+        # Fișierele noi sau modificate sunt recitite în paralel
+        with run_report.measure('index'):
+            records = load_records([path for path, _, _ in changed], self.workers, self.use_threads)
+
+        reads = 0
+        failed = []
+        for (path, filename, stat), record in zip(changed, records):
+            if 'eroare' in record:
+                print(f"Eroare la citirea fișierului {filename}: {record['eroare']}")
+                failed.append(path)
+                continue
+            reads += 1
+            run_report.count_read(path, stat.st_size)
+            remember_encoding(path, stat, record.pop('encoding'))
+            record.update({
+                'path': path,
+                'folder': folder,
+                'filename': filename,
+                'language': language,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size
+            })
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO articole ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                [record[column] for column in COLUMNS])
+
+        removed = [path for path in known if path not in seen] + failed
+        self.conn.executemany('DELETE FROM articole WHERE path = ?', [(path,) for path in removed])
+        self.conn.commit()
+
+        self.last_refresh_reads = reads
+        records = [dict(zip(RECORD_FIELDS, values)) for values in self.conn.execute(
+            f"SELECT {', '.join(RECORD_FIELDS)} FROM articole WHERE folder = ? ORDER BY filename",
+            (folder,))]
+        for path in failed:
+            seen.pop(path)
+        shared_records[(self.db_path, folder)] = (seen, records)
+        return [dict(record) for record in records]
+
+    def select_articles(self, folder, filenames=None, missing_in=None, date_from=None, date_to=None,
+                        category=None, id_from=None, id_to=None):
+        """Articolele din `folder` (deja indexat cu refresh) care îndeplinesc toate condițiile date.
+
+        Fiecare fișier apare o singură dată, în ordinea ID-urilor (cele fără ID la final).
+        Cu missing_in=[foldere EN] rămân doar articolele fără pereche în acele foldere:
+        nicio pagină EN cu numele din FLAGS-ul paginii RO, cu link-ul RO spre ea sau
+        asociată ei în harta perechilor (id_map).
+        """
+        # Pagina principală (index.html) nu e un articol
+        conditions = ['a.folder = ?', "a.filename != 'index.html'"]
+        parameters = [os.path.abspath(folder)]
+        if filenames is not None:
+            conditions.append(f"a.filename IN ({', '.join('?' * len(filenames))})")
+            parameters.extend(filenames)
+        if date_from:
+            conditions.append('a.data_iso >= ?')
+            parameters.append(date_from)
+        if date_to:
+            conditions.append('a.data_iso <= ?')
+            parameters.append(date_to)
+        if category:
+            conditions.append("(a.categorie_titlu = ? COLLATE NOCASE OR a.categorie_link IN (?, ? || '.html'))")
+            parameters.extend([category, category, category])
+        if id_from is not None:
+            conditions.append('a.item_id >= ?')
+            parameters.append(id_from)
+        if id_to is not None:
+            conditions.append('a.item_id <= ?')
+            parameters.append(id_to)
+
+        if missing_in:
+            en_folders = [os.path.abspath(en_folder) for en_folder in missing_in]
+            in_en_folders = f"en.folder IN ({', '.join('?' * len(en_folders))})"
+            conditions.append(f'NOT EXISTS (SELECT 1 FROM articole en WHERE en.filename = a.flag_en AND {in_en_folders})')
+            conditions.append(f'NOT EXISTS (SELECT 1 FROM articole en WHERE en.flag_ro = a.filename AND {in_en_folders})')
+            parameters.extend(en_folders * 2)
+            has_pairs = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'perechi_ro_en'").fetchone()
+            if has_pairs:
+                conditions.append(
+                    'NOT EXISTS (SELECT 1 FROM perechi_ro_en p JOIN articole en ON en.path = p.en_path '
+                    f'WHERE p.ro_path = a.path AND {in_en_folders})')
+                parameters.extend(en_folders)
+
+        query = (f"SELECT {', '.join('a.' + field for field in RECORD_FIELDS)} FROM articole a "
+                 f"WHERE {' AND '.join(conditions)} ORDER BY a.item_id IS NULL, a.item_id, a.filename")
+        return [dict(zip(RECORD_FIELDS, values)) for values in self.conn.execute(query, parameters)]
+
+    def close(self):
+        self.conn.close()
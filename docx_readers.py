@@ -0,0 +1,130 @@
+"""Citirea documentului Word tradus în Pasul 2, paragraf cu paragraf.
+
+stream_paragraphs citește word/document.xml direct din arhiva .docx, cu iterparse:
+fiecare paragraf e eliberat după ce a fost citit, așa că memoria nu crește cu documentul.
+Rezultatul e același ca la python-docx (--python-docx): doar paragrafele de pe primul
+nivel al documentului (nu cele din tabele), textul cu link-uri, tab-uri și rânduri noi,
+alinierea și bold/italic citite direct din paragraf și din run-uri.
+"""
+import zipfile
+from collections import namedtuple
+from xml.etree import ElementTree
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from command_line import options
+
+DOCUMENT_PART = 'word/document.xml'
+RELATIONSHIPS_PART = '_rels/.rels'
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+BODY = W + 'body'
+PARAGRAPH = W + 'p'
+PARAGRAPH_PROPERTIES = W + 'pPr'
+JUSTIFICATION = W + 'jc'
+RUN = W + 'r'
+RUN_PROPERTIES = W + 'rPr'
+TEXT = W + 't'
+BOLD = W + 'b'
+ITALIC = W + 'i'
+HYPERLINK = W + 'hyperlink'
+BREAK = W + 'br'
+VAL = W + 'val'
+TYPE = W + 'type'
+
+# Textul elementelor dintr-un run, ca în python-docx (w:t își are textul propriu)
+RUN_CONTENT_TEXT = {
+    W + 'tab': '\t',
+    W + 'ptab': '\t',
+    W + 'cr': '\n',
+    W + 'noBreakHyphen': '-'
+}
+TRUE_VALUES = ('1', 'true', 'on')
+
+Paragraph = namedtuple('Paragraph', 'text centered runs')
+Run = namedtuple('Run', 'text bold italic')
+
+def python_docx_requested(argv=None):
+    """True dacă scriptul a fost pornit cu --python-docx (citirea veche, tot documentul în memorie)."""
+    return options(argv).python_docx
+
+def python_docx_paragraphs(path):
+    """Paragrafele documentului, citite cu python-docx."""
+    for para in Document(path).paragraphs:
+        runs = [Run(run.text, run.bold, run.italic) for run in para.runs]
+        yield Paragraph(para.text, para.alignment == WD_PARAGRAPH_ALIGNMENT.CENTER, runs)
+
+def main_document_part(archive):
+    """Calea părții principale din arhivă (aproape mereu word/document.xml)."""
+    try:
+        relationships = ElementTree.fromstring(archive.read(RELATIONSHIPS_PART))
+    except (KeyError, ElementTree.ParseError):
+        return DOCUMENT_PART
+    for relationship in relationships:
+        if relationship.get('Type') == OFFICE_DOCUMENT:
+            return relationship.get('Target', DOCUMENT_PART).lstrip('/')
+    return DOCUMENT_PART
+
+def on_off(element):
+    """Valoarea unui element w:b / w:i: None dacă lipsește, altfel True / False."""
+    if element is None:
+        return None
+    value = element.get(VAL)
+    return value is None or value in TRUE_VALUES
+
+def run_text(run):
+    parts = []
+    for child in run:
+        if child.tag == TEXT:
+            parts.append(child.text or '')
+        elif child.tag == BREAK:
+            # Doar rândul nou simplu devine \n; sfârșitul de pagină sau coloană nu are text
+            parts.append('\n' if child.get(TYPE, 'textWrapping') == 'textWrapping' else '')
+        else:
+            parts.append(RUN_CONTENT_TEXT.get(child.tag, ''))
+    return ''.join(parts)
+
+def read_paragraph(element):
+    properties = element.find(PARAGRAPH_PROPERTIES)
+    justification = properties.find(JUSTIFICATION) if properties is not None else None
+    centered = justification is not None and justification.get(VAL) == 'center'
+
+    runs = []
+    text = []
+    for child in element:
+        if child.tag == RUN:
+            run_properties = child.find(RUN_PROPERTIES)
+            if run_properties is None:
+                run = Run(run_text(child), None, None)
+            else:
+                run = Run(run_text(child), on_off(run_properties.find(BOLD)), on_off(run_properties.find(ITALIC)))
+            runs.append(run)
+            text.append(run.text)
+        elif child.tag == HYPERLINK:
+            # Textul link-urilor intră în textul paragrafului, dar nu și în run-uri (ca în python-docx)
+            text.extend(run_text(run) for run in child.findall(RUN))
+    return Paragraph(''.join(text), centered, runs)
+
+def stream_paragraphs(path):
+    """Paragrafele documentului, citite în flux din word/document.xml."""
+    with zipfile.ZipFile(path) as archive, archive.open(main_document_part(archive)) as xml:
+        depth = 0
+        body = None
+        for event, element in ElementTree.iterparse(xml, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2 and element.tag == BODY:
+                    body = element
+                continue
+
+            # Elementele de pe primul nivel al corpului (paragrafe, tabele) sunt eliberate după citire
+            if depth == 3 and body is not None:
+                if element.tag == PARAGRAPH:
+                    yield read_paragraph(element)
+                body.remove(element)
+            elif depth == 2:
+                body = None
+            depth -= 1
+
+def read_paragraphs(path, streaming=True):
+    return stream_paragraphs(path) if streaming else python_docx_paragraphs(path)
@@ -0,0 +1,272 @@
+"""Scrierea documentului Word din Pasul 1 (articolele de tradus).
+
+DocumentWriter folosește python-docx, care ține tot documentul în memorie.
+StreamingDocxWriter scrie word/document.xml direct în arhiva .docx, paragraf cu paragraf,
+așa că memoria rămâne aceeași oricâte articole sunt exportate. Ambele produc aceeași
+formatare (titlu roșu, bold, centrat; linia „ID:” mică și gri; run-uri bold/italic),
+iar Pasul 2 (extract_data_from_docx) citește la fel documentele lor.
+ChunkedDocxWriter împarte exportul în mai multe documente, fiecare sub limita de mărime
+a traducerii automate, tăiate doar între articole.
+"""
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+import docx
+from docx import Document
+from docx.shared import Pt, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from command_line import options, number_option
+
+# Template-ul python-docx: stilurile, setările și secțiunea paginii vin de aici
+TEMPLATE_DOCX = os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx')
+DOCUMENT_PART = 'word/document.xml'
+# Antetele zip64 și blocurile deflate ale lui word/document.xml, în plus față de template
+ZIP_ENTRY_SLACK = 1024
+
+TITLE_COLOR = RGBColor(255, 0, 0)
+ID_COLOR = RGBColor(128, 128, 128)  # Culoare gri
+ID_SIZE = Pt(8)  # Dimensiune mică pentru text
+
+# Caracterele de control nu sunt permise în XML (python-docx refuză textul care le conține)
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+# Ca în python-docx: tab -> <w:tab/>, \n și \r -> <w:br/>
+RUN_CONTENT_PATTERN = re.compile(r'[\t\r\n]|[^\t\r\n]+')
+
+def streaming_requested(argv=None):
+    """True dacă scriptul a fost pornit cu --stream-docx."""
+    return options(argv).stream_docx
+
+def chunk_budget_requested(argv=None):
+    """Limitele unui document din export: (--max-chars N, --max-bytes N), None unde nu sunt date."""
+    return tuple(number_option(option, "limita e ignorată", argv) for option in ('--max-chars', '--max-bytes'))
+
+def add_runs(paragraph, runs):
+    """Adaugă run-urile (text, bold, italic) în paragraful Word."""
+    for text, bold, italic in runs:
+        run = paragraph.add_run(text)
+        if italic is not None:
+            run.italic = italic
+        run.bold = bold
+
+class DocumentWriter:
+    """Documentul construit cu python-docx."""
+
+    def __init__(self, path, document=None):
+        self.path = path
+        self.document = document if document is not None else Document()
+
+    def add_title(self, title_text, item_id):
+        # Crează un paragraf pentru titlu
+        title_paragraph = self.document.add_paragraph()
+        title_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # Adaugă titlul cu formatare
+        run = title_paragraph.add_run(title_text)
+        run.bold = True
+        run.font.color.rgb = TITLE_COLOR
+
+        # Adaugă ID-ul articolului doar sub titlu
+        id_paragraph = self.document.add_paragraph()
+        id_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        id_run = id_paragraph.add_run(f"ID: {item_id}")
+        id_run.font.color.rgb = ID_COLOR
+        id_run.font.size = ID_SIZE
+
+    def add_paragraph(self, runs=(), text=None):
+        """Un paragraf din run-uri (text, bold, italic) sau, cu text=..., un paragraf simplu."""
+        add_runs(self.document.add_paragraph(text), runs)
+
+    def close(self):
+        self.document.save(self.path)
+
+def run_xml(text, bold=None, italic=None, color=None, size=None):
+    """XML-ul unui run <w:r>, cu proprietățile în ordinea din schema OOXML."""
+    properties = ''
+    if bold is not None:
+        properties += '<w:b/>' if bold else '<w:b w:val="0"/>'
+    if italic is not None:
+        properties += '<w:i/>' if italic else '<w:i w:val="0"/>'
+    if color is not None:
+        properties += f'<w:color w:val="{color}"/>'
+    if size is not None:
+        properties += f'<w:sz w:val="{size}"/>'
+
+    content = ''
+    for piece in RUN_CONTENT_PATTERN.findall(INVALID_XML_CHARS.sub('', text)):
+        if piece == '\t':
+            content += '<w:tab/>'
+        elif piece in ('\r', '\n'):
+            content += '<w:br/>'
+        else:
+            space = ' xml:space="preserve"' if piece != piece.strip() else ''
+            content += f'<w:t{space}>{escape(piece)}</w:t>'
+
+    if properties:
+        properties = f'<w:rPr>{properties}</w:rPr>'
+    if not properties and not content:
+        return '<w:r/>'
+    return f'<w:r>{properties}{content}</w:r>'
+
+def title_xml(title_text, item_id):
+    """Paragraful titlului și paragraful „ID:” de sub el."""
+    center = '<w:pPr><w:jc w:val="center"/></w:pPr>'
+    return (f'<w:p>{center}{run_xml(title_text, bold=True, color=str(TITLE_COLOR))}</w:p>'
+            f'<w:p>{center}{run_xml(f"ID: {item_id}", color=str(ID_COLOR), size=int(ID_SIZE.pt * 2))}</w:p>')
+
+def paragraph_xml(runs=(), text=None):
+    """Un paragraf din run-uri (text, bold, italic) sau un paragraf simplu cu `text`."""
+    content = run_xml(text) if text else ''
+    content += ''.join(run_xml(run_text, bold, italic) for run_text, bold, italic in runs)
+    return f'<w:p>{content}</w:p>' if content else '<w:p/>'
+
+class StreamingDocxWriter:
+    """Documentul scris direct în arhivă: fiecare paragraf ajunge în zip imediat ce e adăugat.
+
+    Celelalte părți (stiluri, setări, proprietăți) sunt copiate din template-ul python-docx.
+    Documentul e scris într-un fișier temporar și mutat peste cel vechi abia la close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.temp_path = f'{path}.{os.getpid()}.tmp'
+        self.archive = zipfile.ZipFile(self.temp_path, 'w', zipfile.ZIP_DEFLATED)
+        with zipfile.ZipFile(TEMPLATE_DOCX) as template:
+            for item in template.infolist():
+                if item.filename != DOCUMENT_PART:
+                    self.archive.writestr(item, template.read(item.filename))
+            document_xml = template.read(DOCUMENT_PART).decode('utf-8')
+
+        # Paragrafele se scriu între <w:body> și secțiunea paginii (<w:sectPr>) din template
+        body_start = document_xml.index('<w:body>') + len('<w:body>')
+        section_start = document_xml.index('<w:sectPr', body_start)
+        self.closing = re.sub(r'>\s+<', '><', document_xml[section_start:]).rstrip()
+        self.stream = self.archive.open(DOCUMENT_PART, 'w', force_zip64=True)
+        self.stream.write(document_xml[:body_start].encode('utf-8'))
+
+    def write(self, xml):
+        self.stream.write(xml.encode('utf-8'))
+
+    def add_title(self, title_text, item_id):
+        self.write(title_xml(title_text, item_id))
+
+    def add_paragraph(self, runs=(), text=None):
+        """Un paragraf din run-uri (text, bold, italic) sau, cu text=..., un paragraf simplu."""
+        self.write(paragraph_xml(runs, text))
+
+    def close(self):
+        try:
+            self.write(self.closing)
+            self.stream.close()
+            self.archive.close()
+            os.replace(self.temp_path, self.path)
+        except BaseException:
+            self.archive.close()
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+            raise
+
+def write_document(path, operations, stream=False):
+    """Scrie un document din operațiile înregistrate de ChunkedDocxWriter (rulează și în procesele din pool)."""
+    writer = StreamingDocxWriter(path) if stream else DocumentWriter(path)
+    for method, args in operations:
+        getattr(writer, method)(*args)
+    writer.close()
+    return path
+
+class ChunkedDocxWriter:
+    """Exportul împărțit în mai multe documente: nume-01.docx, nume-02.docx, ...
+
+    Fiecare document rămâne sub max_chars caractere de text și sub max_bytes octeți ca fișier
+    .docx: celelalte părți sunt socotite cu mărimea lor din arhiva template-ului, iar
+    word/document.xml necomprimat, așa că fișierul scris iese cel mult atât (de obicei mult mai mic).
+    Un document nou începe doar la un titlu, așa că articolele nu sunt tăiate, iar Pasul 2
+    găsește titlul și ID-ul fiecăruia. Un articol mai mare decât limita ocupă singur un document.
+    Documentele complete sunt scrise în paralel (workers procese) cât timp exportul continuă.
+    """
+
+    def __init__(self, path, max_chars=None, max_bytes=None, stream=False, workers=1):
+        self.base, self.extension = os.path.splitext(path)
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self.stream = stream
+        self.executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self.futures = []
+        self.paths = []
+        self.oversized = []
+        # Articolul curent și documentul curent: operațiile (metodă, argumente) și mărimea lor
+        self.article = []
+        self.article_size = [0, 0]
+        self.chunk = []
+        self.chunk_size = [0, 0]
+        # Partea fixă a fiecărui document: arhiva template-ului (stiluri, setări, temă, ...),
+        # cu word/document.xml socotit necomprimat (începutul documentului și secțiunea paginii)
+        with zipfile.ZipFile(TEMPLATE_DOCX) as template:
+            document_part = template.getinfo(DOCUMENT_PART)
+            self.fixed_bytes = (os.path.getsize(TEMPLATE_DOCX) - document_part.compress_size
+                                + document_part.file_size + ZIP_ENTRY_SLACK)
+
+        # Documentele rămase de la o rulare anterioară cu mai multe părți
+        part_pattern = re.compile(re.escape(os.path.basename(self.base)) + r'-\d{2,}' + re.escape(self.extension) + '$')
+        folder = os.path.dirname(path) or '.'
+        for name in os.listdir(folder):
+            if part_pattern.match(name):
+                os.remove(os.path.join(folder, name))
+
+    def record(self, method, args, chars, xml):
+        self.article.append((method, args))
+        self.article_size[0] += chars
+        self.article_size[1] += len(xml.encode('utf-8'))
+
+    def add_title(self, title_text, item_id):
+        self.end_article()
+        self.record('add_title', (title_text, item_id), len(title_text) + len(f"ID: {item_id}"),
+                    title_xml(title_text, item_id))
+
+    def add_paragraph(self, runs=(), text=None):
+        chars = len(text or '') + sum(len(run_text) for run_text, _, _ in runs)
+        self.record('add_paragraph', (runs, text), chars, paragraph_xml(runs, text))
+
+    def over_budget(self, chars, xml_bytes):
+        return ((self.max_chars is not None and chars > self.max_chars)
+                or (self.max_bytes is not None and self.fixed_bytes + xml_bytes > self.max_bytes))
+
+    def end_article(self):
+        """Mută articolul curent în document; dacă nu mai încape, documentul curent e scris."""
+        if not self.article:
+            return
+        if self.chunk and self.over_budget(self.chunk_size[0] + self.article_size[0],
+                                           self.chunk_size[1] + self.article_size[1]):
+            self.flush_chunk()
+        if self.over_budget(*self.article_size):
+            title = next((args[0] for method, args in self.article if method == 'add_title'), '?')
+            self.oversized.append(title)
+        self.chunk.extend(self.article)
+        self.chunk_size = [self.chunk_size[0] + self.article_size[0], self.chunk_size[1] + self.article_size[1]]
+        self.article = []
+        self.article_size = [0, 0]
+
+    def flush_chunk(self):
+        if not self.chunk:
+            return
+        path = f'{self.base}-{len(self.paths) + 1:02d}{self.extension}'
+        self.paths.append(path)
+        if self.executor:
+            self.futures.append(self.executor.submit(write_document, path, self.chunk, self.stream))
+        else:
+            write_document(path, self.chunk, self.stream)
+        self.chunk = []
+        self.chunk_size = [0, 0]
+
+    def close(self):
+        """Scrie ultimul document, așteaptă documentele din pool și întoarce căile tuturor."""
+        try:
+            self.end_article()
+            self.flush_chunk()
+            for future in self.futures:
+                future.result()
+        finally:
+            if self.executor:
+                self.executor.shutdown()
+        return self.paths
@@ -0,0 +1,138 @@
+import re
+from run_report import timed
+
+# Markerii-comentariu folosiți în paginile site-ului
+SECTION_MARKERS = {
+    'FLAGS_1', 'FLAGS',
+    'ARTICOL START', 'ARTICOL FINAL',
+    'SASA-1', 'SASA-2',
+    'ARTICOL CATEGORIE START', 'ARTICOL CATEGORIE FINAL'
+}
+
+# Secțiunile delimitate de perechi de markeri
+SECTIONS = {
+    'flags': ('FLAGS_1', 'FLAGS'),
+    'articol': ('ARTICOL START', 'ARTICOL FINAL'),
+    'sasa': ('SASA-1', 'SASA-2'),
+    'categorie': ('ARTICOL CATEGORIE START', 'ARTICOL CATEGORIE FINAL')
+}
+
+# O singură expresie pentru tot ce ne interesează: comentarii, text_dreapta și link-ul canonical
+SCAN_PATTERN = re.compile(
+    r'<(?:!--(?P<comment>.*?)-->'
+    r'|td class="text_dreapta">'
+    r'|link rel="canonical" href="(?P<canonical>[^"]*)")',
+    re.DOTALL
+)
+
+# Formatele acceptate pentru comentariul cu ID, în ordinea priorității
+ID_COMMENT_PATTERNS = [
+    re.compile(r'\s*\$item_id\s*=\s*(\d+);'),
+    re.compile(r' item_id = (\d+); $'),
+    re.compile(r' id: (\d+) $')
+]
+
+# Comentariul `$item_id = N;` căutat direct, fără ceilalți markeri (vezi find_item_id)
+ITEM_ID_PATTERN = re.compile(r'<!--' + ID_COMMENT_PATTERNS[0].pattern + r'.*?-->', re.DOTALL)
+
+# Forma standard a comentariului cu ID, scrisă de scripturile Incrementare
+ITEM_ID_COMMENT = '<!-- $item_id = {}; // Replace that with your rating id -->'
+
+class Markers:
+    """Pozițiile markerilor cunoscuți dintr-o pagină, găsite într-o singură trecere."""
+
+    def __init__(self):
+        self.comments = {}
+        self.item_id = None
+        self.item_id_span = None
+        # Textele diferite ale comentariilor `$item_id = N;` (Incrementare le rescrie pe toate)
+        self.item_id_comments = set()
+        self.text_dreapta = None
+        self.canonical = None
+        self.canonical_span = None
+
+    def first(self, name):
+        """(start, end) pentru prima apariție a markerului sau None."""
+        spans = self.comments.get(name)
+        return spans[0] if spans else None
+
+    def section(self, name, outer=False):
+        """(start, end) pentru conținutul dintre markerii secțiunii.
+
+        Ca la regex-ul non-greedy vechi, se ia primul marker de început și primul
+        marker de final de după el. Cu outer=True sunt incluși și markerii.
+        """
+        start_name, end_name = SECTIONS[name]
+        start = self.first(start_name)
+        if not start:
+            return None
+
+        for end in self.comments.get(end_name, []):
+            if end[0] >= start[1]:
+                return (start[0], end[1]) if outer else (start[1], end[0])
+        return None
+
+@timed('parse')
+def scan_markers(content):
+    """Parcurge documentul o singură dată și întoarce pozițiile tuturor markerilor."""
+    markers = Markers()
+    id_candidates = [None] * len(ID_COMMENT_PATTERNS)
+
+    for match in SCAN_PATTERN.finditer(content):
+        comment = match.group('comment')
+        if comment is not None:
+            name = comment.strip()
+            if name in SECTION_MARKERS:
+                markers.comments.setdefault(name, []).append(match.span())
+                continue
+            for priority, pattern in enumerate(ID_COMMENT_PATTERNS):
+                id_match = pattern.match(comment)
+                if id_match:
+                    if priority == 0:
+                        markers.item_id_comments.add(comment)
+                    if id_candidates[priority] is None:
+                        id_candidates[priority] = (id_match.group(1), match.span())
+                    break
+        elif match.group('canonical') is not None:
+            if markers.canonical is None:
+                markers.canonical = match.group('canonical')
+                markers.canonical_span = match.span()
+        elif markers.text_dreapta is None:
+            markers.text_dreapta = match.end()
+
+    for candidate in id_candidates:
+        if candidate:
+            markers.item_id, markers.item_id_span = candidate
+            break
+
+    return markers
+
+@timed('parse')
+def find_item_id(content):
+    """(ID, (start, end)) pentru primul comentariu `$item_id = N;` sau None.
+
+    Același rezultat ca scan_markers pentru formatul principal, dar căutarea se oprește
+    la primul comentariu găsit (de regulă pe primul rând al paginii).
+    """
+    match = ITEM_ID_PATTERN.search(content)
+    if match:
+        return match.group(1), match.span()
+    return None
+
+def item_id_comment(item_id):
+    """Comentariul standard cu ID pentru o pagină."""
+    return ITEM_ID_COMMENT.format(item_id)
+
+def section_text(content, markers, name, outer=False):
+    """Textul unei secțiuni (sau None dacă markerii lipsesc)."""
+    span = markers.section(name, outer)
+    return content[span[0]:span[1]] if span else None
+
+def text_dreapta_span(content, markers):
+    """(start, end) pentru conținutul primei celule <td class="text_dreapta">."""
+    if markers.text_dreapta is None:
+        return None
+    end = content.find('</td>', markers.text_dreapta)
+    if end == -1:
+        return None
+    return markers.text_dreapta, end
@@ -0,0 +1,150 @@
+"""Harta perechilor RO <-> EN: fișierul RO, fișierul EN și ID-ul fiecăruia.
+
+Pasul 2 copiază ID-ul RO în paginile EN, dar Incrementare renumerotează apoi EN de la
+5000, iar legătura după ID se pierde. Harta ține perechile după cale, așa că rămân
+valabile după renumerotare; ID-urile din ea sunt actualizate de scripturile Incrementare.
+Perechile noi se găsesc o singură dată, din înregistrările indexului corpusului.
+"""
+import os
+import sqlite3
+
+# Harta stă în același fișier SQLite ca indexul corpusului
+MAP_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_index.sqlite')
+
+# Nota pusă de Pasul 2 în comentariul $item_id: ID-ul paginii EN este încă cel RO
+RO_ID_NOTE = 'ID-ul din fisierul limba romana'
+
+def base_name(path):
+    """Numele fișierului fără folder și fără .html."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+class IdMap:
+    """Perechile RO <-> EN, încărcate în memorie: căutarea unei perechi e un acces în dicționar."""
+
+    def __init__(self, db_path=None, read_only=False):
+        self.db_path = db_path or MAP_DB
+        # read_only (ex. la --dry-run): harta e folosită, dar nu e salvată
+        self.read_only = read_only
+        self.pairs = {}
+        self.changed = {}
+        self.removed = set()
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS perechi_ro_en (
+                    en_path TEXT PRIMARY KEY,
+                    en_id INTEGER,
+                    ro_path TEXT NOT NULL,
+                    ro_id INTEGER
+                )""")
+            # Căutarea perechilor unei pagini RO (CorpusIndex.select_articles)
+            conn.execute('CREATE INDEX IF NOT EXISTS perechi_ro_path ON perechi_ro_en (ro_path)')
+            conn.commit()
+            for en_path, en_id, ro_path, ro_id in conn.execute('SELECT * FROM perechi_ro_en'):
+                self.pairs[en_path] = {'en_path': en_path, 'en_id': en_id, 'ro_path': ro_path, 'ro_id': ro_id}
+        finally:
+            conn.close()
+        self.by_ro_path = {}
+        self.reindex()
+
+    def reindex(self):
+        self.by_ro_path = {}
+        for pair in self.pairs.values():
+            self.by_ro_path.setdefault(pair['ro_path'], []).append(pair)
+
+    def set_pair(self, en_path, en_id, ro_path, ro_id):
+        pair = {'en_path': en_path, 'en_id': en_id, 'ro_path': ro_path, 'ro_id': ro_id}
+        if self.pairs.get(en_path) != pair:
+            self.pairs[en_path] = pair
+            self.changed[en_path] = pair
+            self.removed.discard(en_path)
+
+    def update(self, ro_rows, en_rows):
+        """Aduce harta la zi cu înregistrările din index (o singură trecere, fără citiri).
+
+        Pentru o pagină EN, perechea RO se caută, în ordine: după ID-ul RO pus de Pasul 2,
+        după perechea deja memorată, după link-ul RO din FLAGS, după numele fișierului
+        și, la final, după ID (formatele vechi de comentariu).
+        Întoarce numărul de pagini EN pentru care nu s-a găsit nicio pereche.
+        """
+        ro_by_path = {row['path']: row for row in ro_rows}
+        ro_by_id = {}
+        ro_by_name = {}
+        for row in ro_rows:
+            if row['item_id'] is not None:
+                ro_by_id.setdefault(row['item_id'], row)
+            ro_by_name[base_name(row['filename'])] = row
+
+        unmatched = 0
+        for en_row in en_rows:
+            en_id = en_row['item_id']
+            known = self.pairs.get(en_row['path'])
+            ro_row = None
+            if en_id is not None and RO_ID_NOTE in (en_row['item_id_comment'] or ''):
+                ro_row = ro_by_id.get(en_id)
+            if ro_row is None and known:
+                ro_row = ro_by_path.get(known['ro_path'])
+            if ro_row is None and en_row['flag_ro']:
+                ro_row = ro_by_name.get(base_name(en_row['flag_ro']))
+            if ro_row is None:
+                ro_row = ro_by_name.get(base_name(en_row['filename']))
+            if ro_row is None and en_id is not None:
+                ro_row = ro_by_id.get(en_id)
+
+            if ro_row is None:
+                unmatched += 1
+                continue
+            self.set_pair(en_row['path'], en_id, ro_row['path'], ro_row['item_id'])
+
+        # Perechile cu un fișier dispărut din folderele actualizate
+        ro_folders = {os.path.dirname(path) for path in ro_by_path}
+        en_paths = {row['path'] for row in en_rows}
+        en_folders = {os.path.dirname(path) for path in en_paths}
+        for en_path, pair in list(self.pairs.items()):
+            if ((os.path.dirname(pair['ro_path']) in ro_folders and pair['ro_path'] not in ro_by_path)
+                    or (os.path.dirname(en_path) in en_folders and en_path not in en_paths)):
+                del self.pairs[en_path]
+                self.changed.pop(en_path, None)
+                self.removed.add(en_path)
+
+        self.reindex()
+        return unmatched
+
+    def ro_for_en(self, en_path):
+        """Perechea unei pagini EN ({en_path, en_id, ro_path, ro_id}) sau None."""
+        return self.pairs.get(os.path.abspath(en_path))
+
+    def en_for_ro(self, ro_path):
+        """Perechile EN ale unei pagini RO (de ex. pagina din output și cea din en)."""
+        return self.by_ro_path.get(os.path.abspath(ro_path), [])
+
+    def update_ids(self, language, new_ids):
+        """După o renumerotare ({path: ID nou}): ID-urile din perechile fișierelor date."""
+        for pair in list(self.pairs.values()):
+            path = pair['ro_path'] if language == 'ro' else pair['en_path']
+            if path not in new_ids:
+                continue
+            if language == 'ro':
+                self.set_pair(pair['en_path'], pair['en_id'], pair['ro_path'], new_ids[path])
+            else:
+                self.set_pair(pair['en_path'], new_ids[path], pair['ro_path'], pair['ro_id'])
+        self.reindex()
+
+    def save(self):
+        """Scrie modificările într-o singură tranzacție."""
+        if self.read_only or not (self.changed or self.removed):
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany('DELETE FROM perechi_ro_en WHERE en_path = ?',
+                                 [(path,) for path in self.removed])
+                conn.executemany(
+                    'INSERT OR REPLACE INTO perechi_ro_en VALUES (?, ?, ?, ?)',
+                    [(pair['en_path'], pair['en_id'], pair['ro_path'], pair['ro_id'])
+                     for pair in self.changed.values()])
+        finally:
+            conn.close()
+        self.changed = {}
+        self.removed = set()
@@ -0,0 +1,104 @@
+import os
+import json
+import hashlib
+from run_report import run_report
+from command_line import options
+
+# Manifestele etapelor (câte un fișier JSON pentru fiecare Pasul)
+MANIFEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.manifeste')
+
+def incremental_requested(argv=None):
+    """True dacă scriptul a fost pornit cu --incremental."""
+    return options(argv).incremental
+
+def text_hash(*values):
+    """Hash pentru intrări care nu sunt fișiere (ex. textul unui articol din docx)."""
+    digest = hashlib.sha1()
+    for value in values:
+        digest.update(repr(value).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class StageManifest:
+    """Manifestul unei etape: pentru fiecare unitate procesată ține hash-urile
+    intrărilor și ieșirile produse, ca rularea următoare să sară peste ce nu s-a schimbat.
+    """
+
+    def __init__(self, stage, enabled=True, manifest_dir=None, read_only=False):
+        self.path = os.path.join(manifest_dir or MANIFEST_DIR, f'{stage}.json')
+        self.enabled = enabled
+        # read_only (ex. la --dry-run): manifestul e folosit, dar nu e salvat
+        self.read_only = read_only
+        self.units = {}
+        self.hashes = {}
+        self.skipped = 0
+
+        if enabled and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.units = data.get('units', {})
+                self.hashes = data.get('hashes', {})
+            except (OSError, ValueError) as e:
+                print(f"Manifest ignorat ({self.path}): {e}")
+
+    def file_hash(self, path):
+        """Hash-ul conținutului; fișierul e recitit doar dacă mtime/size s-au schimbat."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        cached = self.hashes.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        run_report.count_read(path, len(data))
+        digest = hashlib.sha1(data).hexdigest()
+        self.hashes[path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def is_current(self, key, input_paths=None, extra=None):
+        """True dacă unitatea a fost deja procesată cu exact aceleași intrări.
+
+        Fără input_paths se verifică intrările memorate la ultima procesare
+        (util când lista intrărilor se află abia după citirea fișierului).
+        """
+        if not self.enabled:
+            return False
+
+        entry = self.units.get(key)
+        if not entry or entry.get('extra') != extra:
+            return False
+        if input_paths is not None and sorted(entry['inputs']) != sorted(input_paths):
+            return False
+        if any(self.file_hash(path) != digest for path, digest in entry['inputs'].items()):
+            return False
+        if not all(os.path.exists(path) for path in entry['outputs']):
+            return False
+
+        self.skipped += 1
+        return True
+
+    def record(self, key, input_paths, outputs=(), extra=None):
+        """Memorează starea intrărilor după procesarea unității."""
+        if not self.enabled:
+            return
+
+        self.units[key] = {
+            'inputs': {path: self.file_hash(path) for path in input_paths},
+            'outputs': list(outputs),
+            'extra': extra
+        }
+
+    def save(self):
+        if not self.enabled or self.read_only:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'units': self.units, 'hashes': self.hashes}, f)
+        os.replace(temp_path, self.path)
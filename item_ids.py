@@ -0,0 +1,282 @@
+"""Alocarea ID-urilor ($item_id) pentru scripturile Incrementare.
+
+Numerotarea clasică renumerotează tot corpusul alfabetic, așa că un articol nou mută ID-ul
+tuturor fișierelor de după el. Cu --stable-ids ID-urile valide (unice și în intervalul
+limbii) rămân neschimbate și doar fișierele fără ID, cu ID duplicat sau în afara
+intervalului primesc ID-uri noi.
+
+ID-urile date sunt ținute într-un registru (IdLedger), în locul fișierului
+"4---am ajuns la N". Starea registrului: python item_ids.py
+"""
+import os
+import re
+import sqlite3
+import contextlib
+from html_markers import scan_markers, find_item_id, item_id_comment
+from text_io import read_text, read_head
+from command_line import options
+
+# Registrul stă în același fișier SQLite ca indexul corpusului
+LEDGER_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_index.sqlite')
+
+# Comentariile rescrise de write_item_id: toate cele `$item_id = N;` din pagină, ca în
+# numerotarea clasică (formatele vechi `item_id = N;` / `id: N` rămân neatinse)
+ITEM_ID_REWRITE_PATTERN = re.compile(r'<!-- \s*\$item_id\s*=\s*\d+;.*?-->')
+
+# Cât așteaptă un proces după altul care alocă ID-uri în același timp (secunde)
+LOCK_TIMEOUT = 60
+
+def stable_ids_requested(argv=None):
+    """True dacă scriptul a fost pornit cu --stable-ids."""
+    return options(argv).stable_ids
+
+def sort_rows(rows):
+    """Ordinea în care se numerotează fișierele: alfabetic, fără diferență între litere mari și mici."""
+    return sorted(rows, key=lambda row: row['filename'].lower())
+
+def classify_ids(rows, start_id, max_id):
+    """Împarte fișierele în cele care își păstrează ID-ul și cele care au nevoie de unul nou.
+
+    Întoarce ({id: row} pentru ID-urile păstrate, [(row, motiv)] pentru restul, alfabetic).
+    Un ID nou e necesar pentru fișierele fără ID, cu ID duplicat sau în afara intervalului.
+    La un ID duplicat îl păstrează fișierul cel mai vechi (articolul nou e de obicei o copie).
+    """
+    rows = sort_rows(rows)
+    owners = {}
+    for row in rows:
+        item_id = row['item_id']
+        if item_id is not None and start_id <= item_id <= max_id:
+            owner = owners.get(item_id)
+            if owner is None or row['mtime_ns'] < owner['mtime_ns']:
+                owners[item_id] = row
+
+    needs_id = []
+    for row in rows:
+        item_id = row['item_id']
+        if item_id is None:
+            needs_id.append((row, 'fără ID'))
+        elif not start_id <= item_id <= max_id:
+            needs_id.append((row, f'în afara intervalului {start_id}-{max_id}'))
+        elif owners[item_id] is not row:
+            needs_id.append((row, 'ID duplicat'))
+
+    return owners, needs_id
+
+class IdLedger:
+    """Registrul ID-urilor unei limbi: ID-urile alocate, golurile libere și cel mai mare ID dat.
+
+    ID-urile noi continuă după cel mai mare ID dat (high_water); abia când intervalul se
+    termină sunt refolosite golurile. Ambele căutări sunt directe, fără scanarea corpusului.
+    Modificările se fac în transaction(), pornită cu BEGIN IMMEDIATE: două procese care
+    alocă în același timp sunt serializate de SQLite și nu pot primi același ID.
+    """
+
+    def __init__(self, language, start_id, max_id, db_path=None, read_only=False):
+        self.language = language
+        self.start_id = start_id
+        self.max_id = max_id
+        # read_only (ex. la --dry-run): alocările se calculează, dar tranzacția e anulată
+        self.read_only = read_only
+        self.high_water = start_id - 1
+        self.conn = sqlite3.connect(db_path or LEDGER_DB, timeout=LOCK_TIMEOUT, isolation_level=None)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS registru_id (
+                language TEXT PRIMARY KEY,
+                start_id INTEGER NOT NULL,
+                max_id INTEGER NOT NULL,
+                high_water INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS id_alocate (
+                language TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                PRIMARY KEY (language, item_id)
+            );
+            CREATE TABLE IF NOT EXISTS id_libere (
+                language TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                PRIMARY KEY (language, item_id)
+            );""")
+
+    @contextlib.contextmanager
+    def transaction(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            state = self.conn.execute(
+                'SELECT high_water FROM registru_id WHERE language = ?', (self.language,)).fetchone()
+            self.high_water = state[0] if state else self.start_id - 1
+            yield self
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        if self.read_only:
+            self.conn.execute('ROLLBACK')
+            return
+        self.conn.execute(
+            'INSERT OR REPLACE INTO registru_id VALUES (?, ?, ?, ?)',
+            (self.language, self.start_id, self.max_id, self.high_water))
+        self.conn.execute('COMMIT')
+
+    def record(self, item_id, path):
+        """Marchează un ID ca folosit de fișierul dat."""
+        self.conn.execute('INSERT OR REPLACE INTO id_alocate VALUES (?, ?, ?)', (self.language, item_id, path))
+        self.conn.execute('DELETE FROM id_libere WHERE language = ? AND item_id = ?', (self.language, item_id))
+        if item_id > self.high_water:
+            # Tot ce e între vechiul high_water și noul ID rămâne liber
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO id_libere VALUES (?, ?)',
+                [(self.language, free_id) for free_id in range(self.high_water + 1, item_id)])
+            self.high_water = item_id
+
+    def release(self, item_id):
+        """Eliberează un ID (ex. fișierul lui a fost șters)."""
+        self.conn.execute('DELETE FROM id_alocate WHERE language = ? AND item_id = ?', (self.language, item_id))
+        if item_id <= self.high_water:
+            self.conn.execute('INSERT OR IGNORE INTO id_libere VALUES (?, ?)', (self.language, item_id))
+
+    def next_free(self):
+        """Următorul ID care ar fi alocat (sau None dacă intervalul e plin)."""
+        if self.high_water < self.max_id:
+            return max(self.high_water + 1, self.start_id)
+        row = self.conn.execute(
+            'SELECT MIN(item_id) FROM id_libere WHERE language = ? AND item_id BETWEEN ? AND ?',
+            (self.language, self.start_id, self.max_id)).fetchone()
+        return row[0]
+
+    def allocate(self, path):
+        """Alocă următorul ID liber pentru fișierul dat; None dacă intervalul e plin."""
+        item_id = self.next_free()
+        if item_id is not None:
+            self.record(item_id, path)
+        return item_id
+
+    def sync(self, owners):
+        """Aduce registrul la zi cu ID-urile păstrate în corpus ({id: path}).
+
+        Un ID alocat rămâne alocat cât timp fișierul lui există (și dacă alt proces nu a
+        scris încă noul ID în el); sunt eliberate doar ID-urile fișierelor șterse.
+        """
+        allocated = dict(self.conn.execute(
+            'SELECT item_id, path FROM id_alocate WHERE language = ?', (self.language,)))
+        for item_id in sorted(owners):
+            if allocated.get(item_id) != owners[item_id]:
+                self.record(item_id, owners[item_id])
+        for item_id, path in allocated.items():
+            if item_id not in owners and not os.path.exists(path):
+                self.release(item_id)
+
+    def reset(self, assignment):
+        """Rescrie registrul după o renumerotare completă ({id: path})."""
+        self.conn.execute('DELETE FROM id_alocate WHERE language = ?', (self.language,))
+        self.conn.execute('DELETE FROM id_libere WHERE language = ?', (self.language,))
+        self.high_water = self.start_id - 1
+        for item_id in sorted(assignment):
+            self.record(item_id, assignment[item_id])
+
+    def counts(self):
+        """(ID-uri alocate, goluri libere)."""
+        allocated = self.conn.execute(
+            'SELECT COUNT(*) FROM id_alocate WHERE language = ?', (self.language,)).fetchone()[0]
+        free = self.conn.execute(
+            'SELECT COUNT(*) FROM id_libere WHERE language = ?', (self.language,)).fetchone()[0]
+        return allocated, free
+
+    def close(self):
+        self.conn.close()
+
+def read_id_comment(path):
+    """(ID, textul comentariului) pentru un fișier sau (None, None), citind de regulă doar începutul lui.
+
+    Fișierul e citit în întregime doar dacă începutul (text_io.HEAD_BYTES) nu conține un
+    comentariu `$item_id = N;`: ID-ul lipsește sau e într-unul dintre formatele vechi,
+    care au prioritate mai mică și ar putea fi înlocuite de unul aflat mai jos în pagină.
+    """
+    content, complete = read_head(path)
+    found = find_item_id(content)
+    if found is None:
+        if not complete:
+            content = read_text(path)
+        markers = scan_markers(content)
+        if markers.item_id is None:
+            return None, None
+        found = markers.item_id, markers.item_id_span
+
+    item_id, (id_start, id_end) = found
+    return int(item_id), content[id_start:id_end]
+
+def id_comments_current(path, new_id):
+    """True dacă toate comentariile `$item_id = N;` din fișier sunt deja cel cu new_id.
+
+    Pentru scripturile Incrementare care nu folosesc indexul. Când primul comentariu diferă
+    ajunge începutul fișierului (pagina e rescrisă oricum); altfel fișierul e citit tot, ca
+    un duplicat mai jos în pagină, cu un ID vechi, să nu rămână nerescris.
+    """
+    new_comment = item_id_comment(new_id)
+    content, complete = read_head(path)
+    found = find_item_id(content)
+    if found is None:
+        return False
+    id_start, id_end = found[1]
+    if content[id_start:id_end] != new_comment:
+        return False
+    if not complete:
+        content = read_text(path)
+    return set(ITEM_ID_REWRITE_PATTERN.findall(content)) == {new_comment}
+
+def write_item_id(row, new_id, batch, insert_missing=False):
+    """Scrie (prin batch) comentariul cu noul ID; întoarce True dacă fișierul se schimbă.
+
+    Ca în numerotarea clasică, sunt înlocuite toate comentariile `$item_id = N;` din pagină,
+    iar o pagină fără ele rămâne neschimbată. Cu insert_missing=True (--stable-ids) o astfel
+    de pagină primește totuși ID-ul nou: în locul comentariului în format vechi
+    (`item_id = N;` / `id: N`) sau, dacă nu are niciunul, pe primul rând, ca în template-uri.
+    Fișierul e citit doar dacă, după index, nu toate comentariile `$item_id` sunt deja cel nou.
+    """
+    new_comment = item_id_comment(new_id)
+    if row['item_id_comment'] == new_comment and row['item_id_variants'] == 1:
+        return False
+    if row['item_id_comment'] is None and not insert_missing:
+        return False
+
+    content = read_text(row['path'])
+    content, replaced = ITEM_ID_REWRITE_PATTERN.subn(new_comment, content)
+    if not replaced:
+        if not insert_missing:
+            return False
+        markers = scan_markers(content)
+        if markers.item_id_span:
+            id_start, id_end = markers.item_id_span
+            content = content[:id_start] + new_comment + content[id_end:]
+        else:
+            bom = '\ufeff' if content.startswith('\ufeff') else ''
+            content = f"{bom}    {new_comment}\n\n{content[len(bom):]}"
+
+    batch.write(row['path'], content)
+    return True
+
+def main():
+    """Afișează starea registrului pentru fiecare limbă."""
+    try:
+        conn = sqlite3.connect(f'file:{LEDGER_DB}?mode=ro', uri=True)
+        try:
+            languages = conn.execute('SELECT language, start_id, max_id FROM registru_id ORDER BY start_id').fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        languages = []
+
+    if not languages:
+        print("Registrul ID-urilor nu a fost creat încă (se creează la prima rulare Incrementare).")
+        return
+
+    for language, start_id, max_id in languages:
+        ledger = IdLedger(language, start_id, max_id, read_only=True)
+        with ledger.transaction():
+            allocated, free = ledger.counts()
+            print(f"{language.upper()} ({start_id}-{max_id}): am ajuns la {ledger.high_water}, "
+                  f"{allocated} ID-uri alocate, {free} goluri libere, următorul ID: {ledger.next_free()}")
+        ledger.close()
+
+if __name__ == "__main__":
+    main()
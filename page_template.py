@@ -0,0 +1,36 @@
+"""Template de pagină compilat o singură dată: bucăți fixe de text și sloturi cu nume.
+
+Template-ul se pregătește punând în text semnele SlotTemplate.slot(nume) acolo unde vor
+intra valorile; după împărțire, generarea unei pagini e un singur join, fără regex-uri.
+"""
+import re
+
+# Semnul unui slot: \x00nume\x00 (caracterul \x00 nu apare în paginile HTML)
+SLOT_PATTERN = re.compile('\x00(\\w+)\x00')
+
+class SlotTemplate:
+    """Textul împărțit în bucăți fixe, cu câte un slot între două bucăți consecutive."""
+
+    def __init__(self, text):
+        parts = SLOT_PATTERN.split(text)
+        self.chunks = parts[0::2]
+        self.slots = parts[1::2]
+        # Lista pentru join: bucățile fixe rămân pe loc, pozițiile sloturilor sunt completate la render
+        self.pieces = [piece for position, chunk in enumerate(self.chunks)
+                       for piece in ((chunk, None) if position < len(self.slots) else (chunk,))]
+        self.positions = [(2 * position + 1, name) for position, name in enumerate(self.slots)]
+
+    @staticmethod
+    def slot(name):
+        return f'\x00{name}\x00'
+
+    def neighbours(self):
+        """(nume, textul fix dinainte, textul fix de după) pentru fiecare slot, în ordine."""
+        for position, name in enumerate(self.slots):
+            yield name, self.chunks[position], self.chunks[position + 1]
+
+    def render(self, values):
+        pieces = self.pieces.copy()
+        for position, name in self.positions:
+            pieces[position] = values[name]
+        return ''.join(pieces)
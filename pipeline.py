@@ -0,0 +1,292 @@
+"""Rulează tot fluxul de publicare (Pasul 0 ... Pasul 7, apoi Compara) cu o singură comandă.
+
+Etapele formează un graf de dependențe. O etapă este sărită dacă intrările ei nu s-au
+schimbat de la ultima rulare reușită (și nicio etapă de care depinde nu a rulat acum),
+iar etapele independente (ex. Pasul 5 și Pasul 6) rulează în paralel. Toate etapele
+rulează în același proces, deci împart indexul corpusului și cache-ul de codificări.
+
+Rulare:
+    python pipeline.py                      # tot fluxul
+    python pipeline.py --stages pasul3,pasul4
+    python pipeline.py --force --incremental
+    python pipeline.py --list
+    python pipeline.py --renumber           # Pasul 0 renumerotează tot corpusul
+
+Pasul 0 rulează implicit cu ID-uri stabile (ca --stable-ids): un articol nou nu mută ID-urile
+celorlalte. Opțiunile necunoscute (--incremental, --workers N, --dry-run) ajung neschimbate la scripturi.
+"""
+import os
+import sys
+import time
+import glob
+import argparse
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from incremental import StageManifest, text_hash
+from text_io import dry_run_requested
+from run_report import run_report, report_at_exit
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directoarele folosite de scripturi (aceleași căi ca în fiecare Pasul)
+RO_DIR = r'e:\Carte\BB\17 - Site Leadership\Principal\ro'
+EN_DIR = r'e:\Carte\BB\17 - Site Leadership\Principal\en'
+OUTPUT_DIR = r'e:\Carte\BB\17 - Site Leadership\alte\Ionel Balauta\Aryeht\Task 1 - Traduce tot site-ul\Doar Google Web\Andreea\Meditatii\2023\Iulia Python\output'
+RO_2022_DIR = r'e:\Carte\BB\17 - Site Leadership\Principal 2022\ro'
+FISIERE_GATA_DIR = r'c:\Folder1\fisiere_gata'
+
+# Graful etapelor: scriptul, funcțiile apelate (cu argumentele lor, unde e cazul),
+# dependențele și intrările urmărite
+STAGES = {
+    'pasul0': {
+        'script': 'Pasul 0 - Incrementare $item_id Fisiere HTML 2024 RO.py',
+        'functions': ['process_files'],
+        # Renumerotarea completă rescrie tot corpusul; în flux se păstrează ID-urile valide
+        'arguments': {'process_files': {'stable_ids': True}},
+        'depends': [],
+        'inputs': [RO_DIR],
+        'outputs': []
+    },
+    'pasul1': {
+        'script': 'Pasul 1 - Copiaza fisiere html in docx BEBE website.py',
+        'functions': ['main'],
+        'depends': ['pasul0'],
+        'inputs': [RO_DIR],
+        'outputs': ['articole_compilate.docx']
+    },
+    'pasul2': {
+        'script': 'Pasul 2 - Converteste docx bebe in fisiere html (dupa ce ai tradus in engleza cu Google).py',
+        'functions': ['main'],
+        'depends': ['pasul1'],
+        'inputs': ['bebe.docx', 'bebe-*.docx', 'index.html'],
+        'outputs': ['output']
+    },
+    'pasul3': {
+        'script': 'Pasul 3. ADAUGA LINK-urile din RO in OUTPUT si invers (doar daca ai DATA si CATEGORIILE).py',
+        'functions': ['main'],
+        'depends': ['pasul2'],
+        'inputs': [RO_DIR, OUTPUT_DIR],
+        'outputs': []
+    },
+    'pasul4': {
+        'script': 'Pasul 4 - Preia DATA si Numele categoriilor din RO si le pune in fisierele noi EN.py',
+        'functions': ['process_files'],
+        'depends': ['pasul3'],
+        'inputs': [RO_DIR, OUTPUT_DIR],
+        'outputs': []
+    },
+    'pasul5': {
+        'script': 'Pasul 5 - Duce fiecare articol in fisierul categorii din care face parte si apoi in index FINAL.py',
+        'functions': ['main'],
+        'depends': ['pasul4'],
+        'inputs': [OUTPUT_DIR, os.path.join(RO_DIR, 'index.html')],
+        'outputs': []
+    },
+    'pasul6': {
+        'script': 'Pasul 6 (dupa fisiere_gata) - Muta imaginile generate de AI din fisierele din ro, in fisierele din en (2024) - FINAL.py',
+        'functions': ['process_files'],
+        'depends': [],
+        'inputs': [RO_2022_DIR, FISIERE_GATA_DIR],
+        'outputs': []
+    },
+    'pasul7': {
+        # Imaginile sunt deja mutate de pasul6; aici rămân copierea și încărcarea pe FTP
+        'script': 'Pasul 7 (dupa fisiere_gata) - Muta imaginile generate de AI din fisierele din ro, in fisierele din en (2024) - FINAL.py',
+        'functions': ['copy_output_files', 'copy_fisiere_gata'],
+        'depends': ['pasul5', 'pasul6'],
+        'inputs': [OUTPUT_DIR, FISIERE_GATA_DIR],
+        'outputs': []
+    },
+    'compara': {
+        'script': 'Compara categorii 2025 BUN si Afiseaza ce link-uri difera la flags din ro si en 2 BUN.py.py',
+        'functions': ['main'],
+        'depends': ['pasul5'],
+        'inputs': [RO_DIR, EN_DIR],
+        'outputs': []
+    }
+}
+
+# Importurile de module nu trebuie făcute simultan din mai multe thread-uri
+_load_lock = threading.Lock()
+
+def load_stage_module(name):
+    """Încarcă scriptul etapei ca modul (numele fișierelor au spații, deci nu merge import)."""
+    with _load_lock:
+        module_name = f'etapa_{name}'
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(ROOT_DIR, STAGES[name]['script']))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        return module
+
+def inputs_fingerprint(paths):
+    """Amprenta intrărilor: nume, mtime și mărime pentru fișiere și conținutul folderelor.
+
+    O cale cu * (ex. părțile bebe-*.docx) contează ca toate fișierele care se potrivesc.
+    """
+    state = []
+    for path in paths:
+        if '*' in path:
+            for match in sorted(glob.glob(path)):
+                stat = os.stat(match)
+                state.append((match, stat.st_mtime_ns, stat.st_size))
+        elif os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    if entry.is_file():
+                        stat = entry.stat()
+                        state.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        elif os.path.exists(path):
+            stat = os.stat(path)
+            state.append((path, stat.st_mtime_ns, stat.st_size))
+        else:
+            state.append((path, None))
+    return text_hash(state)
+
+def stage_arguments(name, function_name):
+    """Argumentele cu care etapa își apelează funcția (implicit niciunul)."""
+    return STAGES[name].get('arguments', {}).get(function_name, {})
+
+def stage_fingerprint(name):
+    """Amprenta intrărilor etapei, împreună cu argumentele: alte argumente înseamnă altă rulare."""
+    stage = STAGES[name]
+    fingerprint = inputs_fingerprint(stage['inputs'])
+    if 'arguments' in stage:
+        fingerprint = text_hash(fingerprint, stage['arguments'])
+    return fingerprint
+
+def run_stage(name):
+    """Rulează funcțiile etapei; întoarce durata. Un rezultat False înseamnă eșec."""
+    start = time.perf_counter()
+    module = load_stage_module(name)
+    with run_report.stage(name):
+        for function_name in STAGES[name]['functions']:
+            if getattr(module, function_name)(**stage_arguments(name, function_name)) is False:
+                raise RuntimeError(f"{function_name}() a raportat o eroare")
+    return time.perf_counter() - start
+
+def select_stages(requested):
+    """Etapele cerute, cu tot cu dependențele lor."""
+    if not requested:
+        return list(STAGES)
+
+    selected = set()
+    pending = list(requested)
+    while pending:
+        name = pending.pop()
+        if name not in STAGES:
+            raise SystemExit(f"Etapă necunoscută: {name} (disponibile: {', '.join(STAGES)})")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(STAGES[name]['depends'])
+    return [name for name in STAGES if name in selected]
+
+def run_pipeline(stage_names, force=False, jobs=2):
+    """Rulează etapele în ordinea grafului, cele independente în paralel.
+
+    Întoarce un dicționar {etapă: 'rulat' | 'actual' | 'eșuat' | 'blocat'}.
+    """
+    # La --dry-run etapele nu scriu nimic, deci nici starea lor nu se memorează
+    manifest = StageManifest('pipeline', read_only=dry_run_requested())
+    status = {}
+    remaining = list(stage_names)
+    running = {}
+
+    def can_start(name):
+        return all(status.get(dependency) in ('rulat', 'actual')
+                   for dependency in STAGES[name]['depends'] if dependency in stage_names)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while remaining or running:
+            # Etapele care depind de o etapă eșuată nu mai pot rula
+            for name in list(remaining):
+                if any(status.get(dependency) in ('eșuat', 'blocat') for dependency in STAGES[name]['depends']):
+                    status[name] = 'blocat'
+                    remaining.remove(name)
+                    print(f"[pipeline] {name}: blocat (o dependență a eșuat)")
+
+            skipped = False
+            for name in [name for name in remaining if can_start(name)]:
+                remaining.remove(name)
+                stage = STAGES[name]
+                upstream_ran = any(status.get(dependency) == 'rulat' for dependency in stage['depends'])
+                fingerprint = stage_fingerprint(name)
+                if not force and not upstream_ran and manifest.is_current(name, [], extra=fingerprint):
+                    status[name] = 'actual'
+                    print(f"[pipeline] {name}: intrările nu s-au schimbat, se sare peste")
+                    skipped = True
+                    continue
+
+                print(f"[pipeline] {name}: pornire")
+                running[executor.submit(run_stage, name)] = name
+
+            if skipped and not running:
+                # Etapele sărite pot debloca altele; se reevaluează imediat
+                continue
+            if not running:
+                # Nimic nu rulează și nimic nu mai poate porni: dependențe circulare
+                for name in remaining:
+                    status[name] = 'blocat'
+                    print(f"[pipeline] {name}: blocat (dependențe circulare)")
+                remaining = []
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    elapsed = future.result()
+                except (Exception, SystemExit) as e:
+                    status[name] = 'eșuat'
+                    print(f"[pipeline] {name}: EȘUAT - {e}")
+                    continue
+
+                status[name] = 'rulat'
+                # Amprenta se ia după rulare: etapa își poate modifica propriile intrări
+                stage = STAGES[name]
+                manifest.record(name, [], outputs=stage['outputs'], extra=stage_fingerprint(name))
+                manifest.save()
+                print(f"[pipeline] {name}: terminat în {elapsed:.1f}s")
+
+    return status
+
+def main():
+    parser = argparse.ArgumentParser(description="Rulează fluxul de publicare ca graf de etape.")
+    parser.add_argument('--stages', help="etapele de rulat, separate prin virgulă (cu tot cu dependențe)")
+    parser.add_argument('--force', action='store_true', help="rulează și etapele la zi")
+    parser.add_argument('--jobs', type=int, default=2, help="câte etape independente rulează simultan")
+    parser.add_argument('--list', action='store_true', help="afișează etapele și dependențele")
+    parser.add_argument('--renumber', action='store_true',
+                        help="Pasul 0 renumerotează tot corpusul în loc să păstreze ID-urile valide")
+    args, _ = parser.parse_known_args()
+
+    if args.renumber:
+        STAGES['pasul0']['arguments']['process_files']['stable_ids'] = False
+
+    if args.list:
+        for name, stage in STAGES.items():
+            print(f"{name:8} <- {', '.join(stage['depends']) or '-':16} {stage['script']}")
+        return
+
+    # Pasul 1 și Pasul 2 folosesc căi relative la folderul scripturilor
+    os.chdir(ROOT_DIR)
+
+    start = time.perf_counter()
+    requested = args.stages.split(',') if args.stages else None
+    status = run_pipeline(select_stages(requested), args.force, max(1, args.jobs))
+
+    print("\n" + "=" * 60)
+    for name, result in status.items():
+        print(f"  {name:8} {result}")
+    print(f"Durata totală: {time.perf_counter() - start:.1f}s")
+    print("=" * 60)
+
+    if any(result in ('eșuat', 'blocat') for result in status.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    report_at_exit()
+    main()
@@ -0,0 +1,243 @@
+"""Măsurătorile unei rulări: timp, CPU, octeți citiți/scriși, fișiere atinse și timpul de parsare.
+
+Totul se adună pe etape: pipeline.py pornește câte o etapă pentru fiecare Pasul, iar un
+script pornit direct are o singură etapă, cu numele scriptului. La ieșire se scrie un
+raport JSON în .rapoarte/ (câte unul pe rulare), cu fișierele cele mai lente din fiecare
+etapă, ca regresiile și punctele fierbinți să poată fi urmărite de la o rulare la alta.
+Raportul e cerut de scripturi și de pipeline.py (report_at_exit, în blocul __main__);
+simplul import al modulelor comune nu scrie nimic.
+
+Rulare fără raport: --no-report
+"""
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+import multiprocessing
+import contextlib
+from datetime import datetime
+from command_line import options
+
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.rapoarte')
+
+# Câte fișiere (cele mai lente) apar în raport pentru fiecare etapă
+SLOWEST_FILES = 10
+
+def report_requested(argv=None):
+    """False dacă scriptul a fost pornit cu --no-report."""
+    return not options(argv).no_report
+
+class StageStats:
+    """Contoarele unei etape."""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files_read = set()
+        self.files_written = set()
+        # Timp pe categorii: 'parse' (regex / HTML / docx), 'index', 'write'
+        self.timings = {}
+        self.file_times = {}
+
+    def is_empty(self):
+        return not (self.wall or self.files_read or self.files_written or self.file_times)
+
+    def slowest(self, count=SLOWEST_FILES):
+        return sorted(self.file_times.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def to_dict(self):
+        return {
+            'wall_s': round(self.wall, 4),
+            'cpu_s': round(self.cpu, 4),
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'files_read': len(self.files_read),
+            'files_written': len(self.files_written),
+            'timings_s': {category: round(seconds, 4) for category, seconds in sorted(self.timings.items())},
+            'files_timed': len(self.file_times),
+            'slowest_files': [{'file': name, 'seconds': round(seconds, 4)} for name, seconds in self.slowest()]
+        }
+
+class RunReport:
+    """Raportul unei rulări. Etapa curentă e ținută per thread (pipeline rulează etape în paralel)."""
+
+    def __init__(self, name=None):
+        self.name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python'
+        self.started = datetime.now()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def current(self):
+        """Etapa thread-ului curent; în afara unei etape, cea implicită (numele scriptului)."""
+        stats = getattr(self.local, 'stage', None)
+        if stats is None:
+            with self.lock:
+                stats = self.stages.get(self.name)
+                if stats is None:
+                    stats = self.stages[self.name] = StageStats(self.name)
+        return stats
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Măsoară o etapă. O etapă pornită în interiorul alteia se adaugă la cea exterioară."""
+        if getattr(self.local, 'stage', None) is not None:
+            yield self.local.stage
+            return
+
+        with self.lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(name)
+        self.local.stage = stats
+        start_wall = time.perf_counter()
+        # CPU-ul thread-ului etapei (procesele indexului corpusului nu sunt incluse)
+        start_cpu = time.thread_time()
+        try:
+            yield stats
+        finally:
+            stats.wall += time.perf_counter() - start_wall
+            stats.cpu += time.thread_time() - start_cpu
+            self.local.stage = None
+
+    @contextlib.contextmanager
+    def measure(self, category):
+        """Adună timpul blocului la categoria dată; blocurile imbricate nu se numără de două ori."""
+        active = getattr(self.local, 'active', None)
+        if active is None:
+            active = self.local.active = set()
+        if category in active:
+            yield
+            return
+
+        active.add(category)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            active.discard(category)
+            stats = self.current()
+            stats.timings[category] = stats.timings.get(category, 0.0) + time.perf_counter() - start
+
+    def timed_files(self, items, key=None):
+        """Parcurge `items` și măsoară timpul petrecut în corpul buclei pentru fiecare element."""
+        for item in items:
+            start = time.perf_counter()
+            yield item
+            stats = self.current()
+            name = key(item) if key else item
+            stats.file_times[name] = stats.file_times.get(name, 0.0) + time.perf_counter() - start
+
+    def add_file_time(self, name, seconds):
+        """Timp măsurat în altă parte (ex. într-un proces din pool) pentru un fișier."""
+        stats = self.current()
+        stats.file_times[name] = stats.file_times.get(name, 0.0) + seconds
+
+    def count_read(self, path, nbytes):
+        stats = self.current()
+        stats.bytes_read += nbytes
+        stats.files_read.add(path)
+
+    def count_written(self, path, nbytes):
+        stats = self.current()
+        stats.bytes_written += nbytes
+        stats.files_written.add(path)
+
+    def to_dict(self):
+        stages = {}
+        slowest = []
+        for name, stats in list(self.stages.items()):
+            if stats.is_empty():
+                continue
+            if name == self.name and not stats.wall:
+                # Etapa implicită durează cât toată rularea
+                stats.wall = time.perf_counter() - self.start_wall
+                stats.cpu = time.process_time() - self.start_cpu
+            stages[name] = stats.to_dict()
+            slowest.extend((seconds, name, file) for file, seconds in stats.slowest())
+
+        slowest.sort(reverse=True)
+        return {
+            'run': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'argv': sys.argv[1:],
+            'wall_s': round(time.perf_counter() - self.start_wall, 4),
+            'cpu_s': round(time.process_time() - self.start_cpu, 4),
+            'stages': stages,
+            'slowest_files': [{'stage': name, 'file': file, 'seconds': round(seconds, 4)}
+                              for seconds, name, file in slowest[:SLOWEST_FILES]]
+        }
+
+    def save(self, report_dir=None):
+        """Scrie raportul JSON; întoarce calea lui (None dacă nu s-a măsurat nimic)."""
+        data = self.to_dict()
+        if not data['stages']:
+            return None
+
+        report_dir = report_dir or REPORT_DIR
+        os.makedirs(report_dir, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]+', '_', self.name)[:60]
+        path = os.path.join(report_dir, f"{self.started:%Y%m%d-%H%M%S}-{safe_name}-{os.getpid()}.json")
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+# Raportul comun al procesului, scris la ieșire
+run_report = RunReport()
+
+def save_at_exit():
+    # Procesele care încarcă indexul corpusului nu scriu rapoarte proprii
+    if not report_requested() or multiprocessing.parent_process() is not None:
+        return
+    try:
+        path = run_report.save()
+    except OSError as e:
+        print(f"Raportul rulării nu a putut fi salvat: {e}")
+        return
+    if path:
+        print(f"Raportul rulării: {path}")
+
+def report_at_exit():
+    """Raportul rulării va fi scris la ieșirea procesului (apelată din blocul __main__)."""
+    # Apelată de mai multe ori, înregistrează o singură scriere
+    atexit.unregister(save_at_exit)
+    atexit.register(save_at_exit)
+
+def stage(name):
+    return run_report.stage(name)
+
+def measure(category):
+    return run_report.measure(category)
+
+def timed_files(items, key=None):
+    return run_report.timed_files(items, key)
+
+def add_file_time(name, seconds):
+    run_report.add_file_time(name, seconds)
+
+def count_read(path, nbytes):
+    run_report.count_read(path, nbytes)
+
+def count_written(path, nbytes):
+    run_report.count_written(path, nbytes)
+
+def timed(category):
+    """Decorator: timpul petrecut în funcție se adună la categoria dată."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with run_report.measure(category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
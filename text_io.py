@@ -0,0 +1,312 @@
+import os
+import codecs
+import atexit
+import difflib
+import sqlite3
+from run_report import run_report
+from command_line import options
+
+# Codificările detectate sunt ținute în același fișier SQLite ca indexul corpusului
+ENCODING_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_index.sqlite')
+
+# BOM-urile recunoscute (UTF-32 înaintea UTF-16, BOM-ul UTF-32 LE începe cu cel UTF-16 LE).
+# BOM-ul UTF-8 rămâne în text, ca la citirea cu encoding='utf-8' din scripturi.
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+]
+FALLBACK_ENCODING = 'latin1'
+
+# Cât citește read_head: comentariul cu $item_id e pe primele rânduri ale paginii
+HEAD_BYTES = 4096
+
+# Câte fișiere modificate țin în memorie un WriteBatch înainte să le scrie pe disc
+FLUSH_EVERY = 100
+
+def decode_bytes(data, encoding=None, final=True):
+    """Decodează conținutul unui fișier și întoarce (text, codificare).
+
+    Cu o codificare deja cunoscută se decodează direct; altfel se verifică BOM-ul,
+    apoi UTF-8, iar dacă nu e UTF-8 valid se folosește latin1 (care nu poate eșua).
+    Cu final=False (doar începutul fișierului) un caracter tăiat la capăt e ignorat.
+    """
+    def decode(name):
+        if final:
+            return data.decode(name)
+        return codecs.getincrementaldecoder(name)().decode(data, final=False)
+
+    if encoding:
+        try:
+            return decode(encoding), encoding
+        except (UnicodeDecodeError, LookupError):
+            pass
+
+    for bom, bom_encoding in BOM_ENCODINGS:
+        if data.startswith(bom):
+            try:
+                return decode(bom_encoding), bom_encoding
+            except UnicodeDecodeError:
+                break
+
+    try:
+        return decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        return decode(FALLBACK_ENCODING), FALLBACK_ENCODING
+
+def translate_newlines(text):
+    """Aceeași conversie \\r\\n / \\r -> \\n pe care o face open() în mod text."""
+    if '\r' not in text:
+        return text
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+class EncodingCache:
+    """Codificarea detectată pentru fiecare fișier, validă cât timp mtime/size nu se schimbă."""
+
+    def __init__(self, db_path=ENCODING_DB):
+        self.db_path = db_path
+        self.entries = None
+        self.pending = {}
+
+    def load(self):
+        self.entries = {}
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS codificari (
+                        path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        encoding TEXT NOT NULL
+                    )""")
+                for path, mtime_ns, size, encoding in conn.execute('SELECT * FROM codificari'):
+                    self.entries[path] = (mtime_ns, size, encoding)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Cache-ul de codificări nu a putut fi citit: {e}")
+
+    def get(self, path, stat):
+        if self.entries is None:
+            self.load()
+        entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        return None
+
+    def put(self, path, stat, encoding):
+        if self.entries is None:
+            self.load()
+        entry = (stat.st_mtime_ns, stat.st_size, encoding)
+        if self.entries.get(path) != entry:
+            self.entries[path] = entry
+            self.pending[path] = entry
+
+    def flush(self):
+        """Scrie în SQLite codificările noi (o singură tranzacție)."""
+        if not self.pending:
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                with conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO codificari VALUES (?, ?, ?, ?)',
+                        [(path,) + entry for path, entry in self.pending.items()])
+            finally:
+                conn.close()
+            self.pending = {}
+        except sqlite3.Error as e:
+            print(f"Cache-ul de codificări nu a putut fi salvat: {e}")
+
+# Cache-ul comun al procesului, salvat la ieșire
+encoding_cache = EncodingCache()
+atexit.register(encoding_cache.flush)
+
+def remember_encoding(path, stat, encoding):
+    """Memorează codificarea unui fișier decodat în altă parte (ex. în procesele indexului)."""
+    encoding_cache.put(os.path.abspath(path), stat, encoding)
+
+def read_text(path):
+    """Citește un fișier text: octeții o singură dată, decodare într-o singură trecere.
+
+    Codificarea găsită e memorată per (path, mtime), așa că etapele următoare nu mai
+    fac detecția. Liniile noi sunt convertite ca la open(path, 'r').
+    """
+    path = os.path.abspath(path)
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    run_report.count_read(path, len(data))
+
+    text, encoding = decode_bytes(data, encoding_cache.get(path, stat))
+    encoding_cache.put(path, stat, encoding)
+    return translate_newlines(text)
+
+def read_head(path, size=HEAD_BYTES):
+    """Citește doar primii `size` octeți ai unui fișier text.
+
+    Întoarce (text, complet); complet e True dacă fișierul a încăput în întregime.
+    Codificarea detectată pe un început de fișier nu e memorată (restul ar putea să nu fie UTF-8).
+    """
+    path = os.path.abspath(path)
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read(size)
+    run_report.count_read(path, len(data))
+
+    complete = len(data) >= stat.st_size
+    text, encoding = decode_bytes(data, encoding_cache.get(path, stat), final=complete)
+    if complete:
+        encoding_cache.put(path, stat, encoding)
+    return translate_newlines(text), complete
+
+def dry_run_requested(argv=None):
+    """True dacă scriptul a fost pornit cu --dry-run (nu se scrie nimic, doar se raportează)."""
+    return options(argv).dry_run
+
+def encode_text(text, encoding='utf-8'):
+    """Octeții pe care i-ar scrie open(path, 'w', encoding=encoding) pentru acest text."""
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    return text.encode(encoding)
+
+def atomic_write_bytes(path, data):
+    """Scrie printr-un fișier temporar și os.replace: o întrerupere nu lasă pagini scrise pe jumătate."""
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def print_diff_summary(path, old_data, data, encoding):
+    name = os.path.basename(path)
+    if old_data is None:
+        print(f"  [dry-run] + {name} (fișier nou, {len(data)} octeți)")
+        return
+
+    old_lines = decode_bytes(old_data)[0].splitlines()
+    new_lines = data.decode(encoding).splitlines()
+    added = removed = 0
+    for line in difflib.unified_diff(old_lines, new_lines, lineterm='', n=0):
+        if line.startswith('+') and not line.startswith('+++'):
+            added += 1
+        elif line.startswith('-') and not line.startswith('---'):
+            removed += 1
+    print(f"  [dry-run] ~ {name}: +{added} -{removed} linii")
+
+def write_if_changed(path, text, encoding='utf-8', dry_run=False):
+    """Scrie fișierul atomic, doar dacă octeții diferă de cei de pe disc.
+
+    Întoarce (schimbat, octeți citiți, octeți scriși); octeții sunt None pentru un fișier
+    care nu exista, respectiv pentru o scriere nefăcută (neschimbat sau --dry-run).
+    """
+    data = encode_text(text, encoding)
+    old_data = None
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            old_data = f.read()
+        if old_data == data:
+            return False, len(old_data), None
+
+    old_size = None if old_data is None else len(old_data)
+    if dry_run:
+        print_diff_summary(path, old_data, data, encoding)
+        return True, old_size, None
+
+    atomic_write_bytes(path, data)
+    return True, old_size, len(data)
+
+class WriteBatch:
+    """Scrierile unui script, adunate și aplicate împreună.
+
+    Fișierele al căror conținut nu se schimbă nu sunt rescrise, fiecare fișier e scris
+    atomic, iar cu dry_run=True se afișează doar un rezumat al diferențelor.
+    Folosit ca `with WriteBatch() as batch:`, scrierile rămase se aplică la ieșire
+    (și se renunță la ele dacă blocul se termină cu o excepție).
+    """
+
+    def __init__(self, dry_run=None, flush_every=FLUSH_EVERY):
+        self.dry_run = dry_run_requested() if dry_run is None else dry_run
+        self.flush_every = flush_every
+        self.pending = {}
+        self.written = []
+        self.unchanged = 0
+        # Fișierele care nu au putut fi scrise: cale absolută -> eroare
+        self.failed = {}
+        # Erorile încă nearuncate de flush()
+        self.errors = []
+
+    def write(self, path, text, encoding='utf-8'):
+        self.pending[os.path.abspath(path)] = (text, encoding)
+        if len(self.pending) >= self.flush_every:
+            # Scrierea automată nu aruncă: o eroare a altui fișier nu e pusă pe seama celui curent
+            self.apply_pending()
+
+    def read(self, path):
+        """Conținutul curent al fișierului, inclusiv o scriere încă neaplicată."""
+        entry = self.pending.get(os.path.abspath(path))
+        if entry:
+            return translate_newlines(entry[0])
+        return read_text(path)
+
+    def apply_pending(self):
+        """Aplică scrierile adunate; un fișier care nu poate fi scris nu le oprește pe celelalte."""
+        with run_report.measure('write'):
+            for path, (text, encoding) in self.pending.items():
+                try:
+                    self.record(path, encoding, *write_if_changed(path, text, encoding, self.dry_run))
+                except OSError as e:
+                    self.failed[path] = e
+                    self.errors.append(e)
+        self.pending = {}
+
+    def flush(self):
+        """Aplică scrierile adunate și aruncă prima eroare neraportată (și din scrierile automate).
+
+        Toate fișierele care nu au putut fi scrise rămân în self.failed (vezi failed_write).
+        """
+        self.apply_pending()
+        if self.errors:
+            error = self.errors[0]
+            self.errors = []
+            raise error
+
+    def failed_write(self, path):
+        """True dacă scrierea fișierului a eșuat (fișierul nu trebuie memorat ca actualizat)."""
+        return os.path.abspath(path) in self.failed
+
+    def record(self, path, encoding, changed, bytes_read, bytes_written):
+        """Contorizează o scriere făcută cu write_if_changed (aici sau într-un proces din pool)."""
+        if bytes_read is not None:
+            run_report.count_read(path, bytes_read)
+        if not changed:
+            self.unchanged += 1
+            return
+        self.written.append(path)
+        if bytes_written is not None:
+            run_report.count_written(path, bytes_written)
+            remember_encoding(path, os.stat(path), encoding)
+
+    def discard(self):
+        self.pending = {}
+
+    def summary(self):
+        action = "ar fi scrise" if self.dry_run else "scrise"
+        return f"{len(self.written)} fișiere {action}, {self.unchanged} neschimbate"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+        return False